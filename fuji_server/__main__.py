@@ -13,7 +13,25 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
 from fuji_server.app import create_app
+from fuji_server.controllers.fair_object_controller import evaluate
+from fuji_server.harvester.data_harvester import DataHarvester
+from fuji_server.helper.batch_job_queue import BatchJobQueue
+from fuji_server.helper.concurrent_helper import ConcurrentHelper
+from fuji_server.helper.content_inspector import ContentInspector
+from fuji_server.helper.data_download_executor import DataDownloadExecutor
+from fuji_server.helper.data_info_cache import DataInfoCache
+from fuji_server.helper.datacite_repository_refresher import DataCiteRepositoryRefresher
+from fuji_server.helper.deadline import Deadline
+from fuji_server.helper.evaluation_executor import EvaluationExecutor
+from fuji_server.helper.host_circuit_breaker import HostCircuitBreaker
+from fuji_server.helper.http_transport import HTTPTransport
+from fuji_server.helper.jsonld_document_loader import JsonLdDocumentLoader
+from fuji_server.helper.metadata_collector_rdf import MetaDataCollectorRdf
+from fuji_server.helper.pid_resolver import PIDResolver
 from fuji_server.helper.preprocessor import Preprocessor
+from fuji_server.helper.reference_data_snapshot import ReferenceDataSnapshot
+from fuji_server.helper.request_helper import RequestHelper
+from fuji_server.helper.resolver_cache import ResolverCache
 
 
 def main():
@@ -41,14 +59,111 @@ def main():
     # logger.info('Total metrics defined: {}'.format(preproc.get_total_metrics()))
 
     isDebug = config.getboolean("SERVICE", "debug_mode")
-    preproc.retrieve_licenses(isDebug)
-    preproc.retrieve_datacite_re3repos()
+    snapshot_loaded = False
+    reference_data_snapshot = config["SERVICE"].get("reference_data_snapshot")
+    if reference_data_snapshot:
+        snapshot_loaded = ReferenceDataSnapshot.load_or_build(os.path.join(ROOT_DIR, reference_data_snapshot))
+    # without debug mode licenses and vocabs are updated online
+    if not snapshot_loaded or not isDebug:
+        preproc.retrieve_licenses(isDebug)
+    DataCiteRepositoryRefresher.set_options(
+        refresh_interval=config.getfloat("SERVICE", "datacite_repositories_refresh_interval", fallback=None),
+        check_interval=config.getfloat("SERVICE", "datacite_repositories_check_interval", fallback=None),
+    )
+    DataCiteRepositoryRefresher.start()
 
-    preproc.retrieve_metadata_standards()
+    if not snapshot_loaded:
+        preproc.retrieve_metadata_standards()
+        preproc.retrieve_metadata_standards_uri_index()
     # preproc.retrieve_linkedvocabs(lov_api=LOV_API, lodcloud_api=LOD_CLOUDNET, bioportal_api=BIOPORTAL_REST, bioportal_key=BIOPORTAL_APIKEY, isDebugMode=False)
-    preproc.retrieve_linkedvocabs(lov_api=LOV_API, lodcloud_api=LOD_CLOUDNET, isDebugMode=isDebug)
+    if not snapshot_loaded or not isDebug:
+        preproc.retrieve_linkedvocabs(lov_api=LOV_API, lodcloud_api=LOD_CLOUDNET, isDebugMode=isDebug)
     preproc.set_remote_log_info(config["SERVICE"].get("remote_log_host"), config["SERVICE"].get("remote_log_path"))
     preproc.set_max_content_size(config["SERVICE"]["max_content_size"])
+    HTTPTransport.set_pool_options(
+        pool_size=config.getint("SERVICE", "http_pool_size", fallback=None),
+        pool_per_host=config.getint("SERVICE", "http_pool_per_host", fallback=None),
+        pool_block=config.getboolean("SERVICE", "http_pool_block", fallback=None),
+        pool_idle_timeout=config.getfloat("SERVICE", "http_pool_idle_timeout", fallback=None),
+        max_requests_per_host=config.getint("SERVICE", "http_max_requests_per_host", fallback=None),
+    )
+    ConcurrentHelper.set_max_workers(config.getint("SERVICE", "harvest_workers", fallback=None))
+    DataDownloadExecutor.set_options(
+        max_workers=config.getint("SERVICE", "data_download_workers", fallback=None),
+        max_downloads_per_host=config.getint("SERVICE", "data_download_max_per_host", fallback=None),
+        time_budget=config.getfloat("SERVICE", "data_download_time_budget", fallback=None),
+    )
+    ContentInspector.set_options(
+        backends=config.get("SERVICE", "content_inspection_backends", fallback=None),
+    )
+    HostCircuitBreaker.set_options(
+        failure_threshold=config.getint("SERVICE", "host_circuit_breaker_failures", fallback=None),
+        cooldown=config.getfloat("SERVICE", "host_circuit_breaker_cooldown", fallback=None),
+    )
+    MetaDataCollectorRdf.set_options(
+        max_remote_distributions=config.getint("SERVICE", "dcat_remote_distributions_limit", fallback=None)
+    )
+    PIDResolver.set_options(
+        max_workers=config.getint("SERVICE", "pid_resolve_workers", fallback=None),
+        max_requests_per_resolver=config.getint("SERVICE", "pid_resolve_max_per_resolver", fallback=None),
+    )
+    resolver_cache_path = config.get("SERVICE", "resolver_cache_path", fallback="")
+    if resolver_cache_path and not os.path.isabs(resolver_cache_path):
+        resolver_cache_path = os.path.join(ROOT_DIR, resolver_cache_path)
+    ResolverCache.set_options(
+        backend=config.get("SERVICE", "resolver_cache_backend", fallback=None),
+        path=resolver_cache_path,
+        url=config.get("SERVICE", "resolver_cache_url", fallback=None),
+        ttl=config.getfloat("SERVICE", "resolver_cache_ttl", fallback=None),
+        negative_ttl=config.getfloat("SERVICE", "resolver_cache_negative_ttl", fallback=None),
+    )
+    DataInfoCache.set_options(
+        max_size=config.getint("SERVICE", "data_info_cache_max_size", fallback=None),
+        ttl=config.getfloat("SERVICE", "data_info_cache_ttl", fallback=None),
+        max_text_size=config.getint("SERVICE", "data_info_cache_max_text_size", fallback=None),
+    )
+    DataHarvester.set_options(
+        use_range_requests=config.getboolean("SERVICE", "data_download_range_requests", fallback=None),
+        use_head_requests=config.getboolean("SERVICE", "data_download_head_requests", fallback=None),
+    )
+    RequestHelper.set_response_cache_options(
+        max_size=config.getint("SERVICE", "response_cache_max_size", fallback=None),
+        ttl=config.getfloat("SERVICE", "response_cache_ttl", fallback=None),
+    )
+    JsonLdDocumentLoader.set_options(
+        max_size=config.getint("SERVICE", "jsonld_context_cache_max_size", fallback=None),
+        ttl=config.getfloat("SERVICE", "jsonld_context_cache_ttl", fallback=None),
+        timeout=config.getfloat("SERVICE", "jsonld_context_timeout", fallback=None),
+    )
+    JsonLdDocumentLoader.install()
+    http_disk_cache_path = config["SERVICE"].get("http_disk_cache_path")
+    if http_disk_cache_path:
+        RequestHelper.set_disk_cache_options(
+            path=os.path.join(ROOT_DIR, http_disk_cache_path),
+            max_size=config.getint("SERVICE", "http_disk_cache_max_size", fallback=None),
+            max_age=config.getfloat("SERVICE", "http_disk_cache_max_age", fallback=None),
+            stale_while_revalidate=config.getfloat("SERVICE", "http_disk_cache_stale_while_revalidate", fallback=None),
+        )
+    Deadline.set_options(time_budget=config.getfloat("SERVICE", "assessment_time_budget", fallback=None))
+    EvaluationExecutor.set_options(
+        max_workers=config.getint("SERVICE", "evaluation_workers", fallback=None),
+        max_queue_size=config.getint("SERVICE", "evaluation_queue_size", fallback=None),
+        retry_after=config.getint("SERVICE", "evaluation_retry_after", fallback=None),
+    )
+    batch_queue_path = config.get("SERVICE", "batch_queue_path", fallback="data/batch_queue.sqlite")
+    if not os.path.isabs(batch_queue_path):
+        batch_queue_path = os.path.join(ROOT_DIR, batch_queue_path)
+    BatchJobQueue.set_options(
+        path=batch_queue_path,
+        max_workers=config.getint("SERVICE", "batch_workers", fallback=None),
+        max_per_host=config.getint("SERVICE", "batch_max_per_host", fallback=None),
+        max_attempts=config.getint("SERVICE", "batch_max_attempts", fallback=None),
+        retry_backoff=config.getfloat("SERVICE", "batch_retry_backoff", fallback=None),
+        max_identifiers=config.getint("SERVICE", "batch_max_identifiers", fallback=None),
+        retention=config.getfloat("SERVICE", "batch_retention", fallback=None),
+    )
+    # continues the batch evaluations queued before the server (re)started
+    BatchJobQueue.start(evaluate)
 
     logger.info(f"Total SPDX licenses : {preproc.get_total_licenses()}")
     logger.info(f"Total re3repositories found from datacite api : {len(preproc.getRE3repositories())}")
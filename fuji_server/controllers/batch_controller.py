@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+from connexion.problem import problem
+
+from fuji_server.controllers.fair_object_controller import evaluate
+from fuji_server.helper.batch_job_queue import BatchJobQueue
+
+
+def assess_batch(body):
+    """assess_batch
+
+    Queue the FAIRness evaluation of several data objects based on their identifiers # noqa: E501
+
+    :param body:
+    :type body: dict | bytes
+
+    :rtype: BatchStatus
+    """
+    options = {key: value for key, value in body.items() if key != "object_identifiers"}
+    try:
+        batch_id = BatchJobQueue.submit(body.get("object_identifiers") or [], options)
+    except ValueError as e:
+        return problem(400, "Bad Request", str(e))
+    BatchJobQueue.start(evaluate)
+    return BatchJobQueue.get_status(batch_id), 202
+
+
+def get_batch(batch_id):
+    """get_batch
+
+    Return the progress of a batch evaluation # noqa: E501
+
+    :param batch_id: The id of the batch
+    :type batch_id: str
+
+    :rtype: BatchStatus
+    """
+    status = BatchJobQueue.get_status(batch_id)
+    if status is None:
+        return problem(404, "Not Found", f"Batch {batch_id} does not exist")
+    return status, 200
+
+
+def get_batch_results(batch_id, page=1, page_size=100, status=None):
+    """get_batch_results
+
+    Return the evaluations of a batch page by page in the order of the identifiers # noqa: E501
+
+    :param batch_id: The id of the batch
+    :type batch_id: str
+    :param page: Number of the page, starting with 1
+    :type page: int
+    :param page_size: Number of evaluations per page
+    :type page_size: int
+    :param status: Only return evaluations with this status
+    :type status: str
+
+    :rtype: BatchResults
+    """
+    if BatchJobQueue.get_status(batch_id) is None:
+        return problem(404, "Not Found", f"Batch {batch_id} does not exist")
+    return BatchJobQueue.get_results(batch_id, page=page, page_size=page_size, status=status), 200
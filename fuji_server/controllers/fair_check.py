@@ -6,11 +6,9 @@ import hashlib
 import io
 import logging
 import logging.handlers
-import re
+import uuid
 from urllib.parse import urlparse
 
-import pandas as pd
-
 from fuji_server import __version__
 from fuji_server.evaluators.fair_evaluator_api import FAIREvaluatorAPI
 from fuji_server.evaluators.fair_evaluator_code_provenance import FAIREvaluatorCodeProvenance
@@ -50,6 +48,10 @@ from fuji_server.evaluators.fair_evaluator_version_identifier import FAIREvaluat
 from fuji_server.harvester.data_harvester import DataHarvester
 from fuji_server.harvester.github_harvester import GithubHarvester
 from fuji_server.harvester.metadata_harvester import MetadataHarvester
+from fuji_server.helper.assessment_summary import AssessmentSummary
+from fuji_server.helper.concurrent_helper import ConcurrentHelper, ConcurrentJob
+from fuji_server.helper.deadline import Deadline
+from fuji_server.helper.harvest_planner import HarvestPlanner
 from fuji_server.helper.linked_vocab_helper import linked_vocab_helper
 from fuji_server.helper.metadata_collector import MetadataOfferingMethods
 from fuji_server.helper.metadata_mapper import Mapper
@@ -84,6 +86,38 @@ class FAIRCheck:
     LINKED_VOCAB_INDEX = {}
     ACCESS_RIGHTS = {}
     FUJI_VERSION = __version__
+    # evaluator of each check, see run_checks
+    CHECK_EVALUATORS = {
+        "check_unique_metadata_identifier": FAIREvaluatorUniqueIdentifierMetadata,
+        "check_unique_content_identifier": FAIREvaluatorUniqueIdentifierData,
+        "check_persistent_metadata_identifier": FAIREvaluatorPersistentIdentifierMetadata,
+        "check_persistent_data_identifier": FAIREvaluatorPersistentIdentifierData,
+        "check_unique_persistent_software_identifier": FAIREvaluatorUniquePersistentIdentifierSoftware,
+        "check_software_component_identifier": FAIREvaluatorSoftwareComponentIdentifier,
+        "check_version_identifier": FAIREvaluatorVersionIdentifier,
+        "check_development_metadata": FAIREvaluatorDevelopmentMetadata,
+        "check_open_api": FAIREvaluatorAPI,
+        "check_requirements": FAIREvaluatorRequirements,
+        "check_test_cases": FAIREvaluatorTestCases,
+        "check_minimal_metatadata": FAIREvaluatorCoreMetadata,
+        "check_data_identifier_included_in_metadata": FAIREvaluatorDataIdentifierIncluded,
+        "check_metadata_identifier_included_in_metadata": FAIREvaluatorMetadataIdentifierIncluded,
+        "check_data_access_level": FAIREvaluatorDataAccessLevel,
+        "check_license": FAIREvaluatorLicense,
+        "check_license_file": FAIREvaluatorLicenseFile,
+        "check_relatedresources": FAIREvaluatorRelatedResources,
+        "check_searchable": FAIREvaluatorSearchable,
+        "check_data_file_format": FAIREvaluatorFileFormat,
+        "check_community_metadatastandards": FAIREvaluatorCommunityMetadata,
+        "check_data_provenance": FAIREvaluatorDataProvenance,
+        "check_code_provenance": FAIREvaluatorCodeProvenance,
+        "check_data_content_metadata": FAIREvaluatorDataContentMetadata,
+        "check_formal_metadata": FAIREvaluatorFormalMetadata,
+        "check_semantic_vocabulary": FAIREvaluatorSemanticVocabulary,
+        "check_metadata_preservation": FAIREvaluatorMetadataPreserved,
+        "check_standardised_protocol_data": FAIREvaluatorStandardisedProtocolData,
+        "check_standardised_protocol_metadata": FAIREvaluatorStandardisedProtocolMetadata,
+    }
 
     def __init__(
         self,
@@ -96,6 +130,7 @@ class FAIRCheck:
         verify_pids=True,
         oaipmh_endpoint=None,
         metric_version=None,
+        deadline=None,
     ):  # e.g. metrics_v0.5 regex: metrics_v([0-9]+\.[0-9]+)(_[a-z]+)?
         uid_bytes = uid.encode("utf-8")
         self.test_id = hashlib.sha1(uid_bytes).hexdigest()
@@ -130,7 +165,9 @@ class FAIRCheck:
         self.pid_scheme = None
         self.id_scheme = None
         self.checked_pages = []
-        self.logger = logging.getLogger(self.test_id)
+        # unique per assessment, concurrent assessments of the same identifier must not share their log messages,
+        # no dot in the name, otherwise logging keeps a placeholder for test_id which references all these loggers
+        self.logger = logging.getLogger(f"{self.test_id}-{uuid.uuid4().hex}")
         self.metadata_sources = []
         self.isDebug = test_debug
         self.isLandingPageAccessible = None
@@ -149,6 +186,8 @@ class FAIRCheck:
         self.rdf_graph = None
 
         self.rdf_collector = None
+        # time budget of the whole assessment, optional harvesting steps are skipped once it has expired
+        self.deadline = deadline or Deadline()
         self.use_datacite = use_datacite
         self.use_github = use_github
         self.repeat_pid_check = False
@@ -221,8 +260,13 @@ class FAIRCheck:
             logger=self.logger,
             allowed_harvesting_methods=allowed_harvesting_methods,
             allowed_metadata_standards=allowed_metadata_standards,
+            deadline=self.deadline,
         )
         self.repo_helper = None
+        # optional harvesting stages only run if the evaluators of the loaded metrics read their results
+        self.harvest_plan = HarvestPlanner(
+            self.CHECK_EVALUATORS.values(), self.METRICS, self.metric_helper.get_metric_version()
+        )
 
     @classmethod
     def load_predata(cls):
@@ -341,6 +385,10 @@ class FAIRCheck:
             self.namespace_uri = list(set(self.namespace_uri))
 
     def harvest_re3_data(self):
+        if not self.harvest_plan.is_planned("re3data"):
+            return
+        if self.deadline.skip(self.logger, "FsF-R1.3-01M", "re3data repository lookup"):
+            return
         if self.use_datacite:
             client_id = self.metadata_merged.get("datacite_client")
             self.logger.info(f"FsF-R1.3-01M : re3data/datacite client id -: {client_id}")
@@ -355,13 +403,23 @@ class FAIRCheck:
             )
 
     def harvest_all_data(self):
+        if not self.harvest_plan.is_planned("data"):
+            return
         if self.metadata_merged.get("object_content_identifier"):
             data_links = self.metadata_merged.get("object_content_identifier")  # [: self.FILES_LIMIT]
-            data_harvester = DataHarvester(data_links, self.logger, self.landing_url, metrics=self.METRICS.keys())
+            data_harvester = DataHarvester(
+                data_links, self.logger, self.landing_url, metrics=self.METRICS.keys(), deadline=self.deadline
+            )
             data_harvester.retrieve_all_data()
             self.content_identifier = data_harvester.data
 
     def harvest_github(self):
+        if not self.harvest_plan.is_planned("github"):
+            self.github_data = {}
+            return
+        if self.use_github and self.deadline.skip(self.logger, "FRSM-15-R1.1", "harvesting through Github API"):
+            self.github_data = {}
+            return
         if self.use_github:
             github_harvester = GithubHarvester(self.id, self.logger)
             github_harvester.harvest()
@@ -433,6 +491,35 @@ class FAIRCheck:
                     pass
         return found"""
 
+    def run_checks(self, checks):
+        """Runs the given checks (names of check methods) and returns their results in the same order.
+
+        Evaluators which are independent according to their declared inputs and side effects run concurrently,
+        the others in the given order. The log messages of each evaluator are kept back and passed on in the
+        order of the checks, so results and debug messages are the same as if the checks ran one after another.
+        """
+        evaluators = [self.CHECK_EVALUATORS[check](self) for check in checks]
+        dependencies = [
+            [previous for previous in range(index) if type(evaluator).depends_on(type(evaluators[previous]))]
+            for index, evaluator in enumerate(evaluators)
+        ]
+        results = [None] * len(evaluators)
+        jobs = [
+            ConcurrentJob(
+                self.logger,
+                fetch=lambda job_logger, evaluator=evaluator: self.get_evaluator_result(evaluator, job_logger),
+                merge=lambda result, index=index: results.__setitem__(index, result),
+            )
+            for index, evaluator in enumerate(evaluators)
+        ]
+        ConcurrentHelper.run_jobs(jobs, dependencies=dependencies)
+        return results
+
+    @staticmethod
+    def get_evaluator_result(evaluator, logger):
+        evaluator.logger = logger
+        return evaluator.getResult()
+
     def check_unique_metadata_identifier(self):
         unique_identifier_check = FAIREvaluatorUniqueIdentifierMetadata(self)
         return unique_identifier_check.getResult()
@@ -570,6 +657,13 @@ class FAIRCheck:
             pass
 """
 
+    def close_logger(self):
+        """Removes the handlers of the logger of this assessment and the logger itself"""
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+        logging.Logger.manager.loggerDict.pop(self.logger.name, None)
+
     def get_log_messages_dict(self):
         logger_messages = {}
         self.logger_message_stream.seek(0)
@@ -592,97 +686,12 @@ class FAIRCheck:
         return logger_messages
 
     def get_assessment_summary(self, results):
-        status_dict = {"pass": 1, "fail": 0}
-        summary_dict = {
-            "fair_category": [],
-            "fair_principle": [],
-            "score_earned": [],
-            "score_total": [],
-            "maturity": [],
-            "status": [],
-        }
-        for res_k, res_v in enumerate(results):
-            if res_v.get("metric_identifier"):
-                metric_match = re.search(
-                    r"^(?:FRSM-[0-9]+|FsF)-(([FAIR])[0-9](\.[0-9])?)", str(res_v.get("metric_identifier"))
-                )  # match both FAIR and FsF metrics
-                if metric_match.group(2) is not None:
-                    fair_principle = metric_match[1]
-                    fair_category = metric_match[2]
-                    earned_maturity = res_v["maturity"]
-                    # earned_maturity = [k for k, v in maturity_dict.items() if v == res_v['maturity']][0]
-                    summary_dict["fair_category"].append(fair_category)
-                    summary_dict["fair_principle"].append(fair_principle)
-                    # An easter egg for Mustapha
-                    if self.input_id in [
-                        "https://www.rd-alliance.org/users/mustapha-mokrane",
-                        "https://www.rd-alliance.org/users/ilona-von-stein",
-                    ]:
-                        summary_dict["score_earned"].append(res_v["score"]["total"])
-                        summary_dict["maturity"].append(3)
-                        summary_dict["status"].append(1)
-                    else:
-                        summary_dict["score_earned"].append(res_v["score"]["earned"])
-                        summary_dict["maturity"].append(earned_maturity)
-                        summary_dict["status"].append(status_dict.get(res_v["test_status"]))
-                    summary_dict["score_total"].append(res_v["score"]["total"])
-        sf = pd.DataFrame(summary_dict)
-        summary = {"score_earned": {}, "score_total": {}, "score_percent": {}, "status_total": {}, "status_passed": {}}
-
-        summary["score_earned"] = sf.groupby(by="fair_category")["score_earned"].sum().to_dict()
-        summary["score_earned"].update(sf.groupby(by="fair_principle")["score_earned"].sum().to_dict())
-        summary["score_earned"]["FAIR"] = round(float(sf["score_earned"].sum()), 2)
-
-        summary["score_total"] = sf.groupby(by="fair_category")["score_total"].sum().to_dict()
-        summary["score_total"].update(sf.groupby(by="fair_principle")["score_total"].sum().to_dict())
-        summary["score_total"]["FAIR"] = round(float(sf["score_total"].sum()), 2)
-
-        summary["score_percent"] = (
-            round(
-                sf.groupby(by="fair_category")["score_earned"].sum()
-                / sf.groupby(by="fair_category")["score_total"].sum()
-                * 100,
-                2,
-            )
-        ).to_dict()
-        summary["score_percent"].update(
-            (
-                round(
-                    sf.groupby(by="fair_principle")["score_earned"].sum()
-                    / sf.groupby(by="fair_principle")["score_total"].sum()
-                    * 100,
-                    2,
-                )
-            ).to_dict()
-        )
-        summary["score_percent"]["FAIR"] = round(float(sf["score_earned"].sum() / sf["score_total"].sum() * 100), 2)
-
-        summary["maturity"] = (
-            sf.groupby(by="fair_category")["maturity"]
-            .apply(lambda x: 1 if x.mean() < 1 and x.mean() > 0 else round(x.mean()))
-            .to_dict()
-        )
-        summary["maturity"].update(
-            sf.groupby(by="fair_principle")["maturity"]
-            .apply(lambda x: 1 if x.mean() < 1 and x.mean() > 0 else round(x.mean()))
-            .to_dict()
-        )
-        total_maturity = 0
-        for fair_index in ["F", "A", "I", "R"]:
-            if summary["maturity"].get(fair_index):
-                total_maturity += summary["maturity"][fair_index]
-        summary["maturity"]["FAIR"] = round(
-            float(1 if total_maturity / 4 < 1 and total_maturity / 4 > 0 else total_maturity / 4), 2
-        )
-
-        summary["status_total"] = sf.groupby(by="fair_principle")["status"].count().to_dict()
-        summary["status_total"].update(sf.groupby(by="fair_category")["status"].count().to_dict())
-        summary["status_total"]["FAIR"] = int(sf["status"].count())
-
-        summary["status_passed"] = sf.groupby(by="fair_principle")["status"].sum().to_dict()
-        summary["status_passed"].update(sf.groupby(by="fair_category")["status"].sum().to_dict())
-        summary["status_passed"]["FAIR"] = int(sf["status"].sum())
-        return summary
+        # An easter egg for Mustapha
+        full_score = self.input_id in [
+            "https://www.rd-alliance.org/users/mustapha-mokrane",
+            "https://www.rd-alliance.org/users/ilona-von-stein",
+        ]
+        return AssessmentSummary.summarise(AssessmentSummary.get_rows(results, full_score=full_score))
 
     def set_repository_uris(self):
         if self.landing_origin:
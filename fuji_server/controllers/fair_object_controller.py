@@ -5,8 +5,11 @@
 import datetime
 
 import connexion
+from connexion.problem import problem
 
 from fuji_server.controllers.fair_check import FAIRCheck
+from fuji_server.helper.deadline import Deadline
+from fuji_server.helper.evaluation_executor import EvaluationExecutor, EvaluationQueueFullError
 from fuji_server.helper.identifier_helper import IdentifierHelper
 from fuji_server.helper.preprocessor import Preprocessor
 from fuji_server.models.fair_results import FAIRResults
@@ -28,39 +31,63 @@ async def assess_by_id(body):
         # The client has to send this HTTP header (Allow-Remote-Logging:True) explicitely to enable remote logging
         # Useful for e.g. web clients..
         allow_remote_logging = connexion.request.headers.get("Allow-Remote-Logging")
-        debug = True
-        results = []
-        # json_body = await connexion.request.json()
-        # body = Body.from_dict(json_body)
-        # clienturi = Body.from_dict(connexion.request
-        identifier = body.get("object_identifier")
-        debug = body.get("test_debug")
-        metadata_service_endpoint = body.get("metadata_service_endpoint")
-        oaipmh_endpoint = body.get("oaipmh_endpoint")
-        metadata_service_type = body.get("metadata_service_type")
-        usedatacite = body.get("use_datacite")
-        usegithub = body.get("use_github")
-        metric_version = body.get("metric_version")
-        print("BODY METRIC", metric_version)
-        auth_token = body.get("auth_token")
-        auth_token_type = body.get("auth_token_type")
-        logger = Preprocessor.logger
-        # updating re3data
-        Preprocessor.retrieve_datacite_re3repos()
+        # the evaluation is blocking, so it is done by the evaluation workers to keep the event loop responsive
+        try:
+            # the time budget starts with the request, waiting for a free worker counts as well
+            return await EvaluationExecutor.run(evaluate, body, allow_remote_logging, Deadline.for_assessment())
+        except EvaluationQueueFullError as e:
+            Preprocessor.logger.warning("Evaluation rejected -: " + str(e))
+            return problem(
+                503,
+                "Service Unavailable",
+                "Too many evaluations are pending, please retry later",
+                headers={"Retry-After": str(EvaluationExecutor.retry_after)},
+            )
 
-        logger.info("Assessment target: " + identifier)
-        print("Assessment target: ", identifier, flush=True)
-        starttimestmp = datetime.datetime.now().replace(microsecond=0).isoformat() + "Z"
-        ft = FAIRCheck(
-            uid=identifier,
-            test_debug=debug,
-            metadata_service_url=metadata_service_endpoint,
-            metadata_service_type=metadata_service_type,
-            use_datacite=usedatacite,
-            use_github=usegithub,
-            oaipmh_endpoint=oaipmh_endpoint,
-            metric_version=metric_version,
-        )
+
+def evaluate(body, allow_remote_logging=False, deadline=None):
+    """Runs the complete (blocking) evaluation of a data object and returns the FAIRResults
+
+    :param body: the evaluation request
+    :type body: dict
+    :param allow_remote_logging: enables remote logging if configured
+    :param deadline: time budget of the evaluation, a new one is started if not given
+    :type deadline: Deadline
+    :rtype: FAIRResults
+    """
+    debug = True
+    results = []
+    # json_body = await connexion.request.json()
+    # body = Body.from_dict(json_body)
+    # clienturi = Body.from_dict(connexion.request
+    identifier = body.get("object_identifier")
+    debug = body.get("test_debug")
+    metadata_service_endpoint = body.get("metadata_service_endpoint")
+    oaipmh_endpoint = body.get("oaipmh_endpoint")
+    metadata_service_type = body.get("metadata_service_type")
+    usedatacite = body.get("use_datacite")
+    usegithub = body.get("use_github")
+    metric_version = body.get("metric_version")
+    print("BODY METRIC", metric_version)
+    auth_token = body.get("auth_token")
+    auth_token_type = body.get("auth_token_type")
+    logger = Preprocessor.logger
+
+    logger.info("Assessment target: " + identifier)
+    print("Assessment target: ", identifier, flush=True)
+    starttimestmp = datetime.datetime.now().replace(microsecond=0).isoformat() + "Z"
+    ft = FAIRCheck(
+        uid=identifier,
+        test_debug=debug,
+        metadata_service_url=metadata_service_endpoint,
+        metadata_service_type=metadata_service_type,
+        use_datacite=usedatacite,
+        use_github=usegithub,
+        oaipmh_endpoint=oaipmh_endpoint,
+        metric_version=metric_version,
+        deadline=deadline or Deadline.for_assessment(),
+    )
+    try:
         # dataset level authentication
         if auth_token:
             ft.set_auth_token(auth_token, auth_token_type)
@@ -76,49 +103,81 @@ async def assess_by_id(body):
             if ft.weblogger:
                 ft.logger.removeHandler(ft.weblogger)
 
-        print("starting harvesting ")
-        ft.harvest_all_metadata()
-        uid_result, pid_result = ft.check_unique_persistent_metadata_identifier()
-        if ft.repeat_pid_check:
-            ft.retrieve_metadata_external(ft.pid_url, repeat_mode=True)
-        ft.harvest_re3_data()
-        ft.harvest_github()
-        core_metadata_result = ft.check_minimal_metatadata()
-        # print(ft.metadata_unmerged)
-        content_identifier_included_result = ft.check_data_identifier_included_in_metadata()
-        # print('F-UJI checks: access level')
-        access_level_result = ft.check_data_access_level()
-        # print('F-UJI checks: license')
-        license_result = ft.check_license()
-        license_file_result = ft.check_license_file()
-        # print('F-UJI checks: related')
-        related_resources_result = ft.check_relatedresources()
-        # print('F-UJI checks: searchable')
-        check_searchable_result = ft.check_searchable()
-        # print('F-UJI checks: data content')
-        ft.harvest_all_data()
-        uid_data_result = ft.check_unique_content_identifier()
-        pid_data_result = ft.check_persistent_data_identifier()
-        upid_software_result = ft.check_unique_persistent_software_identifier()
-        software_component_result = ft.check_software_component_identifier()
-        version_identifier_result = ft.check_version_identifier()
-        development_metadata_result = ft.check_development_metadata()
-        open_api_result = ft.check_open_api()
-        requirements_result = ft.check_requirements()
-        test_cases_result = ft.check_test_cases()
-        data_identifier_included_result = ft.check_data_content_metadata()
-        metadata_identifier_included_result = ft.check_metadata_identifier_included_in_metadata()
-        data_file_format_result = ft.check_data_file_format()
-        # print('F-UJI checks: data file format')
-        community_standards_result = ft.check_community_metadatastandards()
-        data_provenance_result = ft.check_data_provenance()
-        code_provenance_result = ft.check_code_provenance()
-        formal_metadata_result = ft.check_formal_metadata()
-        # print('F-UJI checks: semantic vocab')
-        semantic_vocab_result = ft.check_semantic_vocabulary()
-        metadata_preserved_result = ft.check_metadata_preservation()
-        standard_protocol_data_result = ft.check_standardised_protocol_data()
-        standard_protocol_metadata_result = ft.check_standardised_protocol_metadata()
+        # the deadline caps all requests of the evaluation, also those of concurrent harvesting tasks
+        with ft.deadline.activate():
+            print("starting harvesting ")
+            ft.harvest_all_metadata()
+            uid_result, pid_result = ft.check_unique_persistent_metadata_identifier()
+            if ft.repeat_pid_check:
+                ft.retrieve_metadata_external(ft.pid_url, repeat_mode=True)
+            ft.harvest_re3_data()
+            ft.harvest_github()
+            # independent checks run concurrently, results and debug messages keep the order of the checks
+            (
+                core_metadata_result,
+                content_identifier_included_result,
+                access_level_result,
+                license_result,
+                license_file_result,
+                related_resources_result,
+                check_searchable_result,
+            ) = ft.run_checks(
+                [
+                    "check_minimal_metatadata",
+                    "check_data_identifier_included_in_metadata",
+                    "check_data_access_level",
+                    "check_license",
+                    "check_license_file",
+                    "check_relatedresources",
+                    "check_searchable",
+                ]
+            )
+            ft.harvest_all_data()
+            (
+                uid_data_result,
+                pid_data_result,
+                upid_software_result,
+                software_component_result,
+                version_identifier_result,
+                development_metadata_result,
+                open_api_result,
+                requirements_result,
+                test_cases_result,
+                data_identifier_included_result,
+                metadata_identifier_included_result,
+                data_file_format_result,
+                community_standards_result,
+                data_provenance_result,
+                code_provenance_result,
+                formal_metadata_result,
+                semantic_vocab_result,
+                metadata_preserved_result,
+                standard_protocol_data_result,
+                standard_protocol_metadata_result,
+            ) = ft.run_checks(
+                [
+                    "check_unique_content_identifier",
+                    "check_persistent_data_identifier",
+                    "check_unique_persistent_software_identifier",
+                    "check_software_component_identifier",
+                    "check_version_identifier",
+                    "check_development_metadata",
+                    "check_open_api",
+                    "check_requirements",
+                    "check_test_cases",
+                    "check_data_content_metadata",
+                    "check_metadata_identifier_included_in_metadata",
+                    "check_data_file_format",
+                    "check_community_metadatastandards",
+                    "check_data_provenance",
+                    "check_code_provenance",
+                    "check_formal_metadata",
+                    "check_semantic_vocabulary",
+                    "check_metadata_preservation",
+                    "check_standardised_protocol_data",
+                    "check_standardised_protocol_metadata",
+                ]
+            )
         if uid_result:
             results.append(uid_result)
         if pid_result:
@@ -191,8 +250,6 @@ async def assess_by_id(body):
             else:
                 results[res_k]["test_debug"] = ["INFO: Debugging disabled"]
                 debug_messages = {}
-        if len(ft.logger.handlers) > 1:
-            ft.logger.handlers = [ft.logger.handlers[-1]]
         # endtimestmp = datetime.datetime.now().replace(microsecond=0).isoformat()
         endtimestmp = (
             datetime.datetime.now().replace(microsecond=0).isoformat() + "Z"
@@ -221,4 +278,10 @@ async def assess_by_id(body):
             summary=summary,
             resolved_url=resolved_url,
         )
-    return final_response
+        if ft.isDebug:
+            # e.g. harvesting stages skipped since none of the loaded metrics needs them
+            final_response.test_debug = ["INFO: " + message for message in ft.harvest_plan.get_report()]
+        return final_response
+    finally:
+        # each assessment has its own logger, its handlers are removed once it is finished
+        ft.close_logger()
@@ -35,6 +35,14 @@ class FAIREvaluator:
     # according to the CMMI model
     maturity_levels = Mapper.MATURITY_LEVELS.value
 
+    # attributes of the fuji instance the evaluator reads (inputs) and changes (side_effects), evaluators which
+    # do not change what the other one reads or changes are independent and may run concurrently (see depends_on).
+    # None means unknown, such evaluators always run after all previous and before all following ones.
+    inputs = None
+    side_effects = ()
+    # identifiers of all metrics the evaluator may evaluate (see set_metric), used to plan without instances
+    metric_identifiers = ()
+
     # {0: 'incomplete', 1: 'initial', 2: 'managed', 3: 'defined', 4: 'quantitatively managed',5: 'optimizing'}
     def __init__(self, fuji_instance):
         """
@@ -56,6 +64,23 @@ class FAIREvaluator:
         self.logger = self.fuji.logger
         self.metric_regex = r"^FsF-[FAIR][0-9]?(\.[0-9])?-[0-9]+[MD]+(-[0-9]+[a-z]?)?|^FRSM-[0-9]+-[FAIR][0-9]?(\.[0-9])?(-[0-9]+)?"  # match FsF or FAIR4RS metric identifiers
 
+    @classmethod
+    def get_metric_identifiers(cls, metric_version):
+        """Identifiers of the metrics the evaluator may evaluate for the version of the metrics (e.g. '0.5')"""
+        return cls.metric_identifiers
+
+    @classmethod
+    def depends_on(cls, evaluator_class):
+        """True if the evaluator has to run after evaluator_class (run before) since it uses state changed by it
+        or changes state used by it"""
+        if cls.inputs is None or evaluator_class.inputs is None:
+            return True
+        used = set(cls.inputs) | set(cls.side_effects)
+        return bool(
+            used & set(evaluator_class.side_effects)
+            or set(cls.side_effects) & (set(evaluator_class.inputs) | set(evaluator_class.side_effects))
+        )
+
     def set_maturity(self, maturity):
         if self.maturity < maturity:
             self.maturity = maturity
@@ -18,6 +18,9 @@ class FAIREvaluatorAPI(FAIREvaluator):
         This method will evaluate whether the API is documented, open and machine-readable.
     """
 
+    metric_identifiers = ("FRSM-11-I1",)
+    inputs = ()
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         metric = "FRSM-11-I1"
@@ -19,6 +19,9 @@ class FAIREvaluatorCodeProvenance(FAIREvaluator):
         This method will evaluate the provenance information such as commits
     """
 
+    metric_identifiers = ("FRSM-17-R1.2",)
+    inputs = ()
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric(["FRSM-17-R1.2"])
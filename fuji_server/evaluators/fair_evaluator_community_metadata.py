@@ -26,6 +26,22 @@ class FAIREvaluatorCommunityMetadata(FAIREvaluator):
         or the metadata service outputs.
     """
 
+    metric_identifiers = ("FsF-R1.3-01M",)
+    inputs = (
+        "csw_endpoint",
+        "landing_url",
+        "metadata_harvester",
+        "metadata_merged",
+        "metadata_service_type",
+        "metadata_service_url",
+        "namespace_uri",
+        "oaipmh_endpoint",
+        "pid_scheme",
+        "repo_helper",
+        "sparql_endpoint",
+    )
+    side_effects = ("namespace_uri", "oaipmh_endpoint", "sparql_endpoint")
+
     def __init__(self, fuji_instance):
         self.pids_which_resolve = {}
         FAIREvaluator.__init__(self, fuji_instance)
@@ -23,6 +23,10 @@ class FAIREvaluatorDataAccessLevel(FAIREvaluator):
         using a appropriate metadata field or using a machine-readable and verified against controlled vocabularies.
     """
 
+    metric_identifiers = ("FsF-A1-01M",)
+    inputs = ("metadata_merged",)
+    side_effects = ("metadata_merged",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         # if self.fuji.metric_helper.get_metric_version() <= 0.5:
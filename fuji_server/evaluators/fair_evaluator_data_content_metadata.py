@@ -22,6 +22,10 @@ class FAIREvaluatorDataContentMetadata(FAIREvaluator):
         verifiable data descriptor file info (size and type) and the measured variables observation types will also be evaluated.
     """
 
+    metric_identifiers = ("FsF-R1-01MD",)
+    inputs = ("content_identifier", "isLandingPageAccessible", "metadata_merged")
+    side_effects = ("content_identifier",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric("FsF-R1-01MD")
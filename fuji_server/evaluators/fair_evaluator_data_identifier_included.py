@@ -24,6 +24,10 @@ class FAIREvaluatorDataIdentifierIncluded(FAIREvaluator):
         a data identifier that matches the identifier as part of the assessment request.
     """
 
+    metric_identifiers = ("FsF-F3-01M", "FRSM-07-F3")
+    inputs = ("content_identifier", "metadata_merged")
+    side_effects = ("metadata_merged",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric(["FsF-F3-01M", "FRSM-07-F3"])
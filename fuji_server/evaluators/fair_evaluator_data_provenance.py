@@ -24,6 +24,9 @@ class FAIREvaluatorDataProvenance(FAIREvaluator):
         a machine-readabe version such PROV-O or PAV
     """
 
+    metric_identifiers = ("FsF-R1.2-01M", "FRSM-06-F2")
+    inputs = ("metadata_merged", "namespace_uri")
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric(["FsF-R1.2-01M", "FRSM-06-F2"])
@@ -18,6 +18,9 @@ class FAIREvaluatorDevelopmentMetadata(FAIREvaluator):
         This method will evaluate whether the software has machine-readable descriptive metadata associated with it that describes its development and status.
     """
 
+    metric_identifiers = ("FRSM-05-R1",)
+    inputs = ()
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         metric = "FRSM-05-R1"
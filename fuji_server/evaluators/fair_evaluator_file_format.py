@@ -24,6 +24,10 @@ class FAIREvaluatorFileFormat(FAIREvaluator):
         or in open format (see e.g., https://en.wikipedia.org/wiki/List_of_open_formats) or in a scientific file format.
     """
 
+    metric_identifiers = ("FsF-R1.3-02D", "FRSM-10-I1")
+    inputs = ("content_identifier", "metadata_merged")
+    side_effects = ("content_identifier",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric(["FsF-R1.3-02D", "FRSM-10-I1"])
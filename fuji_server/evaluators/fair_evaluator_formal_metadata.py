@@ -22,6 +22,10 @@ class FAIREvaluatorFormalMetadata(FAIREvaluator):
         formal metadata, e.g., RDF, JSON-LD, is accessible.
     """
 
+    metric_identifiers = ("FsF-I1-01M",)
+    inputs = ("landing_url", "metadata_sources", "namespace_uri", "pid_url", "sparql_endpoint")
+    side_effects = ("namespace_uri",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric("FsF-I1-01M")
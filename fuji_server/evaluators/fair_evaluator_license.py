@@ -27,6 +27,9 @@ class FAIREvaluatorLicense(FAIREvaluator):
 
     """
 
+    metric_identifiers = ("FsF-R1.1-01M", "FRSM-16-R1.1")
+    inputs = ("github_data", "metadata_merged")
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric(["FsF-R1.1-01M", "FRSM-16-R1.1"])
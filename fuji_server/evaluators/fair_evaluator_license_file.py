@@ -28,6 +28,9 @@ class FAIREvaluatorLicenseFile(FAIREvaluator):
 
     """
 
+    metric_identifiers = ("FRSM-15-R1.1",)
+    inputs = ("github_data",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric(["FRSM-15-R1.1"])
@@ -20,6 +20,9 @@ class FAIREvaluatorMetadataIdentifierIncluded(FAIREvaluator):
         a data identifier that matches the identifier as part of the assessment request.
     """
 
+    metric_identifiers = ("FsF-F3-02M",)
+    inputs = ("id", "landing_url", "metadata_unmerged", "pid_url")
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric("FsF-F3-02M")
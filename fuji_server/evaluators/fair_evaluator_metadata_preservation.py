@@ -19,6 +19,9 @@ class FAIREvaluatorMetadataPreserved(FAIREvaluator):
 
     """
 
+    metric_identifiers = ("FsF-A2-01M", "FRSM-08-F4")
+    inputs = ("pid_scheme",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric(["FsF-A2-01M", "FRSM-08-F4"])
@@ -22,6 +22,9 @@ class FAIREvaluatorCoreMetadata(FAIREvaluator):
         through appropriate metadata fields.
     """
 
+    metric_identifiers = ("FsF-F2-01M", "FRSM-04-F2")
+    inputs = ("landing_url", "metadata_merged", "metadata_sources")
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric(["FsF-F2-01M", "FRSM-04-F2"])
@@ -19,6 +19,9 @@ class FAIREvaluatorPersistentIdentifierData(FAIREvaluator):
         the identifier is web-accesible, i.e., it resolves to a landing page with metadata of the data object.
     """
 
+    metric_identifiers = ("FsF-F1-02DD",)
+    inputs = ("content_identifier", "pid_scheme")
+
     def __init__(self, fuji_instance):
         self.pids_which_resolve = {}
         FAIREvaluator.__init__(self, fuji_instance)
@@ -20,14 +20,20 @@ class FAIREvaluatorPersistentIdentifierMetadata(FAIREvaluator):
         the identifier is web-accesible, i.e., it resolves to a landing page with metadata of the data object.
     """
 
+    inputs = ("isLandingPageAccessible", "pid_collector", "pid_scheme", "verify_pids")
+    side_effects = ("isLandingPageAccessible",)
+
+    @classmethod
+    def get_metric_identifiers(cls, metric_version):
+        if metric_version != "0.5":
+            return ("FsF-F1-02M",)
+        # after 0.5 seperate metrics for metadata and data
+        return ("FsF-F1-02D",)
+
     def __init__(self, fuji_instance):
         self.pids_which_resolve = {}
         FAIREvaluator.__init__(self, fuji_instance)
-        if self.fuji.metric_helper.get_metric_version() != "0.5":
-            metric = "FsF-F1-02M"
-        else:
-            metric = "FsF-F1-02D"
-        self.set_metric(metric)
+        self.set_metric(self.get_metric_identifiers(self.fuji.metric_helper.get_metric_version())[0])
 
     def setPidsOutput(self):
         self.output.persistent_identifiers = []
@@ -21,6 +21,10 @@ class FAIREvaluatorRelatedResources(FAIREvaluator):
         they relate by machine-readable links/identifier.
     """
 
+    metric_identifiers = ("FsF-I3-01M", "FRSM-12-I2")
+    inputs = ("related_resources",)
+    side_effects = ("related_resources",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric(["FsF-I3-01M", "FRSM-12-I2"])
@@ -20,6 +20,9 @@ class FAIREvaluatorRequirements(FAIREvaluator):
         This method will evaluate machine-readable information that helps support the understanding of how the software is to be used.
     """
 
+    metric_identifiers = ("FRSM-13-R1",)
+    inputs = ("github_data",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         metric = "FRSM-13-R1"
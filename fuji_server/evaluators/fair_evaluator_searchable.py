@@ -27,6 +27,22 @@ class FAIREvaluatorSearchable(FAIREvaluator):
         the metadata is given in a way major search engines can ingest it, e.g., JSON-LD, Dublin Core, RDFa.
     """
 
+    metric_identifiers = ("FsF-F4-01M",)
+    inputs = (
+        "csw_endpoint",
+        "landing_url",
+        "metadata_merged",
+        "metadata_sources",
+        "metadata_unmerged",
+        "oaipmh_endpoint",
+        "pid_scheme",
+        "pid_url",
+        "repo_helper",
+        "sparql_endpoint",
+        "use_datacite",
+    )
+    side_effects = ("oaipmh_endpoint", "sparql_endpoint")
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric("FsF-F4-01M")
@@ -197,13 +213,13 @@ class FAIREvaluatorSearchable(FAIREvaluator):
                 pidhelper = IdentifierHelper(self.fuji.pid_url)
                 if self.fuji.pid_scheme:
                     if "doi" in self.fuji.pid_scheme:
-                        datacite_registry_helper = MetaDataCatalogueDataCite(self.fuji.logger)
+                        datacite_registry_helper = MetaDataCatalogueDataCite(self.logger)
                         datacite_registry_helper.query(pidhelper.normalized_id)
                         if datacite_registry_helper.islisted:
                             registries_supported.append(datacite_registry_helper.source)
                 if not registries_supported:
                     google_registry_helper = MetaDataCatalogueGoogleDataSearch(
-                        self.fuji.logger, self.fuji.metadata_merged.get("object_type")
+                        self.logger, self.fuji.metadata_merged.get("object_type")
                     )
                     google_registry_helper.query([pidhelper.normalized_id, self.fuji.landing_url])
                     if google_registry_helper.islisted:
@@ -215,7 +231,7 @@ class FAIREvaluatorSearchable(FAIREvaluator):
                     )
 
                 if not registries_supported:
-                    mendeley_registry_helper = MetaDataCatalogueMendeleyData(self.fuji.logger)
+                    mendeley_registry_helper = MetaDataCatalogueMendeleyData(self.logger)
                     mendeley_registry_helper.query([pidhelper.normalized_id, self.fuji.landing_url])
                     if mendeley_registry_helper.islisted:
                         registries_supported.append(mendeley_registry_helper.source)
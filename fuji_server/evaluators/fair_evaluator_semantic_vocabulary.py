@@ -24,6 +24,10 @@ class FAIREvaluatorSemanticVocabulary(FAIREvaluator):
         excluded from the evaluation.
     """
 
+    metric_identifiers = ("FsF-I2-01M",)
+    inputs = ("linked_namespace_uri", "namespace_uri")
+    side_effects = ("linked_namespace_uri", "namespace_uri")
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric("FsF-I2-01M")
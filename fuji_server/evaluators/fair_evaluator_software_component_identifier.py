@@ -18,6 +18,9 @@ class FAIREvaluatorSoftwareComponentIdentifier(FAIREvaluator):
         This method will evaluate whether the software is assigned to a unique and persistent identifier.
     """
 
+    metric_identifiers = ("FRSM-02-F1.1",)
+    inputs = ()
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         metric = "FRSM-02-F1.1"
@@ -22,6 +22,9 @@ class FAIREvaluatorStandardisedProtocolData(FAIREvaluator):
         a shared application protocol.
     """
 
+    metric_identifiers = ("FsF-A1-03D", "FRSM-09-A1")
+    inputs = ("content_identifier",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric(["FsF-A1-03D", "FRSM-09-A1"])
@@ -24,6 +24,9 @@ class FAIREvaluatorStandardisedProtocolMetadata(FAIREvaluator):
 
     """
 
+    metric_identifiers = ("FsF-A1-02M",)
+    inputs = ("landing_url", "metadata_merged")
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         self.set_metric("FsF-A1-02M")
@@ -18,6 +18,9 @@ class FAIREvaluatorTestCases(FAIREvaluator):
         This method will evaluate automated tests.
     """
 
+    metric_identifiers = ("FRSM-14-R1",)
+    inputs = ()
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         metric = "FRSM-14-R1"
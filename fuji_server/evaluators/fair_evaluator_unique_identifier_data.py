@@ -20,6 +20,9 @@ class FAIREvaluatorUniqueIdentifierData(FAIREvaluator):
         identifier is resolvable and follows a defined unique identifier syntax (URL, IRI).
     """
 
+    metric_identifiers = ("FsF-F1-01DD",)
+    inputs = ("content_identifier", "metadata_merged")
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         metric = "FsF-F1-01DD"
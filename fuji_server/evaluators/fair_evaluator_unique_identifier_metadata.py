@@ -20,14 +20,19 @@ class FAIREvaluatorUniqueIdentifierMetadata(FAIREvaluator):
         identifier is resolvable and follows a defined unique identifier syntax (URL, IRI).
     """
 
+    inputs = ("id", "id_scheme", "pid_scheme", "pid_url")
+    side_effects = ("id_scheme", "pid_scheme", "pid_url")
+
+    @classmethod
+    def get_metric_identifiers(cls, metric_version):
+        if metric_version != "0.5":
+            return ("FsF-F1-01M",)
+        # after 0.5 seperate metrics for metadata and data
+        return ("FsF-F1-01D",)
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
-        if self.fuji.metric_helper.get_metric_version() != "0.5":
-            metric = "FsF-F1-01M"
-        else:
-            metric = "FsF-F1-01D"
-            # after 0.5 seperate metrics for metadata and data
-        self.set_metric(metric)
+        self.set_metric(self.get_metric_identifiers(self.fuji.metric_helper.get_metric_version())[0])
 
     def testMetadataIdentifierCompliesWithIdutilsScheme(self, validschemes=[]):
         test_status = False
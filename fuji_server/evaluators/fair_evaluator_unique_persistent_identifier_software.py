@@ -19,6 +19,9 @@ class FAIREvaluatorUniquePersistentIdentifierSoftware(FAIREvaluator):
         This method will evaluate whether the software is assigned to a unique and persistent identifier.
     """
 
+    metric_identifiers = ("FRSM-01-F1",)
+    inputs = ()
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         metric = "FRSM-01-F1"
@@ -18,6 +18,9 @@ class FAIREvaluatorVersionIdentifier(FAIREvaluator):
         This method will evaluate whether each software identifier resolves to a different version and examine identifier metadata.
     """
 
+    metric_identifiers = ("FRSM-03-F1.2",)
+    inputs = ()
+
     def __init__(self, fuji_instance):
         FAIREvaluator.__init__(self, fuji_instance)
         metric = "FRSM-03-F1.2"
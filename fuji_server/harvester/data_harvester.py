@@ -5,27 +5,58 @@
 import io
 import os
 import re
-import threading
-import urllib
+import time
+from concurrent.futures import wait
 
 import idutils
-from tika import parser
+import requests
 
+from fuji_server.helper.concurrent_helper import BufferedLogger
+from fuji_server.helper.content_inspector import ContentInspector
+from fuji_server.helper.data_download_executor import DataDownloadCancelled, DataDownloadExecutor, DownloadBudget
+from fuji_server.helper.data_info_cache import DataInfoCache
+from fuji_server.helper.deadline import Deadline
+from fuji_server.helper.http_transport import HTTPTransport
 from fuji_server.helper.identifier_helper import IdentifierHelper
 
 
 class DataHarvester:
     LOG_SUCCESS = 25
     LOG_FAILURE = 35
+    # metrics which analyse the content of data files, if none of them is evaluated HTTP headers are sufficient
+    content_metrics = ["FsF-R1-01MD", "FsF-R1.3-02D", "FRSM-10-I1"]
+    # request only the first max_download_size bytes of data files (HTTP Range)
+    use_range_requests = True
+    # only send a HEAD request to data files if their content is not analysed
+    use_head_requests = True
 
-    def __init__(self, data_links, logger, landing_page=None, auth_token=None, auth_token_type="Basic", metrics=None):
+    @classmethod
+    def set_options(cls, use_range_requests=None, use_head_requests=None):
+        if use_range_requests is not None:
+            cls.use_range_requests = bool(use_range_requests)
+        if use_head_requests is not None:
+            cls.use_head_requests = bool(use_head_requests)
+
+    def __init__(
+        self,
+        data_links,
+        logger,
+        landing_page=None,
+        auth_token=None,
+        auth_token_type="Basic",
+        metrics=None,
+        deadline=None,
+    ):
         self.logger = logger
         self.data_links = data_links
         self.auth_token = auth_token
         self.auth_token_type = auth_token_type
         self.metrics = metrics
+        self.deadline = deadline or Deadline()
         self.timeout = 10
         self.max_download_size = 1000000
+        # size of the chunks in which data files are read, the time budget is checked after each chunk
+        self.chunk_size = 65536
         self.max_number_per_mime = 5
         self.data = {}
         self.landing_page = landing_page
@@ -110,7 +141,6 @@ class DataHarvester:
 
         # threaded download starts here
         for fmime, ft in sorted_files.items():
-            timeout = 10
             if len(ft) > self.max_number_per_mime:
                 self.logger.warning(
                     f"FsF-F3-01M : Found more than -: {self.max_number_per_mime!s} data links (out of {len(ft)!s}) of type {fmime} will only take {self.max_number_per_mime!s} for content analysis"
@@ -129,88 +159,178 @@ class DataHarvester:
                     urls_to_check[f.get("url")] = f
             # urls_to_check.extend([f.get('url') for f in ft[:self.max_number_per_mime]])
             # urls = [f.get('url') for f in ft[:self.max_number_per_mime]]
-        e = threading.Event()
         if urls_to_check:
-            # urls_to_check =list(set([u for u in urls_to_check if u]))
-            threads = [
-                threading.Thread(target=self.get_url_data_and_info, args=(url, timeout))
-                for url in urls_to_check.values()
-            ]
-            for thread in threads:
-                thread.start()
-            for ti, thread in enumerate(threads):
-                if ti > 0:
-                    timeout = 1
-                thread.join(timeout)
-                if thread.is_alive():
-                    e.set()
-                thread.join()
-                # thread ends here
-                # print(self.data)
+            # downloads run in the shared pool, their log messages are passed on in the order of the files
+            if self.deadline.skip(self.logger, "FsF-F3-01M", f"content analysis of {len(urls_to_check)} data files"):
+                return True
+            # the downloads must not exceed the time budget of the assessment either
+            budget = DownloadBudget(min(DataDownloadExecutor.time_budget, self.deadline.remaining()))
+            downloads = []
+            for urldict in urls_to_check.values():
+                logger = BufferedLogger(self.logger)
+                future = DataDownloadExecutor.submit(
+                    urldict.get("url"), budget, self.get_url_data_and_info, urldict, self.timeout, budget, logger
+                )
+                downloads.append((urldict, logger, future))
+            wait([future for _, _, future in downloads], timeout=budget.remaining())
+            # stops the downloads which are still running
+            budget.cancel()
+            skipped = 0
+            for urldict, logger, future in downloads:
+                if not future.done():
+                    future.cancel()
+                    skipped += 1
+                    continue
+                logger.flush()
+                try:
+                    fileinfo = future.result()
+                except DataDownloadCancelled:
+                    skipped += 1
+                    continue
+                except Exception as e:
+                    self.logger.warning(
+                        f"FsF-F3-01M : Content identifier inaccessible -: {urldict.get('url')}, {type(e).__name__} {e}"
+                    )
+                    continue
+                if fileinfo:
+                    self.data[urldict.get("url")] = fileinfo
+            if skipped:
+                self.logger.warning(
+                    f"FsF-F3-01M : Time budget for data downloads exceeded, skipped -: {skipped} of {len(downloads)} data files"
+                )
         return True
 
-    def get_url_data_and_info(self, urldict, timeout):
+    def is_content_needed(self):
+        if self.metrics is None:
+            return True
+        return any(metric in self.metrics for metric in self.content_metrics)
+
+    def request_data(self, url, header, timeout):
+        """Returns the (streamed) response to a HEAD or partial GET request of the data file at url"""
+        if self.use_head_requests and not self.is_content_needed():
+            response = HTTPTransport.head(url, headers=header, timeout=timeout)
+            # some servers (e.g. signed S3 URLs) reject HEAD requests, the GET request decides then
+            if response.status_code < 400:
+                return response
+            response.close()
+        if self.use_range_requests:
+            response = HTTPTransport.get(
+                url, headers=dict(header, Range=f"bytes=0-{self.max_download_size - 1}"), timeout=timeout, stream=True
+            )
+            if response.status_code != 416:
+                response.raise_for_status()
+                return response
+            # range not satisfiable, e.g. an empty file
+            response.close()
+        response = HTTPTransport.get(url, headers=header, timeout=timeout, stream=True)
+        response.raise_for_status()
+        return response
+
+    def get_url_data_and_info(self, urldict, timeout, budget=None, logger=None):
+        if logger is None:
+            logger = self.logger
         header = {"Accept": "*/*", "User-Agent": "F-UJI"}
         if self.auth_token:
             header["Authorization"] = self.auth_token_type + " " + self.auth_token
-        # header["Range"] = "bytes=0-" + str(self.max_download_size)
         url = urldict.get("url")
         if url:
             if not idutils.is_url(url):
                 url = self.expand_url(url)
             # print("Downloading.. ", url)
             response = None
+            started = time.monotonic()
+            if budget:
+                timeout = min(timeout, max(budget.remaining(), 0.1))
+            # downloads with credentials are not shared with other evaluations
+            use_cache = not self.auth_token and self.is_content_needed()
+            if use_cache:
+                fileinfo = self.get_cached_data_info(urldict, url, header, timeout, logger)
+                if fileinfo:
+                    return fileinfo
             try:
-                request = urllib.request.Request(url, headers=header)
-                response = urllib.request.urlopen(request, timeout=timeout)
+                response = self.request_data(url, header, timeout)
                 self.responses[url] = response
-            except urllib.error.HTTPError as e:
-                self.logger.warning(f"FsF-F3-01M : Content identifier inaccessible -: {url}, HTTPError code {e.code} ")
-                self.logger.warning(f"FsF-R1-01MD : Content identifier inaccessible -: {url}, HTTPError code {e.code} ")
-                self.logger.warning(
-                    f"FsF-R1.3-02D : Content identifier inaccessible -: {url}, HTTPError code {e.code} "
-                )
-            except urllib.error.URLError as e:
-                self.logger.exception(e.reason)
-                self.logger.warning(
-                    f"FsF-F3-01M : Content identifier inaccessible -: {url}, URLError reason {e.reason} "
-                )
-                self.logger.warning(
-                    f"FsF-R1-01MD : Content identifier inaccessible -: {url}, URLError reason {e.reason} "
-                )
-                self.logger.warning(
-                    f"FsF-R1.3-02D : Content identifier inaccessible -: {url}, URLError reason {e.reason} "
-                )
+            except requests.exceptions.HTTPError as e:
+                code = e.response.status_code
+                e.response.close()
+                response = None
+                logger.warning(f"FsF-F3-01M : Content identifier inaccessible -: {url}, HTTPError code {code} ")
+                logger.warning(f"FsF-R1-01MD : Content identifier inaccessible -: {url}, HTTPError code {code} ")
+                logger.warning(f"FsF-R1.3-02D : Content identifier inaccessible -: {url}, HTTPError code {code} ")
+            except requests.exceptions.ConnectionError as e:
+                logger.exception(e)
+                logger.warning(f"FsF-F3-01M : Content identifier inaccessible -: {url}, URLError reason {e} ")
+                logger.warning(f"FsF-R1-01MD : Content identifier inaccessible -: {url}, URLError reason {e} ")
+                logger.warning(f"FsF-R1.3-02D : Content identifier inaccessible -: {url}, URLError reason {e} ")
             except Exception as e:
-                self.logger.warning("FsF-F3-01M : Content identifier inaccessible -:" + url + " " + str(e))
-                self.logger.warning("FsF-R1-01MD : Content identifier inaccessible -:" + url + " " + str(e))
-                self.logger.warning("FsF-R1.3-02D : Content identifier inaccessible -:" + url + " " + str(e))
-            self.set_data_info(urldict, response)
+                logger.warning("FsF-F3-01M : Content identifier inaccessible -:" + url + " " + str(e))
+                logger.warning("FsF-R1-01MD : Content identifier inaccessible -:" + url + " " + str(e))
+                logger.warning("FsF-R1.3-02D : Content identifier inaccessible -:" + url + " " + str(e))
+            try:
+                fileinfo = self.set_data_info(urldict, response, budget, logger)
+                if use_cache and fileinfo.get("verified") and "content_size" in fileinfo:
+                    DataInfoCache.set(url, DataInfoCache.get_validators(response), fileinfo)
+            finally:
+                if response is not None:
+                    response.close()
+            download_time = time.monotonic() - started
+            logger.info(
+                f"FsF-R1-01MD : Data file retrieved -: {url} ({fileinfo.get('status_code')}, {fileinfo.get('content_size')} bytes, {download_time:.2f}s)"
+            )
+            return fileinfo
 
-    def set_data_info(self, urldict, response):
+    def get_link_info(self, urldict):
+        fileinfo = {
+            "url": urldict.get("url"),
+            "claimed_size": urldict.get("size"),
+            "claimed_type": urldict.get("type"),
+            "truncated": False,
+            "is_persistent": False,
+        }
+        idhelper = IdentifierHelper(urldict.get("url"))
+        if idhelper.preferred_schema:
+            fileinfo["schema"] = idhelper.preferred_schema
+        if idhelper.is_persistent:
+            fileinfo["is_persistent"] = True
+        return fileinfo
+
+    def get_cached_data_info(self, urldict, url, header, timeout, logger):
+        """Returns the cached info of the data file at url if a HEAD request confirms that it has not changed"""
+        cached = DataInfoCache.get(url)
+        if cached is None:
+            return None
+        validators, info = cached
+        try:
+            response = HTTPTransport.head(url, headers=header, timeout=timeout)
+            response.close()
+        except Exception as e:
+            logger.info(f"FsF-R1-01MD : Could not revalidate cached data file info -: {url} {e}")
+            return None
+        if response.status_code >= 400 or DataInfoCache.get_validators(response) != validators:
+            return None
+        fileinfo = self.get_link_info(urldict)
+        fileinfo.update(info)
+        if info.get("header_content_type"):
+            self.content_type = info.get("header_content_type")
+        logger.info(f"FsF-R1-01MD : Using cached data file info, file unchanged -: {url}")
+        return fileinfo
+
+    def set_data_info(self, urldict, response, budget=None, logger=None):
+        if logger is None:
+            logger = self.logger
         fileinfo = {}
         if isinstance(urldict, dict):
-            fileinfo = {
-                "url": urldict.get("url"),
-                "claimed_size": urldict.get("size"),
-                "claimed_type": urldict.get("type"),
-                "truncated": False,
-                "is_persistent": False,
-            }
-            idhelper = IdentifierHelper(urldict.get("url"))
-            if idhelper.preferred_schema:
-                fileinfo["schema"] = idhelper.preferred_schema
-            if idhelper.is_persistent:
-                fileinfo["is_persistent"] = True
+            fileinfo = self.get_link_info(urldict)
             # response related info
             if response:
                 file_buffer_object = io.BytesIO()
-                rstatus = response.getcode()
+                rstatus = response.status_code
                 fileinfo["status_code"] = rstatus
                 fileinfo["verified"] = False
-                if fileinfo.get("status_code") == 200:
+                # 206: partial content of a range request
+                if fileinfo.get("status_code") in [200, 206]:
                     fileinfo["verified"] = True
-                fileinfo["resolved_url"] = response.geturl()
+                fileinfo["resolved_url"] = response.url
                 if response.headers.get("content-type"):
                     self.content_type = fileinfo["header_content_type"] = response.headers.get("content-type").split(
                         ";"
@@ -223,57 +343,89 @@ class DataHarvester:
                     fileinfo["header_content_size"] = response.headers.get("content-length").split(";")[0]
                 elif response.headers.get("Content-Length"):
                     fileinfo["header_content_size"] = response.headers.get("Content-Length").split(";")[0]
+                if rstatus == 206:
+                    # the size of the whole file, e.g. 'bytes 0-999999/52428800'
+                    range_match = re.match(
+                        r"bytes\s+[0-9]+-[0-9]+/([0-9]+)", str(response.headers.get("content-range"))
+                    )
+                    fileinfo["header_content_size"] = range_match[1] if range_match else None
                 try:
                     fileinfo["header_content_size"] = int(fileinfo["header_content_size"])
                 except:
                     fileinfo["header_content_size"] = self.max_download_size
                     pass
-                content = response.read(self.max_download_size)
-                file_buffer_object.write(content)
+                if getattr(getattr(response, "request", None), "method", None) == "HEAD":
+                    # only header info is needed
+                    return fileinfo
+                for chunk in response.raw.stream(self.chunk_size, decode_content=True):
+                    if budget:
+                        budget.check()
+                    file_buffer_object.write(chunk[: self.max_download_size - file_buffer_object.tell()])
+                    if file_buffer_object.tell() >= self.max_download_size:
+                        break
                 fileinfo["content_size"] = file_buffer_object.getbuffer().nbytes
                 if fileinfo["content_size"] < fileinfo["header_content_size"]:
                     fileinfo["truncated"] = True
                 if fileinfo["content_size"] > 0:
-                    fileinfo.update(self.tika(file_buffer_object, urldict.get("url")))
-
-            self.data[urldict.get("url")] = fileinfo
+                    # identical content (e.g. the same file at another URL) is only inspected once
+                    content_hash = "{}|{}".format(
+                        DataInfoCache.get_content_hash(file_buffer_object.getvalue()),
+                        fileinfo.get("header_content_type"),
+                    )
+                    inspection = DataInfoCache.get_inspection(content_hash)
+                    if inspection is not None:
+                        file_buffer_object.close()
+                        logger.info(
+                            f"FsF-R1-01MD : Using cached inspection of identical content -: {urldict.get('url')}"
+                        )
+                    else:
+                        inspection = self.inspect_content(
+                            file_buffer_object, urldict.get("url"), fileinfo.get("header_content_type"), logger
+                        )
+                        DataInfoCache.set_inspection(content_hash, inspection)
+                    fileinfo.update(inspection)
         return fileinfo
 
-    def tika(self, file_buffer_object, url):
+    def inspect_content(self, file_buffer_object, url, content_type=None, logger=None):
+        if logger is None:
+            logger = self.logger
         parsed_content = ""
-        tika_content_types = ""
+        detected_content_types = ""
+        # the key names stem from the time content was only inspected by TIKA
         fileinfo = {"tika_content_type": []}
         status = None
-        try:
-            if len(file_buffer_object.getvalue()) > 0:
-                parsedFile = parser.from_buffer(file_buffer_object.getvalue())
-                fileinfo["tika_status"] = status = parsedFile.get("status")
-                tika_content_types = parsedFile.get("metadata").get("Content-Type")
-                parsed_content = parsedFile.get("content")
-                self.logger.info("{} : Successfully parsed data object file using TIKA".format("FsF-R1-01MD"))
-                file_buffer_object.close()
-                parsedFile.clear()
+        if len(file_buffer_object.getvalue()) > 0:
+            inspection = ContentInspector.inspect(file_buffer_object.getvalue(), logger, "FsF-R1-01MD")
+            file_buffer_object.close()
+            if inspection:
+                detected_content_types = inspection.get("content_types")
+                parsed_content = inspection.get("text")
+                if inspection.get("status") is not None:
+                    fileinfo["tika_status"] = status = inspection.get("status")
+                logger.info(
+                    "{} : Successfully parsed data object file using {}".format(
+                        "FsF-R1-01MD", inspection.get("backend")
+                    )
+                )
             else:
-                self.logger.warning("{} : Could not parse data object file using TIKA".format("FsF-R1-01MD"))
-
-        except Exception as e:
-            self.logger.warning("{} : File parsing using TIKA failed -: {}".format("FsF-R1-01MD", e))
-            # in case TIKA request fails use response header info
-            tika_content_types = str(self.content_type)
+                logger.warning("{} : Could not detect the content type of data object file".format("FsF-R1-01MD"))
+                # use response header info
+                detected_content_types = str(content_type)
+        else:
+            logger.warning("{} : Could not parse empty data object file".format("FsF-R1-01MD"))
 
-        if isinstance(tika_content_types, list):
-            fileinfo["tika_content_type"] = list(set(i.split(";")[0] for i in tika_content_types))
+        if isinstance(detected_content_types, list):
+            fileinfo["tika_content_type"] = list(dict.fromkeys(i.split(";")[0] for i in detected_content_types))
         else:
-            content_types_str = tika_content_types.split(";")[0]
+            content_types_str = detected_content_types.split(";")[0]
             fileinfo["tika_content_type"].append(content_types_str)
         fileinfo["tika_content_type"] = self.extend_mime_type_list(fileinfo["tika_content_type"])
 
         # Extract the text content from the parsed file and convert to string
-        self.logger.info("{} : File request status code -: {}".format("FsF-R1-01MD", status))
+        logger.info("{} : File request status code -: {}".format("FsF-R1-01MD", status))
 
         fileinfo["test_data_content_text"] = str(re.sub(r"[\r\n\t\s]+", " ", str(parsed_content)))
 
-        # Escape any slash # test_data_content_text = parsed_content.replace('\\', '\\\\').replace('"', '\\"')
         if fileinfo["test_data_content_text"]:
-            self.logger.info(f"FsF-R1-01MD : Succesfully parsed data file(s) -: {url}")
+            logger.info(f"FsF-R1-01MD : Succesfully parsed data file(s) -: {url}")
         return fileinfo
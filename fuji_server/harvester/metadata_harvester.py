@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: MIT
 
 import enum
+import functools
 import hashlib
 import io
 import logging
@@ -11,14 +12,15 @@ import re
 from urllib.parse import urljoin, urlparse
 
 import extruct
-import lxml
+import lxml.html
 import rdflib
-from bs4 import BeautifulSoup
 from pyRdfa import pyRdfa
 from rapidfuzz import fuzz, process
 from tldextract import extract
 
 # from fuji_server.controllers.fair_check import ME
+from fuji_server.helper.concurrent_helper import ConcurrentHelper, ConcurrentJob
+from fuji_server.helper.deadline import Deadline
 from fuji_server.helper.identifier_helper import IdentifierHelper
 from fuji_server.helper.metadata_collector import MetaDataCollector, MetadataOfferingMethods, MetadataSources
 from fuji_server.helper.metadata_collector_datacite import MetaDataCollectorDatacite
@@ -30,6 +32,7 @@ from fuji_server.helper.metadata_collector_ore_atom import MetaDataCollectorOreA
 from fuji_server.helper.metadata_collector_rdf import MetaDataCollectorRdf
 from fuji_server.helper.metadata_collector_xml import MetaDataCollectorXML
 from fuji_server.helper.metadata_mapper import Mapper
+from fuji_server.helper.pid_resolver import PIDResolver
 from fuji_server.helper.preprocessor import Preprocessor
 from fuji_server.helper.request_helper import AcceptTypes, RequestHelper
 
@@ -57,6 +60,7 @@ class MetadataHarvester:
         auth_token_type="Basic",
         allowed_harvesting_methods=None,
         allowed_metadata_standards=None,
+        deadline=None,
     ):
         uid_bytes = uid.encode("utf-8")
         self.test_id = hashlib.sha1(uid_bytes).hexdigest()
@@ -70,7 +74,10 @@ class MetadataHarvester:
             self.logger = logging.getLogger(self.test_id)
         self.auth_token = auth_token
         self.auth_token_type = auth_token_type
+        self.deadline = deadline or Deadline()
         self.landing_html = None
+        # lxml tree of the landing page, parsed once and shared by all embedded metadata collectors
+        self.landing_html_dom = None
         self.landing_url = None
         self.landing_origin = None
         self.landing_domain = None
@@ -99,6 +106,8 @@ class MetadataHarvester:
         self.is_html_page = False
         # Do something with this
         self.pid_collector = {}
+        # PIDs found in metadata which still have to be resolved, pid url: identifier
+        self.pid_candidates = {}
         logging.addLevelName(self.LOG_SUCCESS, "SUCCESS")
         logging.addLevelName(self.LOG_FAILURE, "FAILURE")
         # set allowed methods for metadata harvesting
@@ -111,9 +120,8 @@ class MetadataHarvester:
             if isinstance(allowed_metadata_standards, list):
                 self.allowed_metadata_standards = allowed_metadata_standards
         self.COMMUNITY_METADATA_STANDARDS = Preprocessor.get_metadata_standards()
-        self.COMMUNITY_METADATA_STANDARDS_URIS = {
-            u.strip().strip("#/"): k for k, v in self.COMMUNITY_METADATA_STANDARDS.items() for u in v.get("urls")
-        }
+        self.COMMUNITY_METADATA_STANDARDS_URI_INDEX = Preprocessor.get_metadata_standards_uri_index()
+        self.COMMUNITY_METADATA_STANDARDS_URIS = self.COMMUNITY_METADATA_STANDARDS_URI_INDEX.uris
         self.COMMUNITY_METADATA_STANDARDS_NAMES = {
             k: v.get("title") for k, v in self.COMMUNITY_METADATA_STANDARDS.items()
         }
@@ -199,19 +207,7 @@ class MetadataHarvester:
                     if not isinstance(metadict.get("object_identifier"), list):
                         metadict["object_identifier"] = [metadict.get("object_identifier")]
                     for object_identifier in metadict.get("object_identifier"):
-                        resolves_to_landing_domain = False
-                        pid_helper = IdentifierHelper(object_identifier, self.logger)
-                        if (
-                            pid_helper.identifier_url not in self.pid_collector
-                            and pid_helper.is_persistent
-                            and pid_helper.preferred_schema in self.valid_pid_types
-                        ):
-                            pid_record = pid_helper.get_identifier_info(self.pid_collector)
-                            self.pid_collector[pid_helper.identifier_url] = pid_record
-                            resolves_to_landing_domain = self.check_if_pid_resolves_to_landing_page(
-                                pid_helper.identifier_url
-                            )
-                            self.pid_collector[pid_helper.identifier_url]["verified"] = resolves_to_landing_domain
+                        self.add_pid_candidate(object_identifier)
                 if metadict.get("related_resources"):
                     self.related_resources.extend(metadict.get("related_resources"))
                 if metadict.get("object_content_identifier"):
@@ -258,6 +254,35 @@ class MetadataHarvester:
         else:
             return dt
 
+    def add_pid_candidate(self, object_identifier):
+        """Queues a PID found in metadata, queued PIDs are resolved and verified by resolve_pid_candidates"""
+        pid_helper = IdentifierHelper(object_identifier, self.logger)
+        if (
+            pid_helper.identifier_url not in self.pid_collector
+            and pid_helper.identifier_url not in self.pid_candidates
+            and pid_helper.is_persistent
+            and pid_helper.preferred_schema in self.valid_pid_types
+        ):
+            self.pid_candidates[pid_helper.identifier_url] = object_identifier
+
+    def add_pid_record(self, pid_url, pid_record):
+        self.pid_collector[pid_url] = pid_record
+        self.pid_collector[pid_url]["verified"] = self.check_if_pid_resolves_to_landing_page(pid_url)
+
+    def resolve_pid_candidates(self):
+        """Resolves all queued PIDs concurrently and adds them to pid_collector in the order they were found"""
+        if self.pid_candidates and self.deadline.skip(
+            self.logger, "FsF-F1-02D", f"verification of {len(self.pid_candidates)} PIDs found in metadata"
+        ):
+            self.pid_candidates = {}
+        if self.pid_candidates:
+            candidates, self.pid_candidates = self.pid_candidates, {}
+            PIDResolver.resolve_all(
+                list(candidates.values()),
+                self.logger,
+                lambda identifier, pid_record: self.add_pid_record(pid_record["pid_url"], pid_record),
+            )
+
     def check_if_pid_resolves_to_landing_page(self, pid_url=None):
         if pid_url in self.pid_collector:
             candidate_landing_url = self.pid_collector[pid_url].get("resolved_url")
@@ -292,6 +317,7 @@ class MetadataHarvester:
             return False
 
     def check_pidtest_repeat(self):
+        self.resolve_pid_candidates()
         if not self.repeat_pid_check:
             self.repeat_pid_check = False
         if self.related_resources:
@@ -349,7 +375,9 @@ class MetadataHarvester:
         if isinstance(self.landing_html, str):
             if self.landing_html:
                 try:
-                    dom = lxml.html.fromstring(self.landing_html.encode("utf8"))
+                    dom = self.landing_html_dom
+                    if dom is None:
+                        dom = lxml.html.fromstring(self.landing_html.encode("utf8"))
                     links = dom.xpath("/*/head/link")
                     for link in links:
                         source = MetadataOfferingMethods.TYPED_LINKS
@@ -491,23 +519,13 @@ class MetadataHarvester:
                             "FsF-F1-02D : Found cite-as signposting links has no type attribute-:"
                             + str(signposting_pid)
                         )
-                    signidhelper = IdentifierHelper(signposting_pid, self.logger)
                     if self.metadata_merged.get("object_identifier"):
                         if isinstance(self.metadata_merged.get("object_identifier"), list):
                             self.metadata_merged["object_identifier"].append(signposting_pid)
                     else:
                         self.metadata_merged["object_identifier"] = [signposting_pid]
-                    if (
-                        signidhelper.identifier_url not in self.pid_collector
-                        and signidhelper.is_persistent
-                        and signidhelper.preferred_schema in self.valid_pid_types
-                    ):
-                        signpid_record = signidhelper.get_identifier_info(self.pid_collector)
-                        self.pid_collector[signidhelper.identifier_url] = signpid_record
-                        resolves_to_landing_domain = self.check_if_pid_resolves_to_landing_page(
-                            signidhelper.identifier_url
-                        )
-                        self.pid_collector[signidhelper.identifier_url]["verified"] = resolves_to_landing_domain
+                    self.add_pid_candidate(signposting_pid)
+            self.resolve_pid_candidates()
 
     def get_html_typed_links(self, rel="item", allkeys=True):
         # Use Typed Links in HTTP Link headers to help machines find the resources that make up a publication.
@@ -573,15 +591,23 @@ class MetadataHarvester:
                 found_signposting_links.append(signposting_link_dict)
         return found_signposting_links
 
-    def raise_warning_if_javascript_page(self, response_content):
+    def raise_warning_if_javascript_page(self, html_dom):
         # check if javascript generated content only:
         try:
-            soup = BeautifulSoup(response_content, features="html.parser")
-            script_content = soup.findAll("script")
-            for script in soup(["script", "style", "title", "noscript"]):
-                script.extract()
-
-            text_content = soup.get_text(strip=True)
+            script_content = [
+                lxml.html.tostring(script, encoding="unicode", with_tail=False) for script in html_dom.iter("script")
+            ]
+            # the shared tree must not be modified, so the text of these elements is skipped instead of removed
+            skipped = set()
+            for element in html_dom.iter("script", "style", "title", "noscript"):
+                skipped.update(element.iter())
+            text_parts = []
+            for element in html_dom.iter():
+                if element not in skipped and isinstance(element.tag, str) and element.text:
+                    text_parts.append(element.text.strip())
+                if element is not html_dom and element.getparent() not in skipped and element.tail:
+                    text_parts.append(element.tail.strip())
+            text_content = "".join(text_parts)
             if (len(str(script_content)) > len(str(text_content))) and len(text_content) <= 150:
                 self.logger.warning(
                     "FsF-F1-02D : Landing page seems to be JavaScript generated, could not detect enough content"
@@ -627,11 +653,15 @@ class MetadataHarvester:
                         "FsF-F2-01M", self.landing_url
                     )
                 )
-                # remove html comments which sometimes fails in extruct...
-                try:
-                    extruct_target = re.sub("(<!--.*?-->)", "", extruct_target.decode("utf-8")).encode("utf-8")
-                except Exception:
-                    pass
+                if self.landing_html_dom is not None:
+                    # reuse the parsed landing page (comments removed), extruct then must not use the microformat syntax
+                    extruct_target = self.landing_html_dom
+                else:
+                    # remove html comments which sometimes fails in extruct...
+                    try:
+                        extruct_target = re.sub("(<!--.*?-->)", "", extruct_target.decode("utf-8")).encode("utf-8")
+                    except Exception:
+                        pass
 
                 extracted = extruct.extract(extruct_target, syntaxes=syntaxes, encoding="utf-8")
 
@@ -711,8 +741,10 @@ class MetadataHarvester:
         if self.landing_url:
             if self.landing_url not in ["https://datacite.org/invalid.html"]:
                 if response_status == 200:
+                    self.landing_html_dom = None
                     if "html" in requestHelper.content_type:
-                        self.raise_warning_if_javascript_page(requestHelper.response_content)
+                        self.landing_html_dom = MetaDataCollector.parse_html(requestHelper.response_content)
+                        self.raise_warning_if_javascript_page(self.landing_html_dom)
                     up = urlparse(self.landing_url)
                     upp = extract(self.landing_url)
                     self.landing_origin = f"{up.scheme}://{up.netloc}"
@@ -795,7 +827,10 @@ class MetadataHarvester:
                     # ========= retrieve dublin core embedded in html page =========
                     self.logger.info("FsF-F2-01M : Trying to retrieve Dublin Core metadata from html page")
                     dc_collector = MetaDataCollectorDublinCore(
-                        loggerinst=self.logger, sourcemetadata=self.landing_html, mapping=Mapper.DC_MAPPING
+                        loggerinst=self.logger,
+                        sourcemetadata=self.landing_html,
+                        mapping=Mapper.DC_MAPPING,
+                        html_dom=self.landing_html_dom,
                     )
                     source_dc, dc_dict = dc_collector.parse_metadata()
                     dc_dict = self.exclude_null(dc_dict)
@@ -917,7 +952,7 @@ class MetadataHarvester:
                     # ========= retrieve highwire and eprints embedded in html page =========
                     self.logger.info("FsF-F2-01M : Trying to retrieve Highwire and eprints metadata from html page")
                     hw_collector = MetaDataCollectorHighwireEprints(
-                        loggerinst=self.logger, sourcemetadata=self.landing_html
+                        loggerinst=self.logger, sourcemetadata=self.landing_html, html_dom=self.landing_html_dom
                     )
                     source_hw, hw_dict = hw_collector.parse_metadata()
                     hw_metaformat = hw_collector.metadata_format
@@ -1029,154 +1064,202 @@ class MetadataHarvester:
             )
         self.check_pidtest_repeat()
 
-    def retrieve_metadata_external_rdf_negotiated(self, target_url_list=[]):
+    def get_skipped_harvesting_job(self, source):
+        return ConcurrentJob(
+            self.logger,
+            merge=lambda result: self.logger.info(
+                "FsF-F2-01M : Skipped disabled harvesting method -: " + str(source.value.get("label"))
+            ),
+        )
+
+    def get_external_rdf_negotiated_jobs(self, target_url_list=[]):
         # ========= retrieve rdf metadata namespaces by content negotiation ========
+        jobs = []
         if self.is_harvesting_method_allowed(MetadataOfferingMethods.CONTENT_NEGOTIATION):
-            source = MetadataSources.RDF_NEGOTIATED
             # if self.pid_scheme == 'purl':
             #    targeturl = self.pid_url
             # else:
             #    targeturl = self.landing_url
-
             for targeturl in target_url_list:
-                self.logger.info(
-                    "FsF-F2-01M : Trying to retrieve RDF metadata through content negotiation from URL -: "
-                    + str(targeturl)
+                jobs.append(
+                    ConcurrentJob(
+                        self.logger,
+                        functools.partial(self.fetch_metadata_external_rdf_negotiated, targeturl),
+                        functools.partial(self.merge_metadata_external_rdf_negotiated, targeturl),
+                    )
                 )
-                neg_rdf_collector = MetaDataCollectorRdf(loggerinst=self.logger, target_url=targeturl, source=source)
-                neg_rdf_collector.set_auth_token(self.auth_token, self.auth_token_type)
-                if neg_rdf_collector is not None:
-                    source_rdf, rdf_dict = neg_rdf_collector.parse_metadata()
-                    # in case F-UJi was redirected and the landing page content negotiation doesnt return anything try the origin URL
-                    if not rdf_dict:
-                        if self.origin_url is not None and self.origin_url != targeturl:
-                            neg_rdf_collector.target_url = self.origin_url
-                            source_rdf, rdf_dict = neg_rdf_collector.parse_metadata()
-                    self.namespace_uri.extend(neg_rdf_collector.getNamespaces())
-                    rdf_dict = self.exclude_null(rdf_dict)
-                    if rdf_dict:
-                        self.logger.log(
-                            self.LOG_SUCCESS,
-                            f"FsF-F2-01M : Found Linked Data metadata -: {rdf_dict.keys()!s}",
-                        )
-                        # self.metadata_sources.append((source_rdf, 'negotiated'))
-                        self.add_metadata_source(source_rdf)
-                        self.merge_metadata(
-                            rdf_dict,
-                            targeturl,
-                            source_rdf,
-                            neg_rdf_collector.metadata_format,
-                            neg_rdf_collector.getContentType(),
-                            "http://www.w3.org/1999/02/22-rdf-syntax-ns",
-                            neg_rdf_collector.getNamespaces(),
-                        )
-
-                    else:
-                        self.logger.info("FsF-F2-01M : Linked Data metadata UNAVAILABLE")
         else:
-            self.logger.info(
-                "FsF-F2-01M : Skipped disabled harvesting method -: "
-                + str(MetadataSources.RDF_NEGOTIATED.value.get("label"))
+            jobs.append(self.get_skipped_harvesting_job(MetadataSources.RDF_NEGOTIATED))
+        return jobs
+
+    def fetch_metadata_external_rdf_negotiated(self, targeturl, logger):
+        logger.info(
+            "FsF-F2-01M : Trying to retrieve RDF metadata through content negotiation from URL -: " + str(targeturl)
+        )
+        neg_rdf_collector = MetaDataCollectorRdf(
+            loggerinst=logger, target_url=targeturl, source=MetadataSources.RDF_NEGOTIATED
+        )
+        neg_rdf_collector.set_auth_token(self.auth_token, self.auth_token_type)
+        source_rdf, rdf_dict = neg_rdf_collector.parse_metadata()
+        # in case F-UJi was redirected and the landing page content negotiation doesnt return anything try the origin URL
+        if not rdf_dict:
+            if self.origin_url is not None and self.origin_url != targeturl:
+                neg_rdf_collector.target_url = self.origin_url
+                source_rdf, rdf_dict = neg_rdf_collector.parse_metadata()
+        return neg_rdf_collector, source_rdf, rdf_dict
+
+    def merge_metadata_external_rdf_negotiated(self, targeturl, fetched):
+        neg_rdf_collector, source_rdf, rdf_dict = fetched
+        self.namespace_uri.extend(neg_rdf_collector.getNamespaces())
+        rdf_dict = self.exclude_null(rdf_dict)
+        if rdf_dict:
+            self.logger.log(
+                self.LOG_SUCCESS,
+                f"FsF-F2-01M : Found Linked Data metadata -: {rdf_dict.keys()!s}",
+            )
+            # self.metadata_sources.append((source_rdf, 'negotiated'))
+            self.add_metadata_source(source_rdf)
+            self.merge_metadata(
+                rdf_dict,
+                targeturl,
+                source_rdf,
+                neg_rdf_collector.metadata_format,
+                neg_rdf_collector.getContentType(),
+                "http://www.w3.org/1999/02/22-rdf-syntax-ns",
+                neg_rdf_collector.getNamespaces(),
             )
 
-    def retrieve_metadata_external_schemaorg_negotiated(self, target_url_list=[]):
+        else:
+            self.logger.info("FsF-F2-01M : Linked Data metadata UNAVAILABLE")
+
+    def retrieve_metadata_external_rdf_negotiated(self, target_url_list=[]):
+        ConcurrentHelper.run_jobs(self.get_external_rdf_negotiated_jobs(target_url_list))
+
+    def get_external_schemaorg_negotiated_jobs(self, target_url_list=[]):
+        jobs = []
         if self.is_harvesting_method_allowed(MetadataOfferingMethods.CONTENT_NEGOTIATION):
             for target_url in target_url_list:
-                # ========= retrieve json-ld/schema.org metadata namespaces by content negotiation ========
-                self.logger.info(
-                    "FsF-F2-01M : Trying to retrieve schema.org JSON-LD metadata through content negotiation from URL -: "
-                    + str(target_url)
-                )
-                schemaorg_collector_negotiated = MetaDataCollectorRdf(
-                    loggerinst=self.logger, target_url=target_url, source=MetadataSources.SCHEMAORG_NEGOTIATED
-                )
-                schemaorg_collector_negotiated.setAcceptType(AcceptTypes.jsonld)
-                source_schemaorg, schemaorg_dict = schemaorg_collector_negotiated.parse_metadata()
-                schemaorg_dict = self.exclude_null(schemaorg_dict)
-                if schemaorg_dict:
-                    self.namespace_uri.extend(schemaorg_collector_negotiated.namespaces)
-                    # self.metadata_sources.append((source_schemaorg, 'negotiated'))
-                    self.add_metadata_source(source_schemaorg)
-
-                    # add object type for future reference
-                    self.merge_metadata(
-                        schemaorg_dict,
-                        target_url,
-                        source_schemaorg,
-                        schemaorg_collector_negotiated.metadata_format,
-                        "application/ld+json",
-                        "http://www.schema.org",
-                        schemaorg_collector_negotiated.namespaces,
-                    )
-
-                    self.logger.log(
-                        self.LOG_SUCCESS,
-                        "FsF-F2-01M : Found Schema.org metadata through content negotiation-: "
-                        + str(schemaorg_dict.keys()),
+                jobs.append(
+                    ConcurrentJob(
+                        self.logger,
+                        functools.partial(self.fetch_metadata_external_schemaorg_negotiated, target_url),
+                        functools.partial(self.merge_metadata_external_schemaorg_negotiated, target_url),
                     )
-                else:
-                    self.logger.info("FsF-F2-01M : Schema.org metadata through content negotiation UNAVAILABLE")
+                )
         else:
-            self.logger.info(
-                "FsF-F2-01M : Skipped disabled harvesting method -: "
-                + str(MetadataSources.SCHEMAORG_NEGOTIATED.value.get("label"))
+            jobs.append(self.get_skipped_harvesting_job(MetadataSources.SCHEMAORG_NEGOTIATED))
+        return jobs
+
+    def fetch_metadata_external_schemaorg_negotiated(self, target_url, logger):
+        # ========= retrieve json-ld/schema.org metadata namespaces by content negotiation ========
+        logger.info(
+            "FsF-F2-01M : Trying to retrieve schema.org JSON-LD metadata through content negotiation from URL -: "
+            + str(target_url)
+        )
+        schemaorg_collector_negotiated = MetaDataCollectorRdf(
+            loggerinst=logger, target_url=target_url, source=MetadataSources.SCHEMAORG_NEGOTIATED
+        )
+        schemaorg_collector_negotiated.setAcceptType(AcceptTypes.jsonld)
+        source_schemaorg, schemaorg_dict = schemaorg_collector_negotiated.parse_metadata()
+        return schemaorg_collector_negotiated, source_schemaorg, schemaorg_dict
+
+    def merge_metadata_external_schemaorg_negotiated(self, target_url, fetched):
+        schemaorg_collector_negotiated, source_schemaorg, schemaorg_dict = fetched
+        schemaorg_dict = self.exclude_null(schemaorg_dict)
+        if schemaorg_dict:
+            self.namespace_uri.extend(schemaorg_collector_negotiated.namespaces)
+            # self.metadata_sources.append((source_schemaorg, 'negotiated'))
+            self.add_metadata_source(source_schemaorg)
+
+            # add object type for future reference
+            self.merge_metadata(
+                schemaorg_dict,
+                target_url,
+                source_schemaorg,
+                schemaorg_collector_negotiated.metadata_format,
+                "application/ld+json",
+                "http://www.schema.org",
+                schemaorg_collector_negotiated.namespaces,
             )
 
-    def retrieve_metadata_external_xml_negotiated(self, target_url_list=[]):
+            self.logger.log(
+                self.LOG_SUCCESS,
+                "FsF-F2-01M : Found Schema.org metadata through content negotiation-: " + str(schemaorg_dict.keys()),
+            )
+        else:
+            self.logger.info("FsF-F2-01M : Schema.org metadata through content negotiation UNAVAILABLE")
+
+    def retrieve_metadata_external_schemaorg_negotiated(self, target_url_list=[]):
+        ConcurrentHelper.run_jobs(self.get_external_schemaorg_negotiated_jobs(target_url_list))
+
+    def get_external_xml_negotiated_jobs(self, target_url_list=[]):
+        jobs = []
         if self.is_harvesting_method_allowed(MetadataOfferingMethods.CONTENT_NEGOTIATION):
             for target_url in target_url_list:
-                self.logger.info(
-                    "FsF-F2-01M : Trying to retrieve XML metadata through content negotiation from URL -: "
-                    + str(target_url)
-                )
-                negotiated_xml_collector = MetaDataCollectorXML(
-                    loggerinst=self.logger,
-                    target_url=self.landing_url,
-                    link_type=MetadataOfferingMethods.CONTENT_NEGOTIATION,
-                )
-                negotiated_xml_collector.set_auth_token(self.auth_token, self.auth_token_type)
-                source_neg_xml, metadata_neg_dict = negotiated_xml_collector.parse_metadata()
-                # print('### ',metadata_neg_dict)
-                neg_namespace = "unknown xml"
-                metadata_neg_dict = self.exclude_null(metadata_neg_dict)
-                if len(negotiated_xml_collector.getNamespaces()) > 0:
-                    self.namespace_uri.extend(negotiated_xml_collector.getNamespaces())
-                    neg_namespace = negotiated_xml_collector.getNamespaces()[0]
-                self.linked_namespace_uri.update(negotiated_xml_collector.getLinkedNamespaces())
-                # print('LINKED NS XML ',self.linked_namespace_uri)
-                if metadata_neg_dict:
-                    # self.metadata_sources.append((source_neg_xml, 'negotiated'))
-                    self.add_metadata_source(source_neg_xml)
-                    self.merge_metadata(
-                        metadata_neg_dict,
-                        self.landing_url,
-                        source_neg_xml,
-                        negotiated_xml_collector.metadata_format,
-                        negotiated_xml_collector.getContentType(),
-                        neg_namespace,
-                    )
-                    ####
-                    self.logger.log(
-                        self.LOG_SUCCESS,
-                        "FsF-F2-01M : Found XML metadata through content negotiation-: "
-                        + str(metadata_neg_dict.keys()),
-                    )
-                    self.namespace_uri.extend(negotiated_xml_collector.getNamespaces())
-                # also add found xml namespaces without recognized data
-                elif len(negotiated_xml_collector.getNamespaces()) > 0:
-                    self.merge_metadata(
-                        {},
-                        self.landing_url,
-                        source_neg_xml,
-                        negotiated_xml_collector.metadata_format,
-                        negotiated_xml_collector.getContentType(),
-                        neg_namespace,
+                jobs.append(
+                    ConcurrentJob(
+                        self.logger,
+                        functools.partial(self.fetch_metadata_external_xml_negotiated, target_url),
+                        self.merge_metadata_external_xml_negotiated,
                     )
+                )
         else:
-            self.logger.info(
-                "FsF-F2-01M : Skipped disabled harvesting method -: "
-                + str(MetadataSources.XML_NEGOTIATED.value.get("label"))
+            jobs.append(self.get_skipped_harvesting_job(MetadataSources.XML_NEGOTIATED))
+        return jobs
+
+    def fetch_metadata_external_xml_negotiated(self, target_url, logger):
+        logger.info(
+            "FsF-F2-01M : Trying to retrieve XML metadata through content negotiation from URL -: " + str(target_url)
+        )
+        negotiated_xml_collector = MetaDataCollectorXML(
+            loggerinst=logger,
+            target_url=self.landing_url,
+            link_type=MetadataOfferingMethods.CONTENT_NEGOTIATION,
+        )
+        negotiated_xml_collector.set_auth_token(self.auth_token, self.auth_token_type)
+        source_neg_xml, metadata_neg_dict = negotiated_xml_collector.parse_metadata()
+        return negotiated_xml_collector, source_neg_xml, metadata_neg_dict
+
+    def merge_metadata_external_xml_negotiated(self, fetched):
+        negotiated_xml_collector, source_neg_xml, metadata_neg_dict = fetched
+        # print('### ',metadata_neg_dict)
+        neg_namespace = "unknown xml"
+        metadata_neg_dict = self.exclude_null(metadata_neg_dict)
+        if len(negotiated_xml_collector.getNamespaces()) > 0:
+            self.namespace_uri.extend(negotiated_xml_collector.getNamespaces())
+            neg_namespace = negotiated_xml_collector.getNamespaces()[0]
+        self.linked_namespace_uri.update(negotiated_xml_collector.getLinkedNamespaces())
+        # print('LINKED NS XML ',self.linked_namespace_uri)
+        if metadata_neg_dict:
+            # self.metadata_sources.append((source_neg_xml, 'negotiated'))
+            self.add_metadata_source(source_neg_xml)
+            self.merge_metadata(
+                metadata_neg_dict,
+                self.landing_url,
+                source_neg_xml,
+                negotiated_xml_collector.metadata_format,
+                negotiated_xml_collector.getContentType(),
+                neg_namespace,
+            )
+            ####
+            self.logger.log(
+                self.LOG_SUCCESS,
+                "FsF-F2-01M : Found XML metadata through content negotiation-: " + str(metadata_neg_dict.keys()),
             )
+            self.namespace_uri.extend(negotiated_xml_collector.getNamespaces())
+        # also add found xml namespaces without recognized data
+        elif len(negotiated_xml_collector.getNamespaces()) > 0:
+            self.merge_metadata(
+                {},
+                self.landing_url,
+                source_neg_xml,
+                negotiated_xml_collector.metadata_format,
+                negotiated_xml_collector.getContentType(),
+                neg_namespace,
+            )
+
+    def retrieve_metadata_external_xml_negotiated(self, target_url_list=[]):
+        ConcurrentHelper.run_jobs(self.get_external_xml_negotiated_jobs(target_url_list))
 
     """
     def retrieve_metadata_external_georss(self):
@@ -1192,31 +1275,50 @@ class MetadataHarvester:
                 #self.namespace_uri.extend(feed_helper.getNamespaces())
     """
 
-    def retrieve_metadata_external_oai_ore(self):
+    def get_external_oai_ore_jobs(self):
+        jobs = []
         oai_link = self.get_html_typed_links("resourcemap")
         if oai_link:
             if oai_link.get("type") in ["application/atom+xml"]:
-                # elif metadata_link['type'] in ['application/atom+xml'] and metadata_link['rel'] == 'resourcemap':
-                self.logger.info(
-                    "FsF-F2-01M : Found e.g. Typed Links in HTML Header linking to OAI ORE (atom) Metadata -: ("
-                    + str(oai_link["type"] + ")")
-                )
-                ore_atom_collector = MetaDataCollectorOreAtom(loggerinst=self.logger, target_url=oai_link["url"])
-                source_ore, ore_dict = ore_atom_collector.parse_metadata()
-                ore_dict = self.exclude_null(ore_dict)
-                if ore_dict:
-                    self.logger.log(self.LOG_SUCCESS, f"FsF-F2-01M : Found OAI ORE metadata -: {ore_dict.keys()!s}")
-                    self.add_metadata_source(source_ore)
-                    self.merge_metadata(
-                        ore_dict,
-                        oai_link["url"],
-                        source_ore,
-                        ore_atom_collector.getContentType(),
-                        "http://www.openarchives.org/ore/terms",
-                        "http://www.openarchives.org/ore/terms",
+                jobs.append(
+                    ConcurrentJob(
+                        self.logger,
+                        functools.partial(self.fetch_metadata_external_oai_ore, oai_link),
+                        functools.partial(self.merge_metadata_external_oai_ore, oai_link),
                     )
+                )
+        return jobs
+
+    def fetch_metadata_external_oai_ore(self, oai_link, logger):
+        # elif metadata_link['type'] in ['application/atom+xml'] and metadata_link['rel'] == 'resourcemap':
+        logger.info(
+            "FsF-F2-01M : Found e.g. Typed Links in HTML Header linking to OAI ORE (atom) Metadata -: ("
+            + str(oai_link["type"] + ")")
+        )
+        ore_atom_collector = MetaDataCollectorOreAtom(loggerinst=logger, target_url=oai_link["url"])
+        source_ore, ore_dict = ore_atom_collector.parse_metadata()
+        return ore_atom_collector, source_ore, ore_dict
+
+    def merge_metadata_external_oai_ore(self, oai_link, fetched):
+        ore_atom_collector, source_ore, ore_dict = fetched
+        ore_dict = self.exclude_null(ore_dict)
+        if ore_dict:
+            self.logger.log(self.LOG_SUCCESS, f"FsF-F2-01M : Found OAI ORE metadata -: {ore_dict.keys()!s}")
+            self.add_metadata_source(source_ore)
+            self.merge_metadata(
+                ore_dict,
+                oai_link["url"],
+                source_ore,
+                ore_atom_collector.getContentType(),
+                "http://www.openarchives.org/ore/terms",
+                "http://www.openarchives.org/ore/terms",
+            )
 
-    def retrieve_metadata_external_datacite(self):
+    def retrieve_metadata_external_oai_ore(self):
+        ConcurrentHelper.run_jobs(self.get_external_oai_ore_jobs())
+
+    def get_external_datacite_jobs(self):
+        jobs = []
         if self.is_harvesting_method_allowed(MetadataOfferingMethods.CONTENT_NEGOTIATION):
             # if self.pid_scheme:
             # ================= datacite by content negotiation ===========
@@ -1226,40 +1328,57 @@ class MetadataHarvester:
             else:
                 datacite_target_url = self.landing_url
             if datacite_target_url:
-                dcite_collector = MetaDataCollectorDatacite(
-                    mapping=Mapper.DATACITE_JSON_MAPPING, loggerinst=self.logger, pid_url=datacite_target_url
-                )
-                source_dcitejsn, dcitejsn_dict = dcite_collector.parse_metadata()
-                dcitejsn_dict = self.exclude_null(dcitejsn_dict)
-                if dcitejsn_dict:
-                    # self.metadata_sources.append((source_dcitejsn, 'negotiated'))
-                    self.add_metadata_source(source_dcitejsn)
-                    self.logger.log(
-                        self.LOG_SUCCESS, f"FsF-F2-01M : Found Datacite metadata -: {dcitejsn_dict.keys()!s}"
-                    )
-
-                    self.namespace_uri.extend(dcite_collector.getNamespaces())
-
-                    self.merge_metadata(
-                        dcitejsn_dict,
-                        datacite_target_url,
-                        source_dcitejsn,
-                        dcite_collector.metadata_format,
-                        dcite_collector.getContentType(),
-                        "http://datacite.org/schema",
-                        dcite_collector.getNamespaces(),
+                jobs.append(
+                    ConcurrentJob(
+                        self.logger,
+                        functools.partial(self.fetch_metadata_external_datacite, datacite_target_url),
+                        functools.partial(self.merge_metadata_external_datacite, datacite_target_url),
                     )
-                else:
-                    self.logger.info("FsF-F2-01M : Datacite metadata UNAVAILABLE")
+                )
             else:
-                self.logger.info(
-                    "FsF-F2-01M : No target URL (PID or landing page) given, therefore Datacite metadata (json) not requested."
+                jobs.append(
+                    ConcurrentJob(
+                        self.logger,
+                        merge=lambda result: self.logger.info(
+                            "FsF-F2-01M : No target URL (PID or landing page) given, therefore Datacite metadata (json) not requested."
+                        ),
+                    )
                 )
         else:
-            self.logger.info(
-                "FsF-F2-01M : Skipped disabled harvesting method -: "
-                + str(MetadataSources.DATACITE_JSON_NEGOTIATED.value.get("label"))
+            jobs.append(self.get_skipped_harvesting_job(MetadataSources.DATACITE_JSON_NEGOTIATED))
+        return jobs
+
+    def fetch_metadata_external_datacite(self, datacite_target_url, logger):
+        dcite_collector = MetaDataCollectorDatacite(
+            mapping=Mapper.DATACITE_JSON_MAPPING, loggerinst=logger, pid_url=datacite_target_url
+        )
+        source_dcitejsn, dcitejsn_dict = dcite_collector.parse_metadata()
+        return dcite_collector, source_dcitejsn, dcitejsn_dict
+
+    def merge_metadata_external_datacite(self, datacite_target_url, fetched):
+        dcite_collector, source_dcitejsn, dcitejsn_dict = fetched
+        dcitejsn_dict = self.exclude_null(dcitejsn_dict)
+        if dcitejsn_dict:
+            # self.metadata_sources.append((source_dcitejsn, 'negotiated'))
+            self.add_metadata_source(source_dcitejsn)
+            self.logger.log(self.LOG_SUCCESS, f"FsF-F2-01M : Found Datacite metadata -: {dcitejsn_dict.keys()!s}")
+
+            self.namespace_uri.extend(dcite_collector.getNamespaces())
+
+            self.merge_metadata(
+                dcitejsn_dict,
+                datacite_target_url,
+                source_dcitejsn,
+                dcite_collector.metadata_format,
+                dcite_collector.getContentType(),
+                "http://datacite.org/schema",
+                dcite_collector.getNamespaces(),
             )
+        else:
+            self.logger.info("FsF-F2-01M : Datacite metadata UNAVAILABLE")
+
+    def retrieve_metadata_external_datacite(self):
+        ConcurrentHelper.run_jobs(self.get_external_datacite_jobs())
 
     def get_connected_metadata_links(self):
         # get all links which lead to metadata are given by signposting, typed links, guessing or in html href
@@ -1298,8 +1417,9 @@ class MetadataHarvester:
                     connected_metadata_links.append(guessed_metadata_link)"""
         return connected_metadata_links
 
-    def retrieve_metadata_external_linked_metadata(self):
+    def get_external_linked_metadata_jobs(self):
         # follow all links identified as typed links, signposting links and get xml or rdf metadata from there
+        jobs = []
         typed_metadata_links = self.get_connected_metadata_links()
         if typed_metadata_links:
             # unique entries for typed links
@@ -1318,114 +1438,142 @@ class MetadataHarvester:
                     if self.is_harvesting_method_allowed(
                         MetadataOfferingMethods.TYPED_LINKS
                     ) or self.is_harvesting_method_allowed(MetadataOfferingMethods.SIGNPOSTING):
-                        self.logger.info(
-                            "FsF-F2-01M : Found e.g. Typed Links in HTML Header linking to RDF Metadata -: ("
-                            + str(metadata_link["type"])
-                            + " "
-                            + str(metadata_link["url"])
-                            + ")"
-                        )
-                        if metadata_link.get("source") == MetadataOfferingMethods.SIGNPOSTING:
-                            source = MetadataSources.RDF_SIGNPOSTING_LINKS
-                        else:
-                            source = MetadataSources.RDF_TYPED_LINKS
-                        typed_rdf_collector = MetaDataCollectorRdf(
-                            loggerinst=self.logger, target_url=metadata_link["url"], source=source
+                        jobs.append(
+                            ConcurrentJob(
+                                self.logger,
+                                functools.partial(self.fetch_metadata_external_linked_rdf, metadata_link),
+                                functools.partial(self.merge_metadata_external_linked_rdf, metadata_link),
+                            )
                         )
-                        if typed_rdf_collector is not None:
-                            source_rdf, rdf_dict = typed_rdf_collector.parse_metadata()
-                            self.namespace_uri.extend(typed_rdf_collector.getNamespaces())
-                            rdf_dict = self.exclude_null(rdf_dict)
-                            if rdf_dict:
-                                self.logger.log(
-                                    self.LOG_SUCCESS,
-                                    f"FsF-F2-01M : Found Linked Data (RDF) metadata -: {rdf_dict.keys()!s}",
-                                )
-                                # self.metadata_sources.append((source_rdf, metadata_link['source']))
-                                self.add_metadata_source(source_rdf)
-                                self.merge_metadata(
-                                    rdf_dict,
-                                    metadata_link["url"],
-                                    source_rdf,
-                                    typed_rdf_collector.metadata_format,
-                                    typed_rdf_collector.getContentType(),
-                                    "http://www.w3.org/1999/02/22-rdf-syntax-ns",
-                                    typed_rdf_collector.getNamespaces(),
-                                )
-
-                            else:
-                                self.logger.info("FsF-F2-01M : Linked Data metadata UNAVAILABLE")
                     else:
-                        self.logger.info(
-                            "FsF-F2-01M : Skipped disabled harvesting method -: "
-                            + str(MetadataSources.RDF_TYPED_LINKS.value.get("label"))
-                        )
+                        jobs.append(self.get_skipped_harvesting_job(MetadataSources.RDF_TYPED_LINKS))
 
                 elif re.search(r"[+\/]xml$", str(metadata_link["type"])):
                     if self.is_harvesting_method_allowed(
                         MetadataOfferingMethods.TYPED_LINKS
                     ) or self.is_harvesting_method_allowed(MetadataOfferingMethods.SIGNPOSTING):
-                        self.logger.info(
-                            "FsF-F2-01M : Found e.g. Typed Links in HTML Header linking to XML Metadata -: ("
-                            + str(metadata_link["type"] + " " + metadata_link["url"] + ")")
-                        )
-                        linked_xml_collector = MetaDataCollectorXML(
-                            loggerinst=self.logger,
-                            target_url=metadata_link["url"],
-                            link_type=metadata_link.get("source"),
-                            pref_mime_type=metadata_link["type"],
+                        jobs.append(
+                            ConcurrentJob(
+                                self.logger,
+                                functools.partial(self.fetch_metadata_external_linked_xml, metadata_link),
+                                functools.partial(self.merge_metadata_external_linked_xml, metadata_link),
+                            )
                         )
-
-                        if linked_xml_collector is not None:
-                            source_linked_xml, linked_xml_dict = linked_xml_collector.parse_metadata()
-                            lkd_namespace = "unknown xml"
-                            if len(linked_xml_collector.getNamespaces()) > 0:
-                                lkd_namespace = linked_xml_collector.getNamespaces()[0]
-                                self.namespace_uri.extend(linked_xml_collector.getNamespaces())
-                            self.linked_namespace_uri.update(linked_xml_collector.getLinkedNamespaces())
-                            if linked_xml_dict:
-                                # self.metadata_sources.append((MetaDataCollector.Sources.XML_TYPED_LINKS.value.get('label'), metadata_link['source']))
-                                if metadata_link.get("source") == MetadataOfferingMethods.SIGNPOSTING:
-                                    self.add_metadata_source(MetadataSources.XML_SIGNPOSTING_LINKS)
-                                else:
-                                    self.add_metadata_source(MetadataSources.XML_TYPED_LINKS)
-                                self.merge_metadata(
-                                    linked_xml_dict,
-                                    metadata_link["url"],
-                                    source_linked_xml,
-                                    linked_xml_collector.metadata_format,
-                                    linked_xml_collector.getContentType(),
-                                    lkd_namespace,
-                                )
-
-                                self.logger.log(
-                                    self.LOG_SUCCESS,
-                                    "FsF-F2-01M : Found XML metadata through typed links-: "
-                                    + str(linked_xml_dict.keys()),
-                                )
-                            # also add found xml namespaces without recognized data
-                            elif len(linked_xml_collector.getNamespaces()) > 0:
-                                self.merge_metadata(
-                                    dict(),
-                                    metadata_link["url"],
-                                    source_linked_xml,
-                                    linked_xml_collector.metadata_format,
-                                    linked_xml_collector.getContentType(),
-                                    lkd_namespace,
-                                    linked_xml_collector.getNamespaces(),
-                                )
                     else:
-                        self.logger.info(
-                            "FsF-F2-01M : Skipped disabled harvesting method -: "
-                            + str(MetadataSources.XML_TYPED_LINKS.value.get("label"))
-                        )
+                        jobs.append(self.get_skipped_harvesting_job(MetadataSources.XML_TYPED_LINKS))
                 else:
-                    self.logger.info(
-                        "FsF-F2-01M : Found typed link or signposting link but will ignore (can't handle) mime type -:"
-                        + str(metadata_link["type"])
+                    jobs.append(
+                        ConcurrentJob(
+                            self.logger,
+                            merge=functools.partial(
+                                lambda link_type, result: self.logger.info(
+                                    "FsF-F2-01M : Found typed link or signposting link but will ignore (can't handle) mime type -:"
+                                    + link_type
+                                ),
+                                str(metadata_link["type"]),
+                            ),
+                        )
                     )
+        return jobs
+
+    def fetch_metadata_external_linked_rdf(self, metadata_link, logger):
+        logger.info(
+            "FsF-F2-01M : Found e.g. Typed Links in HTML Header linking to RDF Metadata -: ("
+            + str(metadata_link["type"])
+            + " "
+            + str(metadata_link["url"])
+            + ")"
+        )
+        if metadata_link.get("source") == MetadataOfferingMethods.SIGNPOSTING:
+            source = MetadataSources.RDF_SIGNPOSTING_LINKS
+        else:
+            source = MetadataSources.RDF_TYPED_LINKS
+        typed_rdf_collector = MetaDataCollectorRdf(loggerinst=logger, target_url=metadata_link["url"], source=source)
+        source_rdf, rdf_dict = typed_rdf_collector.parse_metadata()
+        return typed_rdf_collector, source_rdf, rdf_dict
+
+    def merge_metadata_external_linked_rdf(self, metadata_link, fetched):
+        typed_rdf_collector, source_rdf, rdf_dict = fetched
+        self.namespace_uri.extend(typed_rdf_collector.getNamespaces())
+        rdf_dict = self.exclude_null(rdf_dict)
+        if rdf_dict:
+            self.logger.log(
+                self.LOG_SUCCESS,
+                f"FsF-F2-01M : Found Linked Data (RDF) metadata -: {rdf_dict.keys()!s}",
+            )
+            # self.metadata_sources.append((source_rdf, metadata_link['source']))
+            self.add_metadata_source(source_rdf)
+            self.merge_metadata(
+                rdf_dict,
+                metadata_link["url"],
+                source_rdf,
+                typed_rdf_collector.metadata_format,
+                typed_rdf_collector.getContentType(),
+                "http://www.w3.org/1999/02/22-rdf-syntax-ns",
+                typed_rdf_collector.getNamespaces(),
+            )
+
+        else:
+            self.logger.info("FsF-F2-01M : Linked Data metadata UNAVAILABLE")
+
+    def fetch_metadata_external_linked_xml(self, metadata_link, logger):
+        logger.info(
+            "FsF-F2-01M : Found e.g. Typed Links in HTML Header linking to XML Metadata -: ("
+            + str(metadata_link["type"] + " " + metadata_link["url"] + ")")
+        )
+        linked_xml_collector = MetaDataCollectorXML(
+            loggerinst=logger,
+            target_url=metadata_link["url"],
+            link_type=metadata_link.get("source"),
+            pref_mime_type=metadata_link["type"],
+        )
+        source_linked_xml, linked_xml_dict = linked_xml_collector.parse_metadata()
+        return linked_xml_collector, source_linked_xml, linked_xml_dict
+
+    def merge_metadata_external_linked_xml(self, metadata_link, fetched):
+        linked_xml_collector, source_linked_xml, linked_xml_dict = fetched
+        lkd_namespace = "unknown xml"
+        if len(linked_xml_collector.getNamespaces()) > 0:
+            lkd_namespace = linked_xml_collector.getNamespaces()[0]
+            self.namespace_uri.extend(linked_xml_collector.getNamespaces())
+        self.linked_namespace_uri.update(linked_xml_collector.getLinkedNamespaces())
+        if linked_xml_dict:
+            # self.metadata_sources.append((MetaDataCollector.Sources.XML_TYPED_LINKS.value.get('label'), metadata_link['source']))
+            if metadata_link.get("source") == MetadataOfferingMethods.SIGNPOSTING:
+                self.add_metadata_source(MetadataSources.XML_SIGNPOSTING_LINKS)
+            else:
+                self.add_metadata_source(MetadataSources.XML_TYPED_LINKS)
+            self.merge_metadata(
+                linked_xml_dict,
+                metadata_link["url"],
+                source_linked_xml,
+                linked_xml_collector.metadata_format,
+                linked_xml_collector.getContentType(),
+                lkd_namespace,
+            )
+
+            self.logger.log(
+                self.LOG_SUCCESS,
+                "FsF-F2-01M : Found XML metadata through typed links-: " + str(linked_xml_dict.keys()),
+            )
+        # also add found xml namespaces without recognized data
+        elif len(linked_xml_collector.getNamespaces()) > 0:
+            self.merge_metadata(
+                dict(),
+                metadata_link["url"],
+                source_linked_xml,
+                linked_xml_collector.metadata_format,
+                linked_xml_collector.getContentType(),
+                lkd_namespace,
+                linked_xml_collector.getNamespaces(),
+            )
+
+    def retrieve_metadata_external_linked_metadata(self):
+        ConcurrentHelper.run_jobs(self.get_external_linked_metadata_jobs())
 
     def retrieve_metadata_external(self, target_url=None, repeat_mode=False):
+        if self.deadline.skip(self.logger, "FsF-F2-01M", "EXTERNAL metadata identification"):
+            return
         if (
             self.is_harvesting_method_allowed(MetadataOfferingMethods.CONTENT_NEGOTIATION)
             or self.is_harvesting_method_allowed(MetadataOfferingMethods.TYPED_LINKS)
@@ -1452,14 +1600,16 @@ class MetadataHarvester:
                     else:
                         target_url_list = [target_url]
                 if target_url_list:
-                    target_url_list = set(tu for tu in target_url_list if tu is not None)
-                    self.retrieve_metadata_external_xml_negotiated(target_url_list)
-                    self.retrieve_metadata_external_schemaorg_negotiated(target_url_list)
-                    self.retrieve_metadata_external_rdf_negotiated(target_url_list)
-                    self.retrieve_metadata_external_datacite()
+                    target_url_list = list(set(tu for tu in target_url_list if tu is not None))
+                    # all requests are independent, so they are done concurrently but merged in the usual order
+                    jobs = self.get_external_xml_negotiated_jobs(target_url_list)
+                    jobs.extend(self.get_external_schemaorg_negotiated_jobs(target_url_list))
+                    jobs.extend(self.get_external_rdf_negotiated_jobs(target_url_list))
+                    jobs.extend(self.get_external_datacite_jobs())
                     if not repeat_mode:
-                        self.retrieve_metadata_external_linked_metadata()
-                        self.retrieve_metadata_external_oai_ore()
+                        jobs.extend(self.get_external_linked_metadata_jobs())
+                        jobs.extend(self.get_external_oai_ore_jobs())
+                    ConcurrentHelper.run_jobs(jobs)
 
             """if self.reference_elements:
                 self.logger.debug(f"FsF-F2-01M : Reference metadata elements NOT FOUND -: {self.reference_elements}")
@@ -1493,27 +1643,10 @@ class MetadataHarvester:
 
     def lookup_metadatastandard_by_uri(self, value):
         metadata_standard_id = None
-        if value:
-            value = str(value).strip().strip("#/")
-            # try to find it as direct match using http or https as prefix
-            if value.startswith("http") or value.startswith("ftp"):
-                value = value.replace("s://", "://")
-                metadata_standard_id = self.COMMUNITY_METADATA_STANDARDS_URIS.get(value)
-                if not metadata_standard_id:
-                    metadata_standard_id = self.COMMUNITY_METADATA_STANDARDS_URIS.get(value.replace("://", "s://"))
-            if not metadata_standard_id:
-                # fuzzy as fall back
-                try:
-                    match = process.extractOne(value, self.COMMUNITY_METADATA_STANDARDS_URIS.keys())
-                    if extract(str(value)).domain == extract(str(match[0])).domain:
-                        req_similarity = 90
-                        if "w3.org/ns" in value:
-                            req_similarity = 95
-                        if match[1] > req_similarity:
-                            metadata_standard_id = list(self.COMMUNITY_METADATA_STANDARDS_URIS.values())[match[2]]
-                except Exception as e:
-                    print("METADATA STANDARD LOOKUP ERROR: ", str(e))
-                    pass
+        try:
+            metadata_standard_id = self.COMMUNITY_METADATA_STANDARDS_URI_INDEX.lookup(value)
+        except Exception as e:
+            print("METADATA STANDARD LOOKUP ERROR: ", str(e))
         return metadata_standard_id
 
     def get_metadata_standard_by_uris(self, test_uris):
@@ -0,0 +1,179 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import math
+import re
+
+
+class AssessmentSummary:
+    """Aggregates the metric results of an assessment by FAIR category (F, A, I, R) and principle (F1, A1.1, ..).
+
+    Scores and test status are summed, maturity is averaged. The numbers and their types are the same as those
+    of the former pandas based implementation: float columns (e.g. a missing status) are summed as floats
+    ignoring missing values, percentages per group are rounded like numpy.round.
+    """
+
+    # match both FAIR4RS and FsF metrics
+    metric_regex = re.compile(r"^(?:FRSM-[0-9]+|FsF)-(([FAIR])[0-9](\.[0-9])?)")
+    status_values = {"pass": 1, "fail": 0}
+    fair_categories = ["F", "A", "I", "R"]
+
+    @classmethod
+    def get_rows(cls, results, full_score=False):
+        """Returns a (fair_category, fair_principle, score_earned, score_total, maturity, status) tuple per result,
+        full_score gives all metrics their total score and highest maturity"""
+        rows = []
+        for res_v in results:
+            if res_v.get("metric_identifier"):
+                metric_match = cls.metric_regex.search(str(res_v.get("metric_identifier")))
+                if metric_match and metric_match.group(2) is not None:
+                    if full_score:
+                        earned, maturity, status = res_v["score"]["total"], 3, 1
+                    else:
+                        earned = res_v["score"]["earned"]
+                        maturity = res_v["maturity"]
+                        status = cls.status_values.get(res_v["test_status"])
+                    rows.append((metric_match[2], metric_match[1], earned, res_v["score"]["total"], maturity, status))
+        return rows
+
+    @staticmethod
+    def get_column(rows, index):
+        """Returns the values of a column and whether they are floats"""
+        values = [row[index] for row in rows]
+        # like a pandas column: if there is a float or a missing value all values are floats, missing ones NaN
+        if values and all(value is None for value in values):
+            # an object column, its sums are 0
+            return [math.nan] * len(values), False
+        if any(value is None or isinstance(value, float) for value in values):
+            return [math.nan if value is None else float(value) for value in values], True
+        return values, False
+
+    @staticmethod
+    def group(keys, values):
+        """Returns key : [values] without missing (NaN) values, sorted by key"""
+        groups = {key: [] for key in sorted(set(keys))}
+        for key, value in zip(keys, values):
+            if value == value:
+                groups[key].append(value)
+        return groups
+
+    @staticmethod
+    def group_total(values, is_float):
+        """Sum of a group, floats are summed with Kahan compensation like pandas groupby().sum()"""
+        if not is_float:
+            return sum(values)
+        total, compensation = 0.0, 0.0
+        for value in values:
+            y = value - compensation
+            t = total + y
+            compensation = t - total - y
+            if compensation != compensation:
+                compensation = 0.0
+            total = t
+        return total
+
+    @classmethod
+    def column_total(cls, values, is_float):
+        """Sum of a column, floats are summed pairwise like numpy.sum"""
+        if not is_float:
+            return sum(values)
+        if len(values) < 8:
+            total = 0.0
+            for value in values:
+                total += value
+            return total
+        if len(values) <= 128:
+            partial = list(values[:8])
+            i = 8
+            while i < len(values) - len(values) % 8:
+                for j in range(8):
+                    partial[j] += values[i + j]
+                i += 8
+            total = ((partial[0] + partial[1]) + (partial[2] + partial[3])) + (
+                (partial[4] + partial[5]) + (partial[6] + partial[7])
+            )
+            for value in values[i:]:
+                total += value
+            return total
+        half = len(values) // 2
+        half -= half % 8
+        return cls.column_total(values[:half], is_float) + cls.column_total(values[half:], is_float)
+
+    @staticmethod
+    def divide(dividend, divisor):
+        if divisor == 0:
+            return math.nan if dividend == 0 or math.isnan(dividend) else math.copysign(math.inf, dividend)
+        return dividend / divisor
+
+    @staticmethod
+    def round_maturity(values):
+        mean = sum(values) / len(values) if values else math.nan
+        return 1 if mean < 1 and mean > 0 else round(mean)
+
+    @classmethod
+    def summarise(cls, rows):
+        """Returns the summary dict of the rows returned by get_rows"""
+        categories = [row[0] for row in rows]
+        principles = [row[1] for row in rows]
+        by_category, by_principle, all_values, filled_values, is_float = {}, {}, {}, {}, {}
+        for index, column in enumerate(["score_earned", "score_total", "maturity", "status"], start=2):
+            values, is_float[column] = cls.get_column(rows, index)
+            by_category[column] = cls.group(categories, values)
+            by_principle[column] = cls.group(principles, values)
+            all_values[column] = [value for value in values if value == value]
+            # numpy.nansum replaces missing values by 0
+            filled_values[column] = [value if value == value else 0.0 for value in values]
+
+        def total(column, values):
+            return cls.group_total(values, is_float[column])
+
+        def column_total(column):
+            return cls.column_total(filled_values[column], is_float[column])
+
+        summary = {"score_earned": {}, "score_total": {}, "score_percent": {}, "status_total": {}, "status_passed": {}}
+
+        for column in ["score_earned", "score_total"]:
+            summary[column] = {key: total(column, values) for key, values in by_category[column].items()}
+            summary[column].update({key: total(column, values) for key, values in by_principle[column].items()})
+            summary[column]["FAIR"] = round(float(column_total(column)), 2)
+
+        for groups in [by_category, by_principle]:
+            for key, earned in groups["score_earned"].items():
+                percent = cls.divide(total("score_earned", earned), total("score_total", groups["score_total"][key]))
+                percent = percent * 100
+                # like numpy.round(percent, 2)
+                summary["score_percent"][key] = round(percent * 100) / 100 if math.isfinite(percent) else percent
+        summary["score_percent"]["FAIR"] = round(
+            float(cls.divide(column_total("score_earned"), column_total("score_total")) * 100),
+            2,
+        )
+
+        summary["maturity"] = {key: cls.round_maturity(values) for key, values in by_category["maturity"].items()}
+        summary["maturity"].update(
+            {key: cls.round_maturity(values) for key, values in by_principle["maturity"].items()}
+        )
+        total_maturity = 0
+        for fair_index in cls.fair_categories:
+            if summary["maturity"].get(fair_index):
+                total_maturity += summary["maturity"][fair_index]
+        summary["maturity"]["FAIR"] = round(
+            float(1 if total_maturity / 4 < 1 and total_maturity / 4 > 0 else total_maturity / 4), 2
+        )
+
+        summary["status_total"] = {key: len(values) for key, values in by_principle["status"].items()}
+        summary["status_total"].update({key: len(values) for key, values in by_category["status"].items()})
+        summary["status_total"]["FAIR"] = len(all_values["status"])
+
+        summary["status_passed"] = {key: total("status", values) for key, values in by_principle["status"].items()}
+        summary["status_passed"].update({key: total("status", values) for key, values in by_category["status"].items()})
+        summary["status_passed"]["FAIR"] = int(column_total("status"))
+        return summary
+
+    @classmethod
+    def summarise_all(cls, result_sets):
+        """Returns the summaries of many assessments (lists of metric results), e.g. for reports.
+
+        This is a plain loop over summarise(), each assessment is aggregated on its own.
+        """
+        return [cls.summarise(cls.get_rows(results)) for results in result_sets]
@@ -0,0 +1,414 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+
+import idutils
+import requests
+
+from fuji_server import encoder
+from fuji_server.helper.deadline import Deadline
+from fuji_server.helper.host_circuit_breaker import HostCircuitBreaker
+from fuji_server.helper.preprocessor import Preprocessor
+
+# request options shared by all evaluations of a batch
+BATCH_OPTIONS = [
+    "test_debug",
+    "metadata_service_endpoint",
+    "metadata_service_type",
+    "use_datacite",
+    "use_github",
+    "metric_version",
+    "oaipmh_endpoint",
+]
+
+
+class TransientEvaluationError(Exception):
+    """Raised if an evaluation failed for a reason which may be gone when it is retried later"""
+
+
+class BatchJobQueue:
+    """Persistent queue of batch evaluations (one job per identifier) run by a pool of worker threads.
+
+    Batches and jobs are stored in a SQLite file, jobs which were running when the server stopped are queued
+    again by start(), so a sweep continues after a restart. The file is used by one server process.
+    Jobs are fairly distributed over the repositories (see get_host): a free worker takes the next job of the
+    repository with the least running jobs which was served longest ago, and at most max_per_host jobs of the
+    same repository run at a time. Evaluations failing with connection errors or timeouts, or for which the
+    host of the identifier was unavailable, are retried max_attempts times, waiting retry_backoff seconds
+    which are doubled for each attempt. Authentication tokens are kept in memory only, never in the file.
+    Finished batches incl. their results are deleted retention seconds after their last evaluation finished.
+    The workers run the evaluations themselves, not in the EvaluationExecutor, so a batch never takes the
+    workers of interactive evaluations: up to evaluation_workers + batch_workers evaluations run at a time.
+    """
+
+    logger = logging.getLogger(__name__)
+    # SQLite file of the queue, data/batch_queue.sqlite if not set
+    path = None
+    max_workers = 2
+    # maximum number of jobs of the same repository running at a time
+    max_per_host = 1
+    # attempts of an evaluation failing for transient reasons and seconds before the first retry
+    max_attempts = 3
+    retry_backoff = 60
+    # maximum number of identifiers per batch
+    max_identifiers = 50000
+    # seconds idle workers wait before they look for jobs which are due (e.g. retries)
+    poll_interval = 1
+    # seconds finished batches and their results are kept (0 = forever)
+    retention = 7 * 24 * 3600
+
+    _lock = threading.Lock()
+    _wakeup = threading.Condition(_lock)
+    _local = threading.local()
+    _workers = []
+    _stopped = False
+    _evaluate = None
+    _running = {}  # host: number of running jobs
+    _served = {}  # host: sequence number of the last job started
+    _sequence = 0
+    _auth_tokens = {}  # batch id: (auth_token, auth_token_type)
+
+    @classmethod
+    def set_options(
+        cls,
+        path=None,
+        max_workers=None,
+        max_per_host=None,
+        max_attempts=None,
+        retry_backoff=None,
+        max_identifiers=None,
+        retention=None,
+    ):
+        if path:
+            cls.path = path
+            cls._local = threading.local()
+        if max_workers:
+            cls.max_workers = int(max_workers)
+        if max_per_host:
+            cls.max_per_host = int(max_per_host)
+        if max_attempts:
+            cls.max_attempts = int(max_attempts)
+        if retry_backoff is not None:
+            cls.retry_backoff = float(retry_backoff)
+        if max_identifiers:
+            cls.max_identifiers = int(max_identifiers)
+        if retention is not None:
+            cls.retention = float(retention)
+
+    @classmethod
+    def _get_connection(cls):
+        # sqlite connections must not be shared between threads
+        connection = getattr(cls._local, "connection", None)
+        if connection is None:
+            path = cls.path or os.path.join(Preprocessor.fuji_server_dir, "data", "batch_queue.sqlite")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            connection = sqlite3.connect(path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS batches (id TEXT PRIMARY KEY, options TEXT, has_auth_token INTEGER, "
+                    "created REAL)"
+                )
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id TEXT, "
+                    "position INTEGER, identifier TEXT, host TEXT, status TEXT, attempts INTEGER DEFAULT 0, "
+                    "next_attempt REAL DEFAULT 0, started REAL, finished REAL, error TEXT, result TEXT)"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS jobs_status_host ON jobs (status, host, id)")
+                connection.execute("CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch_id, position)")
+            cls._local.connection = connection
+        return connection
+
+    @staticmethod
+    def get_host(identifier):
+        """Returns the repository of identifier used for fairness: the DOI prefix or the host of URLs"""
+        identifier = str(identifier).strip()
+        if idutils.is_doi(identifier):
+            return "doi:" + idutils.normalize_doi(identifier).split("/", 1)[0]
+        host = urlparse(identifier).netloc.lower()
+        if host:
+            return host
+        return identifier.split(":", 1)[0].lower()
+
+    @staticmethod
+    def get_identifier_url(identifier):
+        if idutils.is_doi(identifier):
+            return "https://doi.org/" + idutils.normalize_doi(identifier)
+        return identifier
+
+    @staticmethod
+    def get_timestamp(seconds):
+        # timestamp format from RFC 3339 as specified in openapi3
+        if seconds is None:
+            return None
+        return datetime.datetime.fromtimestamp(seconds, datetime.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    @classmethod
+    def start(cls, evaluate):
+        """Starts the worker threads (once per process) which run the queued jobs by calling
+        evaluate(body, allow_remote_logging, deadline), jobs interrupted by a restart are queued again"""
+        with cls._lock:
+            cls._evaluate = evaluate
+            if cls._workers:
+                return
+            connection = cls._get_connection()
+            with connection:
+                connection.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+            cls.purge()
+            cls._stopped = False
+            cls._running = {}
+            for number in range(cls.max_workers):
+                worker = threading.Thread(target=cls.work, name=f"fuji-batch-worker-{number}", daemon=True)
+                worker.start()
+                cls._workers.append(worker)
+
+    @classmethod
+    def stop(cls, timeout=None):
+        with cls._lock:
+            cls._stopped = True
+            cls._wakeup.notify_all()
+            workers, cls._workers = cls._workers, []
+        for worker in workers:
+            worker.join(timeout)
+
+    @classmethod
+    def submit(cls, identifiers, options):
+        """Enqueues an evaluation for each identifier with the shared options (request body without
+        object_identifier) and returns the id of the batch"""
+        identifiers = [str(identifier).strip() for identifier in identifiers if str(identifier).strip()]
+        if not identifiers:
+            raise ValueError("No object identifiers given")
+        if len(identifiers) > cls.max_identifiers:
+            raise ValueError(f"Too many object identifiers, maximum is {cls.max_identifiers}")
+        cls.purge()
+        batch_id = uuid.uuid4().hex
+        batch_options = {key: options[key] for key in BATCH_OPTIONS if options.get(key) is not None}
+        auth_token = options.get("auth_token")
+        if auth_token:
+            with cls._lock:
+                cls._auth_tokens[batch_id] = (auth_token, options.get("auth_token_type"))
+        connection = cls._get_connection()
+        with connection:
+            connection.execute(
+                "INSERT INTO batches (id, options, has_auth_token, created) VALUES (?, ?, ?, ?)",
+                (batch_id, json.dumps(batch_options), int(bool(auth_token)), time.time()),
+            )
+            connection.executemany(
+                "INSERT INTO jobs (batch_id, position, identifier, host, status) VALUES (?, ?, ?, ?, 'queued')",
+                [
+                    (batch_id, position, identifier, cls.get_host(identifier))
+                    for position, identifier in enumerate(identifiers)
+                ],
+            )
+        with cls._wakeup:
+            cls._wakeup.notify_all()
+        cls.logger.info(f"Batch queued -: {batch_id}, {len(identifiers)} identifiers")
+        return batch_id
+
+    @classmethod
+    def purge(cls):
+        """Deletes the batches which finished longer than retention seconds ago, returns their number"""
+        if cls.retention <= 0:
+            return 0
+        connection = cls._get_connection()
+        with connection:
+            batch_ids = [
+                (batch_id,)
+                for (batch_id,) in connection.execute(
+                    "SELECT batch_id FROM jobs GROUP BY batch_id "
+                    "HAVING SUM(status IN ('queued', 'running')) = 0 AND MAX(finished) < ?",
+                    (time.time() - cls.retention,),
+                )
+            ]
+            connection.executemany("DELETE FROM jobs WHERE batch_id = ?", batch_ids)
+            connection.executemany("DELETE FROM batches WHERE id = ?", batch_ids)
+        if batch_ids:
+            cls.logger.info(f"Deleted finished batches -: {len(batch_ids)}")
+        return len(batch_ids)
+
+    @classmethod
+    def get_status(cls, batch_id):
+        """Returns the number of jobs in each state of the batch, None if it does not exist"""
+        connection = cls._get_connection()
+        batch = connection.execute("SELECT created FROM batches WHERE id = ?", (batch_id,)).fetchone()
+        if batch is None:
+            return None
+        counts = dict(
+            connection.execute("SELECT status, COUNT(*) FROM jobs WHERE batch_id = ? GROUP BY status", (batch_id,))
+        )
+        total = sum(counts.values())
+        pending = counts.get("queued", 0) + counts.get("running", 0)
+        if not pending:
+            status = "finished"
+        elif pending == total and not counts.get("running"):
+            status = "queued"
+        else:
+            status = "running"
+        batch_status = {
+            "batch_id": batch_id,
+            "status": status,
+            "created": cls.get_timestamp(batch[0]),
+            "total": total,
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "succeeded": counts.get("succeeded", 0),
+            "failed": counts.get("failed", 0),
+        }
+        if not pending:
+            last_finished = connection.execute("SELECT MAX(finished) FROM jobs WHERE batch_id = ?", (batch_id,))
+            batch_status["finished"] = cls.get_timestamp(last_finished.fetchone()[0])
+        return batch_status
+
+    @classmethod
+    def get_results(cls, batch_id, page=1, page_size=100, status=None):
+        """Returns one page of the jobs of the batch in the order of the submitted identifiers"""
+        connection = cls._get_connection()
+        query = "FROM jobs WHERE batch_id = ?"
+        parameters = [batch_id]
+        if status:
+            query += " AND status = ?"
+            parameters.append(status)
+        total = connection.execute("SELECT COUNT(*) " + query, parameters).fetchone()[0]
+        rows = connection.execute(
+            "SELECT position, identifier, status, attempts, error, result, finished "
+            + query
+            + " ORDER BY position LIMIT ? OFFSET ?",
+            [*parameters, page_size, (page - 1) * page_size],
+        )
+        results = []
+        for position, identifier, job_status, attempts, error, result, finished in rows:
+            job = {"position": position, "object_identifier": identifier, "status": job_status, "attempts": attempts}
+            if finished:
+                job["finished"] = cls.get_timestamp(finished)
+            if error:
+                job["error"] = error
+            if result:
+                job["result"] = json.loads(result)
+            results.append(job)
+        return {"batch_id": batch_id, "page": page, "page_size": page_size, "total": total, "results": results}
+
+    @classmethod
+    def claim(cls):
+        """Marks the next job as running and returns it, None if no job may run now.
+        Must be called holding cls._lock"""
+        connection = cls._get_connection()
+        candidates = [
+            (host, job_id)
+            for host, job_id in connection.execute(
+                "SELECT host, MIN(id) FROM jobs WHERE status = 'queued' AND next_attempt <= ? GROUP BY host",
+                (time.time(),),
+            )
+            if cls._running.get(host, 0) < cls.max_per_host
+        ]
+        if not candidates:
+            return None
+        # the least busy repository first, of these the one which was served longest ago
+        host, job_id = min(
+            candidates, key=lambda candidate: (cls._running.get(candidate[0], 0), cls._served.get(candidate[0], 0))
+        )
+        with connection:
+            connection.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started = ? WHERE id = ?",
+                (time.time(), job_id),
+            )
+        cls._running[host] = cls._running.get(host, 0) + 1
+        cls._sequence += 1
+        cls._served[host] = cls._sequence
+        job = connection.execute(
+            "SELECT jobs.id, jobs.batch_id, jobs.identifier, jobs.host, jobs.attempts, batches.options, "
+            "batches.has_auth_token FROM jobs JOIN batches ON batches.id = jobs.batch_id WHERE jobs.id = ?",
+            (job_id,),
+        ).fetchone()
+        return dict(
+            zip(["id", "batch_id", "identifier", "host", "attempts", "options", "has_auth_token"], job, strict=True)
+        )
+
+    @classmethod
+    def work(cls):
+        while True:
+            with cls._wakeup:
+                job = None
+                while not cls._stopped:
+                    job = cls.claim()
+                    if job is not None:
+                        break
+                    cls._wakeup.wait(cls.poll_interval)
+                if job is None:
+                    return
+            cls.run(job)
+
+    @classmethod
+    def run(cls, job):
+        body = json.loads(job["options"])
+        body["object_identifier"] = job["identifier"]
+        if job["has_auth_token"]:
+            if job["batch_id"] not in cls._auth_tokens:
+                cls._release(job, "failed", error="Authentication token is not available anymore (server restarted)")
+                return
+            body["auth_token"], body["auth_token_type"] = cls._auth_tokens[job["batch_id"]]
+        result = None
+        try:
+            result = cls._evaluate(body, False, Deadline.for_assessment())
+            # the result is of no use if the identifier could not be resolved since its host was down
+            identifier_url = cls.get_identifier_url(job["identifier"])
+            if not HostCircuitBreaker.is_available(identifier_url):
+                raise TransientEvaluationError(f"Host unavailable -: {HostCircuitBreaker.get_host(identifier_url)}")
+        except (TransientEvaluationError, requests.exceptions.RequestException, OSError) as e:
+            if job["attempts"] < cls.max_attempts:
+                retry_in = cls.retry_backoff * 2 ** (job["attempts"] - 1)
+                cls.logger.warning(f"Batch evaluation failed, retrying in {retry_in:.0f}s -: {job['identifier']}, {e}")
+                cls._release(job, "queued", error=str(e), next_attempt=time.time() + retry_in)
+            else:
+                cls.logger.error(f"Batch evaluation failed -: {job['identifier']}, {e}")
+                cls._release(job, "failed", error=str(e), result=cls.serialize(result))
+        except Exception as e:
+            cls.logger.exception(f"Batch evaluation failed -: {job['identifier']}")
+            cls._release(job, "failed", error=str(e) or type(e).__name__)
+        else:
+            cls._release(job, "succeeded", result=cls.serialize(result))
+
+    @staticmethod
+    def serialize(result):
+        if result is None:
+            return None
+        return json.dumps(result, cls=encoder.CustomJSONEncoder)
+
+    @classmethod
+    def _release(cls, job, status, error=None, result=None, next_attempt=0):
+        connection = cls._get_connection()
+        with connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, result = ?, next_attempt = ?, finished = ? WHERE id = ?",
+                (
+                    status,
+                    error,
+                    result,
+                    next_attempt,
+                    time.time() if status in ("succeeded", "failed") else None,
+                    job["id"],
+                ),
+            )
+            finished_batch = (
+                status != "queued"
+                and not connection.execute(
+                    "SELECT 1 FROM jobs WHERE batch_id = ? AND status IN ('queued', 'running') LIMIT 1",
+                    (job["batch_id"],),
+                ).fetchone()
+            )
+        with cls._wakeup:
+            if finished_batch:
+                cls._auth_tokens.pop(job["batch_id"], None)
+            cls._running[job["host"]] -= 1
+            if not cls._running[job["host"]]:
+                del cls._running[job["host"]]
+            cls._wakeup.notify_all()
@@ -4,9 +4,8 @@
 
 import logging
 
-import requests
-
 from fuji_server.helper.catalogue_helper import MetaDataCatalogue
+from fuji_server.helper.http_transport import HTTPTransport
 
 
 class MetaDataCatalogueDataCite(MetaDataCatalogue):
@@ -51,7 +50,7 @@ class MetaDataCatalogueDataCite(MetaDataCatalogue):
         """
         response = None
         try:
-            res = requests.get(self.apiURI + "/" + pid, timeout=5)
+            res = HTTPTransport.get(self.apiURI + "/" + pid, timeout=5)
             self.logger.info("FsF-F4-01M : Querying DataCite API for -:" + str(pid))
             if res.status_code == 200:
                 self.islisted = True
@@ -9,11 +9,10 @@ import sqlite3 as sl
 from random import randint
 from time import sleep
 
-import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
 from fuji_server.helper.catalogue_helper import MetaDataCatalogue
+from fuji_server.helper.http_transport import HTTPTransport
 from fuji_server.helper.preprocessor import Preprocessor
 
 
@@ -48,6 +47,9 @@ class MetaDataCatalogueGoogleDataSearch(MetaDataCatalogue):
         self.object_type = object_type
 
     def random_sample(self, limit):
+        # pandas is only needed by the offline tools, so it is not imported by every worker
+        import pandas as pd
+
         sample = []
         try:
             con = sl.connect(self.google_cache_db_path)
@@ -108,6 +110,8 @@ class MetaDataCatalogueGoogleDataSearch(MetaDataCatalogue):
         return response
 
     def create_cache_db(self, google_cache_file):
+        import pandas as pd
+
         gs = pd.read_csv(google_cache_file)
         # google_cache_db_path = os.path.join(Preprocessor.fuji_server_dir, 'data','google_cache.db')
         con = sl.connect(self.google_cache_db_path)
@@ -139,7 +143,7 @@ class MetaDataCatalogueGoogleDataSearch(MetaDataCatalogue):
         }
         found_url_in_google = False
         try:
-            response = requests.get(google, headers=headers, cookies={"CONSENT": "YES+1"})
+            response = HTTPTransport.get(google, headers=headers, cookies={"CONSENT": "YES+1"})
             soup = BeautifulSoup(response.content, "html.parser")
             not_indexed = re.compile("did not match any documents")
             if soup(text=not_indexed):
@@ -167,7 +171,7 @@ class MetaDataCatalogueGoogleDataSearch(MetaDataCatalogue):
                         + "&key="
                         + self.google_custom_search_api_key
                     )
-                    res = requests.get(google_url)
+                    res = HTTPTransport.get(google_url)
                     if res:
                         try:
                             google_json = res.json()
@@ -7,6 +7,7 @@ import logging
 import requests
 
 from fuji_server.helper.catalogue_helper import MetaDataCatalogue
+from fuji_server.helper.http_transport import HTTPTransport
 
 
 class MetaDataCatalogueMendeleyData(MetaDataCatalogue):
@@ -47,7 +48,7 @@ class MetaDataCatalogueMendeleyData(MetaDataCatalogue):
         for pid in pidlist:
             try:
                 if pid:
-                    res = requests.get(self.apiURI + "/" + requests.utils.quote(str(pid)), timeout=1)
+                    res = HTTPTransport.get(self.apiURI + "/" + requests.utils.quote(str(pid)), timeout=1)
                     self.logger.info("FsF-F4-01M : Querying Mendeley Data API for -:" + str(pid))
                     if res.status_code == 200:
                         resp = res.json()
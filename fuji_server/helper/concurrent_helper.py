@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import contextvars
+import logging
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class BufferedLogger(logging.LoggerAdapter):
+    """Logger which keeps all messages until flush() is called and then passes them to the wrapped logger.
+
+    This allows to run tasks concurrently while their log messages still appear in a deterministic order.
+    After flush() all messages are passed to the wrapped logger immediately.
+    """
+
+    def __init__(self, logger):
+        super().__init__(logger, {})
+        self.buffering = True
+        self.records = []
+        self._lock = threading.Lock()
+
+    def log(self, level, msg, *args, **kwargs):
+        with self._lock:
+            if self.buffering:
+                if kwargs.get("exc_info") is True:
+                    kwargs["exc_info"] = sys.exc_info()
+                self.records.append((level, msg, args, kwargs))
+                return
+        self.logger.log(level, msg, *args, **kwargs)
+
+    def flush(self):
+        with self._lock:
+            records, self.records = self.records, []
+            self.buffering = False
+        for level, msg, args, kwargs in records:
+            self.logger.log(level, msg, *args, **kwargs)
+
+
+class ConcurrentJob:
+    """A (network bound) fetch step which may run concurrently with other jobs, and a merge step which is
+    given the result of the fetch and which is done in the order the jobs have been created.
+
+    The fetch function is called with a BufferedLogger which should be used for all log messages, these are
+    passed to the logger before the merge step starts. Exceptions raised during fetch are raised again by finish().
+    """
+
+    def __init__(self, logger, fetch=None, merge=None):
+        self.logger = BufferedLogger(logger)
+        self.fetch = fetch
+        self.merge = merge
+        self.result = None
+        self.error = None
+
+    def run(self):
+        if self.fetch:
+            try:
+                self.result = self.fetch(self.logger)
+            except Exception as e:
+                self.error = e
+
+    def finish(self):
+        self.logger.flush()
+        if self.error:
+            raise self.error
+        if self.merge:
+            self.merge(self.result)
+
+
+class ConcurrentHelper:
+    """Runs independent (network bound) tasks of an evaluation in parallel threads."""
+
+    # maximum number of threads used for one call of run_all
+    max_workers = 8
+
+    @classmethod
+    def set_max_workers(cls, max_workers):
+        if max_workers:
+            cls.max_workers = int(max_workers)
+
+    @classmethod
+    def run_all(cls, functions, max_workers=None):
+        """Calls all functions and waits for them to finish, returns the futures in the order of the functions"""
+        # the tasks run in the context of the caller (e.g. the deadline of the assessment)
+        functions = [
+            lambda function=function, context=contextvars.copy_context(): context.run(function)
+            for function in functions
+        ]
+        if not max_workers:
+            max_workers = cls.max_workers
+        if len(functions) <= 1 or max_workers <= 1:
+            # nothing to parallelize, avoid the overhead of threads
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return [executor.submit(function) for function in functions]
+        # a new executor per call avoids deadlocks in case a task itself calls run_all
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(functions))) as executor:
+            return [executor.submit(function) for function in functions]
+
+    @classmethod
+    def run_jobs(cls, jobs, max_workers=None, dependencies=None):
+        """Runs the fetch steps of all jobs concurrently, then the merge steps one after another in the given order.
+
+        dependencies optionally contains for each job the indices of earlier jobs it depends on, the fetch step
+        of a job starts only after the merge steps of these jobs are done.
+        """
+        if dependencies is None:
+            cls.run_all([job.run for job in jobs], max_workers)
+            for job in jobs:
+                job.finish()
+            return
+        if not max_workers:
+            max_workers = cls.max_workers
+        started, fetched, running = set(), set(), {}
+        merged = 0
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as executor:
+            while merged < len(jobs):
+                for index, job in enumerate(jobs):
+                    if index not in started and all(dependency < merged for dependency in dependencies[index]):
+                        started.add(index)
+                        running[executor.submit(contextvars.copy_context().run, job.run)] = index
+                if not running:
+                    raise ValueError("jobs may only depend on earlier jobs")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fetched.add(running.pop(future))
+                # merge steps are done as soon as all previous jobs are merged
+                while merged in fetched:
+                    jobs[merged].finish()
+                    merged += 1
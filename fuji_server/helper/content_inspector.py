@@ -0,0 +1,274 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import csv
+import json
+import re
+import struct
+import threading
+
+
+class SignatureInspector:
+    """In-process content inspection by magic bytes and lightweight text extraction.
+
+    Recognises common scientific and generic formats; returns None for unknown binary content so that
+    the next backend (e.g. Tika) can be asked. Documents and compressed archives are recognised but their
+    text can't be extracted in-process, such results are marked as incomplete.
+    """
+
+    name = "signature"
+
+    # (offset, magic bytes, mime type), the first match wins
+    signatures = [
+        (0, b"\x89HDF\r\n\x1a\n", "application/x-hdf5"),
+        (0, b"CDF\x01", "application/x-netcdf"),
+        (0, b"CDF\x02", "application/x-netcdf"),
+        (0, b"CDF\x05", "application/x-netcdf"),
+        (0, b"\x0e\x03\x13\x01", "application/x-hdf"),
+        (0, b"SIMPLE  =", "application/fits"),
+        (0, b"%PDF-", "application/pdf"),
+        (0, b"PK\x03\x04", "application/zip"),
+        (0, b"PK\x05\x06", "application/zip"),
+        (0, b"\x1f\x8b", "application/gzip"),
+        (0, b"BZh", "application/x-bzip2"),
+        (0, b"\xfd7zXZ\x00", "application/x-xz"),
+        (0, b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+        (257, b"ustar", "application/x-tar"),
+        (0, b"PAR1", "application/vnd.apache.parquet"),
+        (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+        (0, b"\xff\xd8\xff", "image/jpeg"),
+        (0, b"GIF87a", "image/gif"),
+        (0, b"GIF89a", "image/gif"),
+        (0, b"II*\x00", "image/tiff"),
+        (0, b"MM\x00*", "image/tiff"),
+        (0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/x-tika-msoffice"),
+        (0, b"SQLite format 3\x00", "application/x-sqlite3"),
+    ]
+    # formats whose headers contain names of variables, dimensions, attributes etc.
+    header_text_types = ["application/x-hdf5", "application/x-netcdf", "application/x-hdf", "application/fits"]
+    # formats whose text (or the text of their members) needs a full parser
+    document_types = [
+        "application/pdf",
+        "application/x-tika-msoffice",
+        "application/gzip",
+        "application/x-bzip2",
+        "application/x-xz",
+        "application/x-7z-compressed",
+        "application/x-tar",
+    ]
+    document_type_prefixes = ["application/vnd.openxmlformats-officedocument.", "application/vnd.oasis.opendocument."]
+    # zip based formats, recognised by their first member or member name prefixes
+    zip_types = {
+        "word/": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "xl/": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "ppt/": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    }
+    html_regex = re.compile(rb"<!doctype\s+html|<html", re.IGNORECASE)
+    xml_tag_regex = re.compile(r"<[^>]*>")
+    # printable ASCII strings of binary headers
+    strings_regex = re.compile(rb"[A-Za-z_][A-Za-z0-9_.:\- ]{2,}")
+    max_header_size = 65536
+
+    @classmethod
+    def inspect(cls, content):
+        """Returns {'content_types': [..], 'text': ..} or None if the content type is unknown, 'incomplete' is
+        True if the text could not be extracted"""
+        for offset, magic, mime_type in cls.signatures:
+            if content[offset : offset + len(magic)] == magic:
+                if mime_type == "application/zip":
+                    result = cls.inspect_zip(content)
+                else:
+                    text = ""
+                    if mime_type in cls.header_text_types:
+                        text = cls.get_header_text(content)
+                    result = {"content_types": [mime_type], "text": text}
+                if cls.is_document_type(result["content_types"][0]):
+                    result["incomplete"] = True
+                return result
+        return cls.inspect_text(content)
+
+    @classmethod
+    def is_document_type(cls, mime_type):
+        return mime_type in cls.document_types or mime_type.startswith(tuple(cls.document_type_prefixes))
+
+    @classmethod
+    def get_header_text(cls, content):
+        return " ".join(s.decode("ascii").strip() for s in cls.strings_regex.findall(content[: cls.max_header_size]))
+
+    @classmethod
+    def get_zip_members(cls, content):
+        """Names of the members of a (possibly truncated) zip file, read from the local file headers"""
+        members = []
+        offset = 0
+        while content[offset : offset + 4] == b"PK\x03\x04" and offset + 30 <= len(content):
+            flags, compressed_size, name_length, extra_length = struct.unpack_from("<6xH10xIxxxxHH", content, offset)
+            name_start = offset + 30
+            members.append(content[name_start : name_start + name_length].decode("utf-8", errors="replace"))
+            if flags & 0x08 and compressed_size == 0:
+                # size follows the data, the next header can't be found without decompressing
+                break
+            offset = name_start + name_length + extra_length + compressed_size
+        return members
+
+    @classmethod
+    def inspect_zip(cls, content):
+        mime_type = "application/zip"
+        members = cls.get_zip_members(content)
+        if members and members[0] == "mimetype":
+            # ODF and EPUB store their type uncompressed as first member
+            name_length, extra_length = struct.unpack_from("<HH", content, 26)
+            data_start = 30 + name_length + extra_length
+            (size,) = struct.unpack_from("<I", content, 18)
+            odf_type = content[data_start : data_start + size].decode("ascii", errors="ignore").strip()
+            if data_start + size <= len(content) and re.match(r"^[\w.+-]+/[\w.+-]+$", odf_type):
+                mime_type = odf_type
+        else:
+            for prefix, zip_type in cls.zip_types.items():
+                if any(member.startswith(prefix) for member in members):
+                    mime_type = zip_type
+                    break
+        return {"content_types": [mime_type], "text": " ".join(members)}
+
+    @classmethod
+    def decode_text(cls, content):
+        """Returns the content as str if it looks like text, otherwise None"""
+        sample = content[:8192]
+        if b"\x00" in sample:
+            return None
+        try:
+            return content.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # a multibyte character cut off by a truncated download
+            if e.start >= len(content) - 3:
+                return content[: e.start].decode("utf-8")
+        # control characters other than whitespace indicate binary content
+        if re.search(rb"[\x01-\x08\x0e-\x1a\x1c-\x1f]", sample):
+            return None
+        return content.decode("latin-1")
+
+    @classmethod
+    def inspect_text(cls, content):
+        text = cls.decode_text(content)
+        if text is None:
+            return None
+        stripped = text.lstrip("\ufeff \t\r\n")
+        if cls.html_regex.search(content[:1024]):
+            return {"content_types": ["text/html"], "text": cls.xml_tag_regex.sub(" ", text)}
+        if stripped.startswith("<"):
+            return {"content_types": ["application/xml", "text/xml"], "text": cls.xml_tag_regex.sub(" ", text)}
+        if stripped[:1] in ["{", "["]:
+            try:
+                json.loads(stripped)
+                return {"content_types": ["application/json"], "text": text}
+            except ValueError:
+                # a truncated json file still starts with a key or value
+                if re.match(r'^[{\[]\s*("|[{\[]|-?[0-9]|true|false|null|[}\]])', stripped):
+                    return {"content_types": ["application/json"], "text": text}
+        delimiter = cls.get_delimiter(stripped)
+        if delimiter == "\t":
+            return {"content_types": ["text/tab-separated-values"], "text": text}
+        if delimiter:
+            return {"content_types": ["text/csv"], "text": text}
+        return {"content_types": ["text/plain"], "text": text}
+
+    @staticmethod
+    def get_delimiter(text, max_lines=20):
+        """Returns the delimiter if all of the first lines have the same number (>1) of fields, otherwise None"""
+        # the last line may be truncated
+        lines = [line for line in text.splitlines()[: max_lines + 1] if line.strip()][:-1]
+        if len(lines) < 3:
+            return None
+        for delimiter in ["\t", ",", ";"]:
+            field_counts = {len(row) for row in csv.reader(lines, delimiter=delimiter)}
+            if len(field_counts) == 1 and field_counts.pop() > 1:
+                return delimiter
+        return None
+
+
+class TikaInspector:
+    """Content inspection by a Tika server (tika-python), needs a running Tika (JVM) service"""
+
+    name = "tika"
+
+    @classmethod
+    def inspect(cls, content):
+        from tika import parser
+
+        parsed_file = parser.from_buffer(content)
+        content_types = parsed_file.get("metadata", {}).get("Content-Type")
+        if not content_types:
+            return None
+        if not isinstance(content_types, list):
+            content_types = [content_types]
+        return {
+            "content_types": content_types,
+            "text": parsed_file.get("content") or "",
+            "status": parsed_file.get("status"),
+        }
+
+
+class ContentInspector:
+    """Detects the content type of (downloaded) content and extracts its text.
+
+    Backends are asked in the given order until one recognises the content. By default this is the in-process
+    SignatureInspector, Tika is only asked for content it does not know or whose text it can't extract.
+
+    Further backends can be registered, they need a name and an inspect(content) method returning
+    {'content_types': [..], 'text': ..} or None.
+    """
+
+    registered_backends = {SignatureInspector.name: SignatureInspector, TikaInspector.name: TikaInspector}
+    backends = ["signature", "tika"]
+    _lock = threading.Lock()
+
+    @classmethod
+    def set_options(cls, backends=None):
+        if backends:
+            if isinstance(backends, str):
+                backends = [b.strip() for b in backends.split(",") if b.strip()]
+            unknown = [b for b in backends if b not in cls.registered_backends]
+            if unknown:
+                raise ValueError(f"Unknown content inspection backend(s): {', '.join(unknown)}")
+            cls.backends = list(backends)
+
+    @classmethod
+    def register_backend(cls, backend):
+        with cls._lock:
+            cls.registered_backends = dict(cls.registered_backends, **{backend.name: backend})
+
+    @classmethod
+    def inspect(cls, content, logger=None, metric_id="FsF-R1-01MD", extract_text=True):
+        """Returns the result of the first backend which recognises the content, with its name as 'backend',
+        or None. Failing backends are logged and skipped. If a backend recognises the content but can't
+        extract its text, the next backends are asked for the text; the detected content type is kept in any case
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        if not content:
+            return None
+        detected = None
+        for name in cls.backends:
+            try:
+                result = cls.registered_backends[name].inspect(content)
+            except Exception as e:
+                if logger:
+                    logger.warning(f"{metric_id} : Content inspection using {name} failed -: {e}")
+                continue
+            if result:
+                result["backend"] = name
+                incomplete = result.pop("incomplete", False)
+                if detected:
+                    result["content_types"] = list(dict.fromkeys(result["content_types"] + detected["content_types"]))
+                    return result
+                if not (extract_text and incomplete):
+                    return result
+                detected = result
+        return detected
+
+    @classmethod
+    def get_content_type(cls, content, logger=None, metric_id="FsF-R1-01MD"):
+        result = cls.inspect(content, logger, metric_id, extract_text=False)
+        if result:
+            return result["content_types"][0]
+        return None
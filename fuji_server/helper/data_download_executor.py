@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from fuji_server.helper.http_transport import HTTPTransport
+
+
+class DataDownloadCancelled(Exception):
+    """Raised inside a download task if the time budget of its DataHarvester has run out"""
+
+
+class DownloadBudget:
+    """Time budget shared by all downloads of one DataHarvester, cancel() stops downloads which are still running"""
+
+    def __init__(self, seconds):
+        self.deadline = time.monotonic() + seconds
+        self.cancelled = threading.Event()
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def check(self):
+        """Raises DataDownloadCancelled if the budget is cancelled or used up"""
+        if self.cancelled.is_set() or self.remaining() <= 0:
+            raise DataDownloadCancelled("time budget for data downloads exceeded")
+
+
+class DataDownloadExecutor:
+    """Process wide, bounded thread pool for the data file downloads of all evaluations.
+
+    At most max_workers files are downloaded at the same time, at most max_downloads_per_host of them from
+    the same host. Downloads of a host which has no free slot wait in a queue of the host and are only passed
+    to the pool once a download of the host has finished, so they never block workers other hosts could use.
+    Each DataHarvester has a DownloadBudget, tasks which did not start before it ran out are cancelled, running
+    ones are expected to call budget.check() regularly (e.g. per chunk read).
+    """
+
+    max_workers = 8
+    max_downloads_per_host = 2
+    # seconds all data downloads of one DataHarvester may take
+    time_budget = 30
+
+    _executor = None
+    _lock = threading.Lock()
+    # host: {'running': number of downloads in the pool, 'pending': queued downloads}, only hosts with downloads
+    _hosts = {}
+
+    @classmethod
+    def set_options(cls, max_workers=None, max_downloads_per_host=None, time_budget=None):
+        with cls._lock:
+            if max_workers:
+                cls.max_workers = int(max_workers)
+                if cls._executor:
+                    # running downloads are finished by the old executor
+                    cls._executor.shutdown(wait=False)
+                    cls._executor = None
+            if max_downloads_per_host:
+                cls.max_downloads_per_host = int(max_downloads_per_host)
+            if time_budget is not None:
+                cls.time_budget = float(time_budget)
+
+    @classmethod
+    def get_executor(cls):
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=cls.max_workers, thread_name_prefix="fuji-data-download")
+            return cls._executor
+
+    @classmethod
+    def run_download(cls, host, download):
+        future, budget, context, func, args, kwargs = download
+        # a download cancelled while it was queued is not run
+        if not future.set_running_or_notify_cancel():
+            cls.release(host)
+            return
+        result, error = None, None
+        try:
+            budget.check()
+            result = context.run(func, *args, **kwargs)
+        except BaseException as e:
+            error = e
+        # the slot of the host is free before the result is passed on
+        cls.release(host)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    @classmethod
+    def release(cls, host):
+        """Passes the next queued download of host to the pool once one of its downloads has finished"""
+        with cls._lock:
+            state = cls._hosts[host]
+            while state["pending"] and state["pending"][0][0].cancelled():
+                state["pending"].popleft()
+            if state["pending"]:
+                download = state["pending"].popleft()
+            else:
+                download = None
+                state["running"] -= 1
+                if not state["running"]:
+                    del cls._hosts[host]
+        if download:
+            cls.get_executor().submit(cls.run_download, host, download)
+
+    @classmethod
+    def submit(cls, url, budget, func, *args, **kwargs):
+        """Schedules func(*args, **kwargs) as download of url, returns a Future"""
+        future = Future()
+        download = (future, budget, contextvars.copy_context(), func, args, kwargs)
+        host = HTTPTransport.get_host_key(url)
+        with cls._lock:
+            state = cls._hosts.setdefault(host, {"running": 0, "pending": deque()})
+            if state["running"] >= cls.max_downloads_per_host:
+                state["pending"].append(download)
+                return future
+            state["running"] += 1
+        cls.get_executor().submit(cls.run_download, host, download)
+        return future
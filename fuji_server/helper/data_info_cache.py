@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import re
+
+from fuji_server.helper.response_cache import ResponseCache
+
+
+class DataInfoCache:
+    """Process wide cache of the info DataHarvester gathers about data files (response headers, detected content
+    types, extracted text).
+
+    Entries are stored by resolved URL plus validators (ETag, length, Last-Modified) and are reachable by the
+    requested URL; callers revalidate them with a HEAD request before use. Inspection results are additionally
+    stored by the hash of the sampled bytes, so identical files at different URLs are only inspected once.
+    """
+
+    # fields of a fileinfo dict which depend on the response, the others are taken from the data link
+    response_fields = [
+        "status_code",
+        "verified",
+        "resolved_url",
+        "header_content_type",
+        "header_content_size",
+        "content_size",
+        "truncated",
+        "tika_content_type",
+        "tika_status",
+        "test_data_content_text",
+    ]
+    inspection_fields = ["tika_content_type", "tika_status", "test_data_content_text"]
+    # extracted text is only kept up to this length
+    max_text_size = 100000
+
+    url_cache = ResponseCache(max_size=50000000, ttl=86400)
+    content_cache = ResponseCache(max_size=50000000, ttl=86400)
+
+    @classmethod
+    def set_options(cls, max_size=None, ttl=None, max_text_size=None):
+        for cache in [cls.url_cache, cls.content_cache]:
+            if max_size is not None:
+                cache.max_size = int(max_size)
+            if ttl is not None:
+                cache.ttl = float(ttl)
+            cache.clear()
+        if max_text_size is not None:
+            cls.max_text_size = int(max_text_size)
+
+    @classmethod
+    def clear(cls):
+        cls.url_cache.clear()
+        cls.content_cache.clear()
+
+    @staticmethod
+    def get_validators(response):
+        """Returns (ETag, length of the whole file, Last-Modified) of a response, the length of a partial response
+        is taken from its Content-Range"""
+        headers = response.headers
+        length = headers.get("content-length")
+        range_match = re.match(r"bytes\s+[0-9]+-[0-9]+/([0-9]+)", str(headers.get("content-range")))
+        if range_match:
+            length = range_match[1]
+        return (headers.get("etag"), length, headers.get("last-modified"))
+
+    @staticmethod
+    def get_content_hash(content):
+        return hashlib.sha256(content).hexdigest()
+
+    @classmethod
+    def get_size(cls, info):
+        return len(str(info.get("test_data_content_text", ""))) + 1024
+
+    @classmethod
+    def truncate(cls, info):
+        info = {k: v for k, v in info.items() if v is not None}
+        if len(info.get("test_data_content_text", "")) > cls.max_text_size:
+            info["test_data_content_text"] = info["test_data_content_text"][: cls.max_text_size]
+        return info
+
+    @classmethod
+    def get(cls, url):
+        """Returns (validators, response related fileinfo) of url or None"""
+        cached = cls.url_cache.get(url)
+        if cached is None:
+            return None
+        return cached["validators"], cached["info"]
+
+    @classmethod
+    def set(cls, url, validators, fileinfo):
+        """Stores the response related fields of fileinfo, only if they can be revalidated by ETag or Last-Modified"""
+        etag, _length, last_modified = validators
+        if not (etag or last_modified):
+            return False
+        info = cls.truncate({k: fileinfo.get(k) for k in cls.response_fields})
+        resolved_url = info.get("resolved_url") or url
+        return cls.url_cache.set(
+            (resolved_url, *validators),
+            {"validators": tuple(validators), "info": info},
+            cls.get_size(info),
+            aliases=[url, resolved_url],
+        )
+
+    @classmethod
+    def get_inspection(cls, content_hash):
+        return cls.content_cache.get(content_hash)
+
+    @classmethod
+    def set_inspection(cls, content_hash, fileinfo):
+        info = cls.truncate({k: fileinfo.get(k) for k in cls.inspection_fields})
+        return cls.content_cache.set(content_hash, info, cls.get_size(info))
@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import logging
+import os
+import threading
+import time
+
+import requests
+
+import yaml
+from fuji_server.helper.http_transport import HTTPTransport
+from fuji_server.helper.preprocessor import Preprocessor
+
+
+class DataCiteRepositoryRefresher:
+    """Keeps the mapping of DataCite client ids to re3data DOIs (Preprocessor.re3repositories) up to date.
+
+    The mapping is persisted in data/repodois.yaml. A daemon thread started by start() checks the file every
+    check_interval seconds: if it is older than refresh_interval, all repositories are retrieved from the
+    DataCite API again, if it has been updated by another worker process it is reloaded. Only one refresh runs
+    at a time and the mapping is replaced as a whole, request handlers just read Preprocessor.re3repositories.
+    """
+
+    logger = logging.getLogger(__name__)
+    # seconds after which the mapping is retrieved from DataCite again (0 disables the online refresh)
+    refresh_interval = 86400
+    # seconds between two checks of the persisted mapping
+    check_interval = 3600
+    # timeout in seconds for each DataCite API request
+    timeout = 30
+    loaded_mtime = None
+    _refresh_lock = threading.Lock()
+    _thread = None
+    _stop_event = threading.Event()
+
+    @classmethod
+    def set_options(cls, refresh_interval=None, check_interval=None, timeout=None):
+        if refresh_interval is not None:
+            cls.refresh_interval = float(refresh_interval)
+        if check_interval is not None:
+            cls.check_interval = float(check_interval)
+        if timeout is not None:
+            cls.timeout = float(timeout)
+
+    @staticmethod
+    def get_path():
+        return os.path.join(Preprocessor.fuji_server_dir, "data", "repodois.yaml")
+
+    @classmethod
+    def load(cls):
+        """(Re)loads the persisted mapping"""
+        mtime = os.path.getmtime(cls.get_path())
+        Preprocessor.retrieve_datacite_re3repos()
+        cls.loaded_mtime = mtime
+
+    @classmethod
+    def is_stale(cls):
+        return cls.refresh_interval > 0 and time.time() - os.path.getmtime(cls.get_path()) >= cls.refresh_interval
+
+    @classmethod
+    def retrieve_repositories(cls):
+        """Returns all DataCite repositories with a re3data DOI as dict client id : re3data DOI"""
+        repositories = {}
+        url = Preprocessor.DATACITE_API_REPO
+        params = {"query": "re3data_id:*"}
+        while url:
+            response = HTTPTransport.get(url, params=params, headers=Preprocessor.header, timeout=cls.timeout)
+            response.raise_for_status()
+            raw = response.json()
+            for r in raw["data"]:
+                repositories[r["id"]] = r["attributes"]["re3data"]
+            # the next link already contains the query
+            url = raw.get("links", {}).get("next")
+            params = None
+        # fix wrong entry
+        repositories["bl.imperial"] = "http://doi.org/10.17616/R3K64N"
+        return repositories
+
+    @classmethod
+    def refresh(cls):
+        """Retrieves the mapping from DataCite, replaces the current one and persists it.
+        Returns False if another refresh is already running or the retrieval failed"""
+        if not cls._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            started = time.monotonic()
+            repositories = cls.retrieve_repositories()
+            # a complete new dict is assigned, readers either see the old or the new mapping
+            Preprocessor.re3repositories = repositories
+            path = cls.get_path()
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                yaml.dump(repositories, f)
+            os.replace(tmp_path, path)
+            cls.loaded_mtime = os.path.getmtime(path)
+            cls.logger.info(
+                f"Updated re3data DOIs of DataCite repositories -: {len(repositories)} in {time.monotonic() - started:.1f}s"
+            )
+            return True
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError, OSError) as e:
+            cls.logger.error(f"Could not update re3data DOIs of DataCite repositories -: {e}")
+            try:
+                # postpones the next attempt (also of other workers) by refresh_interval
+                os.utime(cls.get_path())
+            except OSError:
+                pass
+            return False
+        finally:
+            cls._refresh_lock.release()
+
+    @classmethod
+    def check(cls):
+        try:
+            if cls.is_stale():
+                cls.refresh()
+            elif os.path.getmtime(cls.get_path()) != cls.loaded_mtime:
+                cls.load()
+        except (OSError, yaml.YAMLError) as e:
+            cls.logger.error(f"Could not load re3data DOIs of DataCite repositories -: {e}")
+
+    @classmethod
+    def run(cls):
+        cls.check()
+        while not cls._stop_event.wait(cls.check_interval):
+            cls.check()
+
+    @classmethod
+    def start(cls):
+        """Loads the persisted mapping and starts the background refresh (once per process)"""
+        cls.load()
+        if cls._thread is None or not cls._thread.is_alive():
+            cls._stop_event.clear()
+            cls._thread = threading.Thread(target=cls.run, name="datacite-repository-refresher", daemon=True)
+            cls._thread.start()
+
+    @classmethod
+    def stop(cls):
+        cls._stop_event.set()
@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import contextlib
+import contextvars
+import threading
+import time
+
+import requests
+
+
+class TimeBudgetExceededError(requests.exceptions.Timeout):
+    """Raised instead of sending a request after the time budget of the assessment has run out"""
+
+
+class Deadline:
+    """Overall time budget of one assessment.
+
+    The deadline is created when the assessment is requested and is passed to FAIRCheck and the harvesters,
+    which skip optional harvesting steps once it has expired. While activate() is in effect it is also the
+    current deadline of the thread (and of the concurrent tasks started by it), which HTTPTransport uses to
+    cap the timeout of each request to the remaining budget and to refuse requests after the deadline.
+    """
+
+    # seconds an assessment may take (0 disables the time budget)
+    time_budget = 0
+
+    _current = contextvars.ContextVar("fuji_deadline", default=None)
+
+    @classmethod
+    def set_options(cls, time_budget=None):
+        if time_budget is not None:
+            cls.time_budget = float(time_budget)
+
+    @classmethod
+    def for_assessment(cls):
+        """Returns a new deadline which expires after the configured time budget"""
+        return cls(cls.time_budget or None)
+
+    @classmethod
+    def get_current(cls):
+        """Returns the deadline activated for the running assessment, an unlimited one if there is none"""
+        deadline = cls._current.get()
+        if deadline is None:
+            return cls()
+        return deadline
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds if seconds else None
+        self._lock = threading.Lock()
+        self._reported = set()
+
+    @contextlib.contextmanager
+    def activate(self):
+        token = self._current.set(self)
+        try:
+            yield self
+        finally:
+            self._current.reset(token)
+
+    def remaining(self):
+        if self.expires is None:
+            return float("inf")
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def get_timeout(self, timeout=None):
+        """Returns timeout (seconds) capped to the remaining budget"""
+        if self.expires is None:
+            return timeout
+        if timeout is None:
+            return self.remaining()
+        return min(timeout, self.remaining())
+
+    def check(self, url=None):
+        """Raises TimeBudgetExceededError if the deadline has expired"""
+        if self.expired():
+            raise TimeBudgetExceededError(f"Time budget of {self.seconds:.0f}s exceeded, request skipped -: {url}")
+
+    def is_first_report(self, metric_id):
+        """True only the first time for metric_id, so that each affected metric is marked once"""
+        with self._lock:
+            if metric_id in self._reported:
+                return False
+            self._reported.add(metric_id)
+            return True
+
+    def skip(self, logger, metric_id, step):
+        """Returns True if the deadline has expired, the first skipped step of each metric_id is logged"""
+        if not self.expired():
+            return False
+        if self.is_first_report(metric_id):
+            logger.warning(f"{metric_id} : Time budget exceeded, skipped {step}")
+        return True
@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class EvaluationQueueFullError(Exception):
+    """Raised if no further evaluation can be accepted since all workers are busy and the queue is full"""
+
+
+class EvaluationExecutor:
+    """Process wide, bounded thread pool which runs the (blocking) evaluations off the ASGI event loop.
+
+    At most max_workers evaluations run in parallel, further max_queue_size evaluations wait for a free worker,
+    any additional evaluation is rejected with an EvaluationQueueFullError.
+    """
+
+    max_workers = 4
+    max_queue_size = 16
+    # seconds clients are asked to wait before retrying a rejected evaluation
+    retry_after = 30
+
+    _executor = None
+    _lock = threading.Lock()
+    _pending = 0
+
+    @classmethod
+    def set_options(cls, max_workers=None, max_queue_size=None, retry_after=None):
+        with cls._lock:
+            if max_workers:
+                cls.max_workers = int(max_workers)
+                if cls._executor:
+                    # running evaluations are finished by the old executor
+                    cls._executor.shutdown(wait=False)
+                    cls._executor = None
+            if max_queue_size is not None:
+                cls.max_queue_size = int(max_queue_size)
+            if retry_after is not None:
+                cls.retry_after = int(retry_after)
+
+    @classmethod
+    def get_executor(cls):
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=cls.max_workers, thread_name_prefix="fuji-evaluation")
+            return cls._executor
+
+    @classmethod
+    def get_pending(cls):
+        # number of running and queued evaluations
+        return cls._pending
+
+    @classmethod
+    def get_queue_depth(cls):
+        return max(0, cls._pending - cls.max_workers)
+
+    @classmethod
+    def _release(cls, future):
+        with cls._lock:
+            cls._pending -= 1
+
+    @classmethod
+    def submit(cls, func, *args, **kwargs):
+        executor = cls.get_executor()
+        with cls._lock:
+            if cls._pending >= cls.max_workers + cls.max_queue_size:
+                raise EvaluationQueueFullError(
+                    f"{cls._pending} evaluations are pending, maximum is {cls.max_workers + cls.max_queue_size}"
+                )
+            cls._pending += 1
+        try:
+            future = executor.submit(func, *args, **kwargs)
+        except Exception:
+            cls._release(None)
+            raise
+        # the slot is released when the evaluation has finished, even if the client is gone already
+        future.add_done_callback(cls._release)
+        return future
+
+    @classmethod
+    async def run(cls, func, *args, **kwargs):
+        return await asyncio.wrap_future(cls.submit(func, *args, **kwargs))
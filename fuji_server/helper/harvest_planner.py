@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+
+class HarvestPlanner:
+    """Works out which optional harvesting stages the loaded metrics actually need.
+
+    Metadata (embedded and external) is always harvested, but the re3data lookup, the harvesting through the
+    GitHub API and the retrieval of data files only fill single attributes of the fuji instance. A stage is
+    planned if the evaluator of at least one loaded metric reads its attribute (see FAIREvaluator.inputs),
+    otherwise it is skipped. Evaluators which don't declare their inputs are assumed to read all of them.
+    """
+
+    # optional harvesting stage: description and the attribute of the fuji instance it fills
+    stages = {
+        "re3data": ("re3data repository lookup", "repo_helper"),
+        "github": ("harvesting through Github API", "github_data"),
+        "data": ("data file harvesting", "content_identifier"),
+    }
+
+    def __init__(self, evaluator_classes, metrics, metric_version):
+        """
+        Parameters
+        ----------
+        evaluator_classes : list<type>
+            FAIREvaluator classes of all checks
+        metrics : dict
+            The loaded metrics by metric identifier
+        metric_version : str
+            Version of the loaded metrics, e.g. '0.5'
+        """
+        # metric ids of the loaded metrics whose evaluators are known
+        self.metrics = []
+        # stage: loaded metric ids whose evaluators read what it harvests
+        self.consumers = {stage: [] for stage in self.stages}
+        for evaluator_class in evaluator_classes:
+            # like FAIREvaluator.set_metric, the first loaded metric of the evaluator is evaluated
+            metric_id = next((m for m in evaluator_class.get_metric_identifiers(metric_version) if m in metrics), None)
+            if metric_id is None:
+                continue
+            self.metrics.append(metric_id)
+            for stage, (_description, attribute) in self.stages.items():
+                if evaluator_class.inputs is None or attribute in evaluator_class.inputs:
+                    self.consumers[stage].append(metric_id)
+
+    def is_planned(self, stage):
+        return bool(self.consumers.get(stage))
+
+    def get_report(self):
+        """Returns the skipped stages and why, one line each"""
+        return [
+            f"Harvest plan, skipped {description} -: none of the loaded metrics reads {attribute}"
+            for stage, (description, attribute) in self.stages.items()
+            if not self.is_planned(stage)
+        ]
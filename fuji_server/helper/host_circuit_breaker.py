@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+
+
+class HostUnavailableError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request to a host which recently could not be connected"""
+
+    def __init__(self, host, retry_in, *args, **kwargs):
+        super().__init__(f"Host unavailable, requests are skipped for {retry_in:.0f}s -: {host}", *args, **kwargs)
+        self.host = host
+
+
+class HostCircuitBreaker:
+    """Process wide circuit breaker which stops requests to hosts that are down or can't be resolved (DNS).
+
+    After failure_threshold consecutive connection errors of a host (refused, DNS failure, connect timeout..)
+    all requests to it fail immediately with HostUnavailableError for cooldown seconds. Then a single request
+    is let through to probe the host (half-open), if it succeeds the host is available again, if not the
+    cooldown starts again.
+    """
+
+    failure_threshold = 2
+    # seconds requests to an unavailable host fail fast (0 disables the circuit breaker)
+    cooldown = 60
+
+    _lock = threading.Lock()
+    _hosts = {}  # host: {'failures', 'opened_at', 'probing', 'reported'}
+
+    @classmethod
+    def set_options(cls, failure_threshold=None, cooldown=None):
+        with cls._lock:
+            if failure_threshold:
+                cls.failure_threshold = int(failure_threshold)
+            if cooldown is not None:
+                cls.cooldown = float(cooldown)
+            cls._hosts = {}
+
+    @staticmethod
+    def is_host_down(error):
+        """True if error means the host could not be connected (refused, DNS failure, connect timeout), other
+        connection errors (e.g. SSL errors, broken connections) mean the host has been reached"""
+        if isinstance(error, requests.exceptions.SSLError | requests.exceptions.ProxyError):
+            return False
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason = error.args[0] if error.args else None
+        reason = getattr(reason, "reason", reason)
+        return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+    @staticmethod
+    def get_host(url):
+        return urlparse(url).netloc.lower()
+
+    @classmethod
+    def before_request(cls, url):
+        """Raises HostUnavailableError if requests to the host of url currently fail fast"""
+        if cls.cooldown <= 0:
+            return
+        host = cls.get_host(url)
+        with cls._lock:
+            state = cls._hosts.get(host)
+            if state is None or state["opened_at"] is None:
+                return
+            retry_in = state["opened_at"] + cls.cooldown - time.monotonic()
+            if retry_in <= 0 and not state["probing"]:
+                # half-open: this request probes the host
+                state["probing"] = True
+                return
+        raise HostUnavailableError(host, max(retry_in, 0))
+
+    @classmethod
+    def record_success(cls, url):
+        host = cls.get_host(url)
+        with cls._lock:
+            cls._hosts.pop(host, None)
+
+    @classmethod
+    def record_failure(cls, url):
+        if cls.cooldown <= 0:
+            return
+        host = cls.get_host(url)
+        with cls._lock:
+            state = cls._hosts.setdefault(host, {"failures": 0, "opened_at": None, "probing": False, "reported": set()})
+            state["failures"] += 1
+            if state["probing"] or state["failures"] >= cls.failure_threshold:
+                if state["opened_at"] is None:
+                    state["reported"] = set()
+                state["opened_at"] = time.monotonic()
+                state["probing"] = False
+
+    @classmethod
+    def is_available(cls, url):
+        with cls._lock:
+            state = cls._hosts.get(cls.get_host(url))
+            return state is None or state["opened_at"] is None
+
+    @classmethod
+    def is_first_report(cls, logger, metric_id, host):
+        """True only for the first request of an evaluation (logger) and metric which failed fast for host,
+        so that an unavailable host is reported once per metric instead of for each request"""
+        while isinstance(logger, logging.LoggerAdapter):
+            logger = logger.logger
+        with cls._lock:
+            state = cls._hosts.get(host)
+            if state is None:
+                return True
+            report_key = (id(logger), metric_id)
+            if report_key in state["reported"]:
+                return False
+            state["reported"].add(report_key)
+            return True
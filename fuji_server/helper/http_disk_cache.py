@@ -0,0 +1,215 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from fuji_server.helper.metadata_collector import MetadataFormats
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPDiskCache:
+    """Persistent SQLite cache of content negotiation responses which survives server restarts.
+
+    Stored responses are revalidated with conditional requests (If-None-Match / If-Modified-Since) using
+    the ETag and Last-Modified validators of the original response, a 304 response reuses the stored body
+    and its parsed form. Responses younger than max_age are used without revalidation, responses which are
+    at most stale_while_revalidate seconds older than that are used immediately and revalidated in the background.
+    If the database grows beyond max_size bytes, least recently used responses are removed.
+    """
+
+    def __init__(self, path, max_size=1000000000, max_age=0, stale_while_revalidate=0):
+        self.path = path
+        self.max_size = int(max_size)
+        self.max_age = float(max_age)
+        self.stale_while_revalidate = float(stale_while_revalidate)
+        self._lock = threading.Lock()
+        self._revalidating = set()
+        self._local = threading.local()
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT, etag TEXT, last_modified TEXT, "
+                "entry TEXT, body BLOB, size INTEGER, stored_at REAL, accessed_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            # running total of the sizes, kept up to date by triggers for all processes using the database
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO cache_size VALUES (0, (SELECT COALESCE(SUM(size), 0) FROM responses))"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses "
+                "BEGIN UPDATE cache_size SET total = total + NEW.size; END"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses "
+                "BEGIN UPDATE cache_size SET total = total - OLD.size; END"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_update AFTER UPDATE OF size ON responses "
+                "BEGIN UPDATE cache_size SET total = total + NEW.size - OLD.size; END"
+            )
+            connection.commit()
+            self.total_size = self._get_total_size(connection)
+
+    def _get_connection(self):
+        # sqlite connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _get_total_size(connection):
+        return connection.execute("SELECT total FROM cache_size").fetchone()[0]
+
+    @staticmethod
+    def get_key(key):
+        return hashlib.sha256(json.dumps(key, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Returns the stored response entry (dict) incl. validators and its age in seconds or None"""
+        cache_key = self.get_key(key)
+        with self._lock:
+            connection = self._get_connection()
+            row = connection.execute(
+                "SELECT etag, last_modified, entry, body, stored_at FROM responses WHERE key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), cache_key))
+            connection.commit()
+        etag, last_modified, entry, body, stored_at = row
+        entry = json.loads(entry)
+        if entry.get("format"):
+            entry["format"] = MetadataFormats[entry["format"]]
+        entry["response_content"] = body
+        if entry.pop("parse_response_is_content", False):
+            entry["parse_response"] = body
+        entry["response_header"] = [tuple(header) for header in entry.get("response_header") or []]
+        entry["redirect_status_list"] = [tuple(status) for status in entry.get("redirect_status_list") or []]
+        entry["etag"] = etag
+        entry["last_modified"] = last_modified
+        entry["age"] = time.time() - stored_at
+        return entry
+
+    def is_fresh(self, entry):
+        return entry.get("age", 0) <= self.max_age
+
+    def is_stale_usable(self, entry):
+        return entry.get("age", 0) <= self.max_age + self.stale_while_revalidate
+
+    def get_conditional_headers(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry.get("etag")
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry.get("last_modified")
+        return headers
+
+    def set(self, key, entry, etag=None, last_modified=None):
+        entry = dict(entry)
+        body = entry.pop("response_content", None)
+        parse_response = entry.get("parse_response")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+            if isinstance(parse_response, str):
+                parse_response = parse_response.encode("utf-8")
+        if parse_response is not None and parse_response == body:
+            entry["parse_response"] = None
+            entry["parse_response_is_content"] = True
+        elif parse_response is not None and not isinstance(parse_response, dict | list):
+            # only JSON compatible parse results are stored, everything else is parsed from the body again
+            return False
+        if isinstance(entry.get("format"), MetadataFormats):
+            entry["format"] = entry["format"].name
+        try:
+            entry = json.dumps(entry)
+        except (TypeError, ValueError):
+            return False
+        size = len(entry) + len(body or b"")
+        if size > self.max_size:
+            return False
+        now = time.time()
+        with self._lock:
+            connection = self._get_connection()
+            cache_key = self.get_key(key)
+            # an upsert instead of INSERT OR REPLACE, whose implicit delete would not fire the delete trigger
+            connection.execute(
+                "INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "url = excluded.url, etag = excluded.etag, last_modified = excluded.last_modified, "
+                "entry = excluded.entry, body = excluded.body, size = excluded.size, stored_at = excluded.stored_at, "
+                "accessed_at = excluded.accessed_at",
+                (cache_key, str(key[0]), etag, last_modified, entry, body, size, now, now),
+            )
+            # other processes (server workers) write to the same database, so the size is read from it
+            self.total_size = self._get_total_size(connection)
+            connection.commit()
+            if self.total_size > self.max_size:
+                self._collect_garbage(connection)
+        return True
+
+    def refresh(self, key, etag=None, last_modified=None):
+        # a 304 response confirmed the stored response, so it is fresh again
+        now = time.time()
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (now, now, etag, last_modified, self.get_key(key)),
+            )
+            connection.commit()
+
+    def _collect_garbage(self, connection):
+        # remove least recently used responses until the cache is at 90% of its maximum size
+        removed_keys = []
+        for cache_key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if self.total_size <= self.max_size * 0.9:
+                break
+            removed_keys.append((cache_key,))
+            self.total_size -= size
+        connection.executemany("DELETE FROM responses WHERE key = ?", removed_keys)
+        self.total_size = self._get_total_size(connection)
+        connection.commit()
+
+    def start_revalidation(self, key, revalidate):
+        """Runs revalidate() in a background thread, but only once at a time for each key"""
+        cache_key = self.get_key(key)
+        with self._lock:
+            if cache_key in self._revalidating:
+                return False
+            self._revalidating.add(cache_key)
+
+        def run():
+            try:
+                revalidate()
+            except Exception as e:
+                logger.warning(f"Background revalidation failed -: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(cache_key)
+
+        threading.Thread(target=run, daemon=True).start()
+        return True
+
+    def clear(self):
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("DELETE FROM responses")
+            connection.commit()
+            self.total_size = 0
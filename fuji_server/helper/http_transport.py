@@ -0,0 +1,197 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import ssl
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from fuji_server.helper.deadline import Deadline, TimeBudgetExceededError
+from fuji_server.helper.host_circuit_breaker import HostCircuitBreaker
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+class FUJIHTTPAdapter(HTTPAdapter):
+    """A requests adapter which uses the lenient SSL settings F-UJI always used for harvesting,
+    many repositories still run outdated TLS setups or self signed certificates"""
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        context = ssl._create_unverified_context()
+        context.set_ciphers("DEFAULT@SECLEVEL=1")
+        pool_kwargs["ssl_context"] = context
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+    def send(self, request, **kwargs):
+        # every request incl. redirects passes the circuit breaker of its host
+        HostCircuitBreaker.before_request(request.url)
+        try:
+            response = super().send(request, **kwargs)
+        except requests.exceptions.ConnectionError as e:
+            if HostCircuitBreaker.is_host_down(e):
+                HostCircuitBreaker.record_failure(request.url)
+            else:
+                HostCircuitBreaker.record_success(request.url)
+            raise
+        except Exception:
+            # the host has been reached (e.g. read timeout)
+            HostCircuitBreaker.record_success(request.url)
+            raise
+        HostCircuitBreaker.record_success(request.url)
+        return response
+
+
+class HTTPTransport:
+    """Process wide, thread safe HTTP transport with per host connection pools and keep-alive.
+
+    All harvesting requests share the connection pools of one adapter, so repeated requests to the
+    same host (doi.org, the landing page host, datacite..) reuse already established TCP/TLS connections.
+    Each call to get_session() returns a fresh requests.Session (own cookie jar) on top of the shared pools.
+    """
+
+    # number of hosts for which connection pools are kept
+    pool_size = 20
+    # number of kept-alive connections per host
+    pool_per_host = 10
+    # if True, the number of connections per host is strictly limited to pool_per_host
+    pool_block = False
+    # seconds after which the connections to an idle host are closed
+    pool_idle_timeout = 30
+    # maximum number of concurrent requests per host (0 = unlimited), protects partner repositories
+    # from too many parallel requests by concurrent harvesting steps. A slot is held until the response headers
+    # are received, the body of streamed responses (stream=True, e.g. data downloads) is read outside of it.
+    max_requests_per_host = 4
+    user_agent = "F-UJI"
+
+    _adapter = None
+    _lock = threading.Lock()
+    _host_last_used = {}
+    _host_semaphores = {}
+
+    @classmethod
+    def set_pool_options(
+        cls, pool_size=None, pool_per_host=None, pool_block=None, pool_idle_timeout=None, max_requests_per_host=None
+    ):
+        with cls._lock:
+            if max_requests_per_host is not None:
+                cls.max_requests_per_host = int(max_requests_per_host)
+                cls._host_semaphores = {}
+            if pool_size:
+                cls.pool_size = int(pool_size)
+            if pool_per_host:
+                cls.pool_per_host = int(pool_per_host)
+            if pool_block is not None:
+                cls.pool_block = bool(pool_block)
+            if pool_idle_timeout is not None:
+                cls.pool_idle_timeout = float(pool_idle_timeout)
+            # pools are re-created with the new settings on next use
+            if cls._adapter:
+                cls._adapter.close()
+            cls._adapter = None
+            cls._host_last_used = {}
+
+    @classmethod
+    def get_adapter(cls):
+        with cls._lock:
+            if cls._adapter is None:
+                cls._adapter = FUJIHTTPAdapter(
+                    pool_connections=cls.pool_size, pool_maxsize=cls.pool_per_host, pool_block=cls.pool_block
+                )
+            return cls._adapter
+
+    @classmethod
+    def get_session(cls):
+        adapter = cls.get_adapter()
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.verify = False
+        session.headers["User-Agent"] = cls.user_agent
+        return session
+
+    @classmethod
+    def close_idle_pools(cls, url=None):
+        # drop connection pools of hosts which have not been used for longer than pool_idle_timeout
+        now = time.monotonic()
+        adapter = cls.get_adapter()
+        with cls._lock:
+            idle_hosts = [
+                host for host, last_used in cls._host_last_used.items() if now - last_used > cls.pool_idle_timeout
+            ]
+            for host in idle_hosts:
+                del cls._host_last_used[host]
+                cls._host_semaphores.pop(host, None)
+                for pool_key in list(adapter.poolmanager.pools.keys()):
+                    if (pool_key.key_scheme, pool_key.key_host, pool_key.key_port) == host:
+                        try:
+                            del adapter.poolmanager.pools[pool_key]
+                        except KeyError:
+                            pass
+            if url:
+                cls._host_last_used[cls.get_host_key(url)] = now
+
+    @staticmethod
+    def get_host_key(url):
+        parsed = urlparse(url)
+        port = parsed.port
+        if not port:
+            port = 443 if parsed.scheme == "https" else 80
+        return (parsed.scheme, parsed.hostname, port)
+
+    @classmethod
+    def get_host_semaphore(cls, url):
+        if cls.max_requests_per_host <= 0:
+            return None
+        host = cls.get_host_key(url)
+        with cls._lock:
+            if host not in cls._host_semaphores:
+                cls._host_semaphores[host] = threading.BoundedSemaphore(cls.max_requests_per_host)
+            return cls._host_semaphores[host]
+
+    @classmethod
+    def request(cls, method, url, session=None, **kwargs):
+        # requests of an assessment must not take longer than its remaining time budget
+        deadline = Deadline.get_current()
+        deadline.check(url)
+        cls.close_idle_pools(url)
+        if session is None:
+            session = cls.get_session()
+        kwargs.setdefault("verify", False)
+        timeout = kwargs.get("timeout")
+        host_semaphore = cls.get_host_semaphore(url)
+        if host_semaphore:
+            # waiting for a free slot of the host counts against the time budget as well
+            remaining = deadline.remaining()
+            if not host_semaphore.acquire(timeout=None if remaining == float("inf") else remaining):
+                raise TimeBudgetExceededError(f"Time budget exceeded waiting for a free request slot -: {url}")
+            try:
+                deadline.check(url)
+                kwargs["timeout"] = deadline.get_timeout(timeout)
+                response = session.request(method, url, **kwargs)
+            finally:
+                host_semaphore.release()
+        else:
+            kwargs["timeout"] = deadline.get_timeout(timeout)
+            response = session.request(method, url, **kwargs)
+        with cls._lock:
+            now = time.monotonic()
+            # the pools (and slots) of hosts are only dropped after they have been idle since the last response
+            cls._host_last_used[cls.get_host_key(url)] = now
+            if response.history:
+                # also keep track of the host we have been redirected to
+                cls._host_last_used[cls.get_host_key(response.url)] = now
+        return response
+
+    @classmethod
+    def get(cls, url, session=None, **kwargs):
+        return cls.request("GET", url, session=session, **kwargs)
+
+    @classmethod
+    def head(cls, url, session=None, **kwargs):
+        kwargs.setdefault("allow_redirects", True)
+        return cls.request("HEAD", url, session=session, **kwargs)
@@ -11,6 +11,7 @@ import idutils
 
 from fuji_server.helper.preprocessor import Preprocessor
 from fuji_server.helper.request_helper import AcceptTypes, RequestHelper
+from fuji_server.helper.resolver_cache import ResolverCache
 
 
 class IdentifierHelper:
@@ -252,6 +253,12 @@ class IdentifierHelper:
     def get_resolved_url(self, pid_collector={}):
         candidate_pid = self.identifier_url
         if candidate_pid not in pid_collector or not pid_collector:
+            # PIDs resolved before (by any evaluation) need no request
+            resolution = ResolverCache.get(candidate_pid, AcceptTypes.default.value)
+            if resolution and resolution["status"] == 200:
+                return resolution["url"]
+            elif resolution and resolution["status"] >= 400:
+                return None
             try:
                 requestHelper = RequestHelper(candidate_pid, self.logger)
                 requestHelper.setAcceptType(AcceptTypes.default)  # request
@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import re
+import threading
+
+from pyld import jsonld
+
+from fuji_server.helper.http_transport import HTTPTransport
+from fuji_server.helper.response_cache import ResponseCache
+
+
+class JsonLdDocumentLoader:
+    """pyld document loader which serves JSON-LD contexts bundled with F-UJI (e.g. schema.org) from disk
+    and keeps all other remote contexts in a bounded in-memory cache for ttl seconds.
+
+    install() makes it the default document loader of pyld for the whole process.
+    """
+
+    fuji_server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # normalised context URL (see get_context_key) : file in the data directory
+    bundled_contexts = {
+        "schema.org": "jsonldcontext.json",
+        "schema.org/docs/jsonldcontext.json": "jsonldcontext.json",
+        "schema.org/docs/jsonldcontext.jsonld": "jsonldcontext.json",
+    }
+    # timeout in seconds for the retrieval of a remote context
+    timeout = 10
+    context_cache = ResponseCache(max_size=10000000, ttl=86400)
+    _bundled_documents = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def set_options(cls, max_size=None, ttl=None, timeout=None):
+        if max_size is not None or ttl is not None:
+            cls.context_cache = ResponseCache(
+                max_size=cls.context_cache.max_size if max_size is None else max_size,
+                ttl=cls.context_cache.ttl if ttl is None else ttl,
+            )
+        if timeout is not None:
+            cls.timeout = float(timeout)
+
+    @classmethod
+    def install(cls):
+        jsonld.set_document_loader(cls.load_document)
+
+    @staticmethod
+    def get_context_key(url):
+        key = str(url).strip().lower().split("#")[0]
+        for prefix in ("https://", "http://", "www."):
+            if key.startswith(prefix):
+                key = key[len(prefix) :]
+        return key.rstrip("/")
+
+    @classmethod
+    def get_bundled_document(cls, url):
+        """Returns the content of a bundled context file as string or None if the context is not bundled"""
+        file_name = cls.bundled_contexts.get(cls.get_context_key(url))
+        if not file_name:
+            return None
+        with cls._lock:
+            if file_name not in cls._bundled_documents:
+                with open(os.path.join(cls.fuji_server_dir, "data", file_name), encoding="utf-8") as f:
+                    cls._bundled_documents[file_name] = f.read()
+            return cls._bundled_documents[file_name]
+
+    @classmethod
+    def get_remote_document(cls, url, headers=None):
+        cache_key = cls.get_context_key(url)
+        cached = cls.context_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        if not headers:
+            headers = {"Accept": "application/ld+json, application/json"}
+        response = HTTPTransport.get(url, headers=headers, timeout=cls.timeout)
+        response.raise_for_status()
+        content_type = response.headers.get("content-type") or "application/octet-stream"
+        alternate = response.links.get("alternate") or {}
+        if alternate.get("type") == "application/ld+json" and not re.match(r"^application\/(\w*\+)?json", content_type):
+            # e.g. https://schema.org points to its JSON-LD context this way
+            response = HTTPTransport.get(
+                jsonld.prepend_base(response.url, alternate.get("url")), headers=headers, timeout=cls.timeout
+            )
+            response.raise_for_status()
+            content_type = "application/ld+json"
+        context_url = None
+        if "application/ld+json" not in content_type:
+            context_url = (response.links.get(jsonld.LINK_HEADER_REL) or {}).get("url")
+        # validates the JSON, the text is cached since pyld may modify the parsed document
+        json.loads(response.text)
+        cached = {
+            "contentType": content_type,
+            "contextUrl": context_url,
+            "documentUrl": response.url,
+            "text": response.text,
+        }
+        cls.context_cache.set(cache_key, cached, len(response.text), aliases=[cls.get_context_key(response.url)])
+        return cached
+
+    @classmethod
+    def load_document(cls, url, options={}):
+        """Retrieves the JSON-LD document (context) at the given URL, returns a pyld RemoteDocument"""
+        try:
+            bundled = cls.get_bundled_document(url)
+            if bundled is not None:
+                # bundled contexts never change, the 'static' tag allows pyld to keep the resolved context
+                return {
+                    "contentType": "application/ld+json",
+                    "contextUrl": None,
+                    "documentUrl": url,
+                    "document": json.loads(bundled),
+                    "tag": "static",
+                }
+            remote = cls.get_remote_document(url, options.get("headers"))
+            return {
+                "contentType": remote.get("contentType"),
+                "contextUrl": remote.get("contextUrl"),
+                "documentUrl": remote.get("documentUrl"),
+                "document": json.loads(remote.get("text")),
+            }
+        except jsonld.JsonLdError:
+            raise
+        except Exception as e:
+            raise jsonld.JsonLdError(
+                "Could not retrieve a JSON-LD document from the URL.",
+                "jsonld.LoadDocumentError",
+                {"url": url},
+                code="loading document failed",
+                cause=e,
+            )
@@ -2,14 +2,145 @@
 #
 # SPDX-License-Identifier: MIT
 
+import functools
 import json
 import os
 import re
+import threading
+from collections import OrderedDict
 
 from tldextract import extract
 
 
+@functools.lru_cache(maxsize=10000)
+def extract_host(host):
+    return extract(host)
+
+
+class LinkedVocabIRIIndex:
+    """Precompiled form of a linked vocab index which resolves IRIs to their vocab entries.
+
+    For each domain/subdomain it keeps the namespaces for exact matches, the distinct path prefixes of the
+    uri patterns with the positions of their entries and the precompiled pattern regexes. An IRI is only
+    tested with the regexes of entries whose path prefix is contained in its path, and the host is only
+    extracted once per host name. Results are kept in a bounded LRU cache.
+    """
+
+    def __init__(self, linked_vocab_index, max_cached=100000):
+        self.hosts = {}
+        for domain, subdomains in linked_vocab_index.items():
+            for subdomain, entries in subdomains.items():
+                self.hosts[(domain, subdomain)] = self.compile_host_entries(entries)
+        self.max_cached = max_cached
+        self._cached = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def compile_host_entries(entries):
+        compiled_entries = []
+        compiled_regexes = {}
+        namespaces = {}
+        prefixes = {}
+        namespace_prefixes = {}
+        for position, reg_res in enumerate(entries):
+            namespaces[reg_res.get("namespace")] = position
+            comb_regex = None
+            pattern = reg_res.get("pattern")
+            if pattern:
+                prefix = pattern.split("$1")[0]
+                prefixes.setdefault(prefix, []).append(position)
+                namespace_prefixes.setdefault(prefix.rstrip("/#"), []).append(position)
+                if reg_res.get("regex"):
+                    comb_regex = reg_res.get("regex").lstrip("^").rstrip("$")
+                else:
+                    comb_regex = pattern.replace("?", r"\?").split("$1")[0].rstrip("/#")
+                if comb_regex not in compiled_regexes:
+                    try:
+                        compiled_regexes[comb_regex] = re.compile(comb_regex)
+                    except re.error:
+                        # invalid patterns can not match
+                        compiled_regexes[comb_regex] = None
+            compiled_entries.append((reg_res, comb_regex, compiled_regexes.get(comb_regex)))
+        return {
+            "entries": compiled_entries,
+            "namespaces": namespaces,
+            "prefixes": list(prefixes.items()),
+            "namespace_prefixes": list(namespace_prefixes.items()),
+        }
+
+    @staticmethod
+    def split_iri(iri):
+        # same as linked_vocab_helper.split_iri, but domain parts are only extracted once per host
+        if "://" in iri:
+            domainparts = extract_host(re.split(r"[/?#]", iri.split("://", 1)[1], maxsplit=1)[0])
+        else:
+            domainparts = extract(iri)
+        domain, subdomain, path = None, None, None
+        if domainparts.suffix:
+            domain = domainparts.domain + "." + domainparts.suffix
+            if domainparts.domain:
+                subdomain = domainparts.subdomain or "www"
+        if domainparts.domain and domainparts.suffix:
+            path = iri.split(domainparts.domain + "." + domainparts.suffix)[1]
+        return domain, subdomain, path
+
+    def lookup(self, iri, isnamespaceIRI=False):
+        iri = iri.strip()
+        if isnamespaceIRI:
+            iri = iri.rstrip("/#")
+        key = (iri, isnamespaceIRI)
+        with self._lock:
+            if key in self._cached:
+                self._cached.move_to_end(key)
+                return self._cached[key]
+        found = self.find(iri, isnamespaceIRI)
+        with self._lock:
+            self._cached[key] = found
+            if len(self._cached) > self.max_cached:
+                self._cached.popitem(last=False)
+        return found
+
+    def find(self, iri, isnamespaceIRI=False):
+        domain, subdomain, path = self.split_iri(iri)
+        host = self.hosts.get((domain, subdomain))
+        if not host:
+            return None
+        # the last matching entry wins, entries with the IRI as namespace always match
+        best_position = host["namespaces"].get(iri, -1)
+        candidates = []
+        if path is not None:
+            if isnamespaceIRI:
+                stripped_path = path.rstrip("/#")
+                for prefix, positions in host["namespace_prefixes"]:
+                    if prefix in stripped_path:
+                        candidates.extend(positions)
+            else:
+                for prefix, positions in host["prefixes"]:
+                    if prefix in path:
+                        candidates.extend(positions)
+        # as in the unindexed lookup each distinct regex is only tested once, entries sharing an already tested
+        # regex match if the most recently tested regex matched
+        tested_regexes = set()
+        comb_match = None
+        for position in sorted(candidates):
+            reg_res, comb_regex, compiled_regex = host["entries"][position]
+            if reg_res.get("namespace") == iri:
+                continue
+            if comb_regex not in tested_regexes:
+                tested_regexes.add(comb_regex)
+                comb_match = compiled_regex.search(path) if compiled_regex else None
+            if comb_match and position > best_position:
+                best_position = position
+        if best_position >= 0:
+            return host["entries"][best_position][0]
+        return None
+
+
 class linked_vocab_helper:
+    # LinkedVocabIRIIndex of the recently used linked vocab indexes, key: id of the index
+    iri_indexes = {}
+    max_iri_indexes = 4
+    _iri_index_lock = threading.Lock()
     fuji_server_dir = os.path.dirname(os.path.dirname(__file__))  # project_root
 
     def __init__(self, linked_vocab_index={}):
@@ -114,58 +245,25 @@ class linked_vocab_helper:
                 result += char
         return len(result)
 
+    def get_iri_index(self):
+        with self._iri_index_lock:
+            linked_vocab_index, size, iri_index = self.iri_indexes.get(id(self.linked_vocab_index), (None, 0, None))
+            if linked_vocab_index is not self.linked_vocab_index or size != len(self.linked_vocab_index):
+                iri_index = LinkedVocabIRIIndex(self.linked_vocab_index)
+                # the index is referenced as well to make sure its id is not reused
+                self.iri_indexes[id(self.linked_vocab_index)] = (
+                    self.linked_vocab_index,
+                    len(self.linked_vocab_index),
+                    iri_index,
+                )
+                while len(self.iri_indexes) > self.max_iri_indexes:
+                    del self.iri_indexes[next(iter(self.iri_indexes))]
+            return iri_index
+
     def get_linked_vocab_by_iri(self, IRI, isnamespaceIRI=False, firstonly=True):
-        IRI = IRI.strip()
-        if isnamespaceIRI:
-            IRI = IRI.rstrip("/#")
-        iri_parts = self.split_iri(IRI)
-        onto_match = []
-        final_onto_match = None
-        tested_patterns = []
-        iri_domain = iri_parts.get("domain")
-        if self.linked_vocab_index.get(iri_domain):
-            if self.linked_vocab_index[iri_domain].get(iri_parts.get("subdomain")):
-                for reg_res in self.linked_vocab_index[iri_domain][iri_parts.get("subdomain")]:
-                    # full match
-                    if reg_res.get("namespace") == IRI:
-                        onto_match.append({"score": len(iri_parts.get("path")), "match": reg_res})
-                    else:
-                        # print(reg_res.get('pattern').replace('$1',''), iri_parts.get('path'))
-                        if reg_res.get("pattern"):
-                            pattern_check = False
-                            if isnamespaceIRI:
-                                # print(reg_res.get('pattern').split('$1')[0].rstrip('/#') , iri_parts.get('path').rstrip('/#'))
-                                if reg_res.get("pattern").split("$1")[0].rstrip("/#") in iri_parts.get("path").rstrip(
-                                    "/#"
-                                ):
-                                    pattern_check = True
-                            else:
-                                if reg_res.get("pattern").split("$1")[0] in iri_parts.get("path"):
-                                    pattern_check = True
-                            if pattern_check:
-                                if reg_res.get("regex"):
-                                    comb_regex = reg_res.get("regex").lstrip("^").rstrip("$")
-                                else:
-                                    if "?" in reg_res.get("pattern"):
-                                        reg_res["pattern"] = reg_res.get("pattern").replace("?", r"\?")
-                                    comb_regex = reg_res.get("pattern").split("$1")[0].rstrip("/#")
-
-                                if comb_regex not in tested_patterns:
-                                    tested_patterns.append(comb_regex)
-                                    comb_match = re.search(comb_regex, iri_parts.get("path"))
-                                    score = self.get_overlap(
-                                        iri_parts.get("path"), reg_res.get("pattern").split("$1")[0]
-                                    )
-                                if comb_match:
-                                    # if len(comb_match.groups()) > 0:
-                                    #    if comb_match[1]:
-                                    #        print('++++++',comb_match[1],reg_res.get('namespace'))
-                                    #        reg_res['namespace'] = IRI.split(comb_match[1])[0] + comb_match[1]
-                                    onto_match.append({"score": score, "match": reg_res})
-            maxscore = 0
-            if onto_match:
-                for ont_m in onto_match:
-                    if ont_m["score"] >= maxscore:
-                        final_onto_match = ont_m["match"]
-
-        return final_onto_match
+        return self.get_iri_index().lookup(IRI, isnamespaceIRI)
+
+    def get_linked_vocabs_by_iris(self, IRIs, isnamespaceIRI=False):
+        """Batch lookup, returns a dict with the vocab entry (or None) for each of the given IRIs"""
+        iri_index = self.get_iri_index()
+        return {IRI: iri_index.lookup(IRI, isnamespaceIRI) for IRI in dict.fromkeys(IRIs)}
@@ -4,7 +4,9 @@
 
 import enum
 import logging
+import re
 
+import lxml.html
 from urlextract import URLExtract
 
 from fuji_server.helper import metadata_mapper
@@ -248,6 +250,23 @@ class MetaDataCollector:
     def getEnumMethodNames(cls) -> MetadataOfferingMethods:
         return MetadataOfferingMethods
 
+    @staticmethod
+    def parse_html(html_content):
+        """Parses a html page with lxml, the returned tree is shared by all embedded metadata collectors
+        and therefore must not be modified. Returns None if the page can not be parsed.
+        """
+        try:
+            html_content = html_content.decode("utf-8")
+        except (UnicodeDecodeError, AttributeError):
+            pass
+        try:
+            if isinstance(html_content, str):
+                # remove html comments which sometimes fails in extruct...
+                html_content = re.sub("(<!--.*?-->)", "", html_content).encode("utf-8")
+            return lxml.html.fromstring(html_content, parser=lxml.html.HTMLParser(encoding="utf-8"))
+        except Exception:
+            return None
+
     def setAcceptType(self, type):
         self.accept_type = type
 
@@ -296,11 +315,10 @@ class MetaDataCollector:
                 found_urls = set(extractor.gen_urls(str(meta_source)))
             elif isinstance(meta_source, list):
                 found_urls = set(meta_source)
-            for url in found_urls:
-                if isinstance(url, str):
-                    found_lov = lov_helper.get_linked_vocab_by_iri(url)
-                    if found_lov:
-                        self.linked_namespaces[found_lov.get("namespace")] = found_lov
+            found_lovs = lov_helper.get_linked_vocabs_by_iris([url for url in found_urls if isinstance(url, str)])
+            for found_lov in found_lovs.values():
+                if found_lov:
+                    self.linked_namespaces[found_lov.get("namespace")] = found_lov
 
     def set_auth_token(self, authtoken, authtokentype):
         self.auth_token = authtoken
@@ -4,8 +4,6 @@
 
 import re
 
-from bs4 import BeautifulSoup
-
 from fuji_server.helper.metadata_collector import MetaDataCollector, MetadataFormats, MetadataSources
 from fuji_server.helper.metadata_mapper import Mapper
 
@@ -23,7 +21,7 @@ class MetaDataCollectorDublinCore(MetaDataCollector):
 
     """
 
-    def __init__(self, sourcemetadata, mapping, loggerinst):
+    def __init__(self, sourcemetadata, mapping, loggerinst, html_dom=None):
         """
         Parameters
         ----------
@@ -33,10 +31,11 @@ class MetaDataCollectorDublinCore(MetaDataCollector):
             Mapper to metedata sources
         loggerinst : logging.Logger
             Logger instance
-        target_url : str
-            Target URL
+        html_dom : lxml.html.HtmlElement, optional
+            Already parsed source html page, default is None
         """
         super().__init__(logger=loggerinst, mapping=mapping, sourcemetadata=sourcemetadata)
+        self.html_dom = html_dom
 
     def parse_metadata(self):
         """Parse the Dublin Core metadata from the data
@@ -79,17 +78,26 @@ class MetaDataCollectorDublinCore(MetaDataCollector):
                 meta_dc_matches = []
                 self.content_type = "text/html"
                 try:
-                    metasoup = BeautifulSoup(self.source_metadata, "lxml")
-                    meta_dc_soupresult = metasoup.findAll(
-                        "meta", attrs={"name": re.compile(r"(DC|dc|DCTERMS|dcterms)\.([A-Za-z]+)")}
-                    )
+                    dom = self.html_dom
+                    if dom is None:
+                        dom = self.parse_html(self.source_metadata)
+                    meta_tags = []
+                    if dom is not None:
+                        meta_tags = [meta_tag for meta_tag in dom.iter("meta") if meta_tag.get("name")]
+                    meta_dc_soupresult = [
+                        meta_tag
+                        for meta_tag in meta_tags
+                        if re.search(r"(DC|dc|DCTERMS|dcterms)\.([A-Za-z]+)", meta_tag.get("name"))
+                    ]
 
                     if len(meta_dc_soupresult) <= 0:
-                        meta_dc_soupresult = metasoup.findAll(
-                            "meta", attrs={"name": re.compile(r"(" + "|".join(dc_core_base_props) + ")")}
-                        )
+                        meta_dc_soupresult = [
+                            meta_tag
+                            for meta_tag in meta_tags
+                            if re.search(r"(" + "|".join(dc_core_base_props) + ")", meta_tag.get("name"))
+                        ]
                     for meta_tag in meta_dc_soupresult:
-                        dc_name_parts = str(meta_tag["name"]).split(".")
+                        dc_name_parts = str(meta_tag.get("name")).split(".")
                         if len(dc_name_parts) == 1 and dc_name_parts[0] in dc_core_base_props:
                             dc_name_parts = ["dc", dc_name_parts[0]]
                         if len(dc_name_parts) > 1:
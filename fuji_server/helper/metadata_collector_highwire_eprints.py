@@ -4,8 +4,6 @@
 
 import re
 
-from bs4 import BeautifulSoup
-
 from fuji_server.helper.metadata_collector import MetaDataCollector, MetadataFormats
 from fuji_server.helper.metadata_mapper import Mapper
 
@@ -23,7 +21,7 @@ class MetaDataCollectorHighwireEprints(MetaDataCollector):
 
     """
 
-    def __init__(self, sourcemetadata, loggerinst):
+    def __init__(self, sourcemetadata, loggerinst, html_dom=None):
         """
         Parameters
         ----------
@@ -33,10 +31,11 @@ class MetaDataCollectorHighwireEprints(MetaDataCollector):
             Mapper to metedata sources
         loggerinst : logging.Logger
             Logger instance
-        target_url : str
-            Target URL
+        html_dom : lxml.html.HtmlElement, optional
+            Already parsed source html page, default is None
         """
         super().__init__(logger=loggerinst, sourcemetadata=sourcemetadata)
+        self.html_dom = html_dom
 
     def parse_metadata(self):
         """Parse the Dublin Core metadata from the data
@@ -53,14 +52,20 @@ class MetaDataCollectorHighwireEprints(MetaDataCollector):
         if self.source_metadata is not None:
             self.metadata_format = MetadataFormats.HTML
             self.content_type = "text/html"
-            metasoup = BeautifulSoup(self.source_metadata, "lxml")
-            meta_hw_soupresult = metasoup.findAll(
-                "meta", attrs={"name": re.compile(r"(eprints\.|citation_)([A-Z_a-z]+)")}
-            )
+            dom = self.html_dom
+            if dom is None:
+                dom = self.parse_html(self.source_metadata)
+            meta_hw_soupresult = []
+            if dom is not None:
+                meta_hw_soupresult = [
+                    meta_tag
+                    for meta_tag in dom.iter("meta")
+                    if re.search(r"(eprints\.|citation_)([A-Z_a-z]+)", meta_tag.get("name") or "")
+                ]
             flipped_hw = Mapper.flip_dict(Mapper.HIGHWIRE_MAPPING.value)
             flipped_hw.update(flipped_eprints=Mapper.flip_dict(Mapper.EPRINTS_MAPPING.value))
             for meta_tag in meta_hw_soupresult:
-                hw_name_parts = str(meta_tag["name"]).split(".")
+                hw_name_parts = str(meta_tag.get("name")).split(".")
                 if len(hw_name_parts) == 1:
                     elem_name = hw_name_parts[0]
                     if not "https://www.highwirepress.com/terms/" not in self.namespaces:
@@ -4,11 +4,11 @@
 
 import json
 import re
+import time
 
 import idutils
 import jmespath
 import rdflib
-import requests
 from pyld import jsonld
 from rdflib import Namespace
 from rdflib.namespace import (
@@ -19,6 +19,7 @@ from rdflib.namespace import (
     SDO,  # schema.org
 )
 
+from fuji_server.helper.concurrent_helper import ConcurrentHelper, ConcurrentJob
 from fuji_server.helper.metadata_collector import MetaDataCollector, MetadataFormats, MetadataSources
 from fuji_server.helper.metadata_mapper import Mapper
 from fuji_server.helper.preprocessor import Preprocessor
@@ -61,9 +62,16 @@ class MetaDataCollectorRdf(MetaDataCollector):
     """
 
     target_url = None
+    # maximum number of DCAT distributions which are retrieved from their remote location per graph
+    max_remote_distributions = 25
     SCHEMA_ORG_CONTEXT = Preprocessor.get_schema_org_context()
     SCHEMA_ORG_CREATIVEWORKS = Preprocessor.get_schema_org_creativeworks()
 
+    @classmethod
+    def set_options(cls, max_remote_distributions=None):
+        if max_remote_distributions is not None:
+            cls.max_remote_distributions = int(max_remote_distributions)
+
     def __init__(self, loggerinst, target_url=None, source=None, json_ld_content=None):
         """
         Parameters
@@ -307,7 +315,7 @@ class MetaDataCollectorRdf(MetaDataCollector):
                                     if isinstance(rdf_response.get("@context"), str):
                                         if "schema.org" in rdf_response.get("@context"):
                                             rdf_response["@context"] = "https://schema.org/docs/jsonldcontext.json"
-                                # expand graph
+                                # expand graph, contexts are loaded by the JsonLdDocumentLoader installed at startup
                                 rdf_response = jsonld.expand(rdf_response)
                             # convert dict to json string again for RDF graph parsing
                             rdf_response = json.dumps(rdf_response)
@@ -1019,35 +1027,29 @@ class MetaDataCollectorRdf(MetaDataCollector):
             for t in table:
                 print(t)
             dcat_metadata["object_content_identifier"] = []
+            # url, type and size of each distribution, remote ones are retrieved concurrently
+            distribution_infos = []
+            remote_jobs = []
+            skipped_remote = 0
             for dist in distribution:
-                dtype, durl, dsize = None, None, None
+                dist_info = {"url": None, "type": None, "size": None}
+                distribution_infos.append(dist_info)
                 if not (graph.value(dist, DCAT.accessURL) or graph.value(dist, DCAT.downloadURL)):
-                    self.logger.info(
-                        "FsF-F2-01M : Trying to retrieve DCAT distributions from remote location -:" + str(dist)
-                    )
-                    try:
-                        distgraph = rdflib.Graph()
-                        disturl = str(dist)
-                        distresponse = requests.get(disturl, headers={"Accept": "application/rdf+xml"})
-                        if distresponse.text:
-                            distgraph.parse(data=distresponse.text, format="application/rdf+xml")
-                            extdist = list(distgraph[: RDF.type : DCAT.Distribution])
-                            durl = distgraph.value(extdist[0], DCAT.accessURL) or distgraph.value(
-                                extdist[0], DCAT.downloadURL
-                            )
-                            dsize = distgraph.value(extdist[0], DCAT.byteSize)
-                            dtype = distgraph.value(extdist[0], DCAT.mediaType)
-                            self.logger.info(
-                                "FsF-F2-01M : Found DCAT distribution URL info from remote location -:" + str(durl)
+                    if len(remote_jobs) < self.max_remote_distributions:
+                        remote_jobs.append(
+                            ConcurrentJob(
+                                self.logger,
+                                fetch=lambda job_logger, dist=dist: self.fetch_remote_dcat_distribution(
+                                    dist, job_logger
+                                ),
+                                merge=lambda fetched, dist_info=dist_info: dist_info.update(fetched),
                             )
-                    except Exception:
-                        self.logger.info(
-                            "FsF-F2-01M : Failed to retrieve DCAT distributions from remote location -:" + str(dist)
                         )
-                        # print(e)
-                        durl = str(dist)
+                    else:
+                        skipped_remote += 1
+                        dist_info["url"] = str(dist)
                 else:
-                    durl = graph.value(dist, DCAT.accessURL) or graph.value(dist, DCAT.downloadURL)
+                    dist_info["url"] = graph.value(dist, DCAT.accessURL) or graph.value(dist, DCAT.downloadURL)
                     # taking only one just to check if licence is available and not yet set
                     if not dcat_metadata.get("license"):
                         dcat_metadata["license"] = graph.value(dist, DCTERMS.license)
@@ -1056,8 +1058,16 @@ class MetaDataCollectorRdf(MetaDataCollector):
                         dcat_metadata["access_rights"] = graph.value(dist, DCTERMS.accessRights) or graph.value(
                             dist, DCTERMS.rights
                         )
-                    dtype = graph.value(dist, DCAT.mediaType)
-                    dsize = graph.value(dist, DCAT.byteSize)
+                    dist_info["type"] = graph.value(dist, DCAT.mediaType)
+                    dist_info["size"] = graph.value(dist, DCAT.byteSize)
+            if skipped_remote:
+                self.logger.warning(
+                    f"FsF-F2-01M : Found more than -: {self.max_remote_distributions} DCAT distributions at remote locations, "
+                    f"will only retrieve {self.max_remote_distributions} of {len(remote_jobs) + skipped_remote}"
+                )
+            ConcurrentHelper.run_jobs(remote_jobs)
+            for dist_info in distribution_infos:
+                durl, dtype, dsize = dist_info["url"], dist_info["type"], dist_info["size"]
                 if durl or dtype or dsize:
                     if idutils.is_url(str(durl)):
                         dtype = "/".join(str(dtype).split("/")[-2:])
@@ -1080,6 +1090,48 @@ class MetaDataCollectorRdf(MetaDataCollector):
         # print(rdf_meta)
         # return None
 
+    def fetch_remote_dcat_distribution(self, dist, logger):
+        """Retrieves the description of a DCAT distribution from its URI, returns its url, type and size
+
+        Parameters
+        ----------
+        dist : rdflib.term.URIRef
+            URI of the DCAT distribution
+        logger : logging.Logger
+            Logger instance of the (concurrent) retrieval
+
+        Returns
+        ------
+        dict
+            a dictionary with the url, type and size of the distribution
+        """
+        DCAT = Namespace("http://www.w3.org/ns/dcat#")
+        started = time.monotonic()
+        logger.info("FsF-F2-01M : Trying to retrieve DCAT distributions from remote location -:" + str(dist))
+        dist_info = {"url": None, "type": None, "size": None}
+        try:
+            requestHelper = RequestHelper(str(dist), logger)
+            requestHelper.setAcceptType(AcceptTypes.rdfxml)
+            _, dist_response = requestHelper.content_negotiate("FsF-F2-01M")
+            if dist_response is None:
+                raise ValueError("no RDF content received")
+            distgraph = rdflib.Graph()
+            distgraph.parse(data=requestHelper.getResponseContent(), format="application/rdf+xml")
+            extdist = list(distgraph[: RDF.type : DCAT.Distribution])
+            dist_info["url"] = distgraph.value(extdist[0], DCAT.accessURL) or distgraph.value(
+                extdist[0], DCAT.downloadURL
+            )
+            dist_info["size"] = distgraph.value(extdist[0], DCAT.byteSize)
+            dist_info["type"] = distgraph.value(extdist[0], DCAT.mediaType)
+            logger.info("FsF-F2-01M : Found DCAT distribution URL info from remote location -:" + str(dist_info["url"]))
+        except Exception:
+            logger.info("FsF-F2-01M : Failed to retrieve DCAT distributions from remote location -:" + str(dist))
+            dist_info["url"] = str(dist)
+        logger.info(
+            f"FsF-F2-01M : Retrieval of remote DCAT distribution took -: {time.monotonic() - started:.2f}s, {dist!s}"
+        )
+        return dist_info
+
     def get_content_type(self):
         """Get the content type.
 
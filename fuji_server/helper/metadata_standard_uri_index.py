@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+from rapidfuzz import process
+from tldextract import extract
+
+
+class MetadataStandardURIIndex:
+    """Lookup structure for the URIs (namespaces, schemas, homepages) of community metadata standards.
+
+    URIs are found by an exact match of their normalised form (http and https are treated the same), other
+    values are compared by fuzzy matching, but only with the URIs sharing the same domain name.
+    """
+
+    def __init__(self, metadata_standards):
+        # uri : metadata standard id
+        self.uris = {u.strip().strip("#/"): k for k, v in metadata_standards.items() for u in v.get("urls") or []}
+        self.exact = {}
+        # domain name : ([uri, ..], [metadata standard id, ..])
+        self.domains = {}
+        for uri, standard_id in self.uris.items():
+            normalised_uri = self.normalise(uri)
+            # http URIs are preferred over https ones
+            if normalised_uri not in self.exact or uri == normalised_uri:
+                self.exact[normalised_uri] = standard_id
+            domain_uris, domain_ids = self.domains.setdefault(extract(uri).domain, ([], []))
+            domain_uris.append(uri)
+            domain_ids.append(standard_id)
+
+    @staticmethod
+    def normalise(value):
+        return str(value).strip().strip("#/").replace("s://", "://")
+
+    def lookup(self, value):
+        """Returns the id of the metadata standard identified by the given URI or None"""
+        metadata_standard_id = None
+        if value:
+            value = str(value).strip().strip("#/")
+            # try to find it as direct match using http or https as prefix
+            if value.startswith("http") or value.startswith("ftp"):
+                value = value.replace("s://", "://")
+                metadata_standard_id = self.exact.get(value)
+            if not metadata_standard_id:
+                # fuzzy as fall back
+                candidates = self.domains.get(extract(value).domain)
+                if candidates:
+                    match = process.extractOne(value, candidates[0])
+                    req_similarity = 90
+                    if "w3.org/ns" in value:
+                        req_similarity = 95
+                    if match and match[1] > req_similarity:
+                        metadata_standard_id = candidates[1][match[2]]
+        return metadata_standard_id
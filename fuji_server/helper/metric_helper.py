@@ -7,6 +7,7 @@ import os
 import re
 
 import yaml
+from fuji_server.helper.metric_specification_registry import MetricSpecificationRegistry
 from fuji_server.helper.preprocessor import Preprocessor
 
 
@@ -26,9 +27,10 @@ class MetricHelper:
             self.logger = logger
         else:
             self.logger = logging.getLogger()
+        # parsed, read only metric specification shared by all MetricHelper instances
+        self.specification = None
         ym = re.match("(metrics_v)?([0-9]+\.[0-9]+)(_[a-z]+)?(\.yaml)?", metric_input_file_name)
         if ym:
-            print(ym.groups())
             metric_file_name = ""
             self.metric_version = ym[2]
             if ym[3]:
@@ -43,12 +45,9 @@ class MetricHelper:
 
             metric_yml_path = Preprocessor.METRIC_YML_PATH
 
-            print("METRIC VERSION", self.metric_version)
-            print("LOADING METRICS  ", metric_file_name, metric_yml_path)
-            specification = {}
+            specification = None
             try:
-                stream = open(os.path.join(metric_yml_path, metric_file_name), encoding="utf8")
-                specification = yaml.load(stream, Loader=yaml.FullLoader)
+                specification = MetricSpecificationRegistry.get(os.path.join(metric_yml_path, metric_file_name))
             except FileNotFoundError as e:
                 print("ERROR: YAML LOADING ERROR -NOT FOUND")
                 self.logger.error(e)
@@ -56,16 +55,13 @@ class MetricHelper:
                 print("ERROR: YAML LOADING ERROR - YAML ERROR")
                 self.logger.error(e)
             if specification:
-                if specification.get("metric_specification"):
-                    self.metric_specification = specification.get("metric_specification")
-                self.config = specification.get("config")
-                self.all_metrics_list = specification["metrics"]
-                self.total_metrics = len(self.all_metrics_list)
-                print("NUMBER OF LOADED METRICS  ", self.total_metrics)
-                # expected output format of http://localhost:1071/uji/api/v1/metrics
-                # unwanted_keys = ['question_type']
-                self.formatted_specification["total"] = self.total_metrics
-                self.formatted_specification["metrics"] = self.all_metrics_list
+                self.specification = specification
+                if specification.metric_specification:
+                    self.metric_specification = specification.metric_specification
+                self.config = specification.config
+                self.all_metrics_list = specification.all_metrics_list
+                self.total_metrics = specification.total_metrics
+                self.formatted_specification = specification.formatted_specification
             else:
                 print("ERROR: YAML FILE DOES NOT EXIST")
         else:
@@ -79,45 +75,18 @@ class MetricHelper:
             return {}
 
     def get_custom_metrics(self, wanted_fields):
-        new_dict = {}
-        if self.all_metrics_list:
-            for dictm in self.all_metrics_list:
-                tm = re.search(self.metric_regex, str(dictm.get("metric_identifier")))
-                if tm:
-                    agnostic_identifier = tm[0]
-                    new_dict[agnostic_identifier] = {k: v for k, v in dictm.items() if k in wanted_fields}
-                    new_dict[agnostic_identifier]["agnostic_identifier"] = agnostic_identifier
-                    new_dict[agnostic_identifier]["metric_identifier"] = dictm.get("metric_identifier")
-
-                    if isinstance(dictm.get("metric_tests"), list):
-                        for dictt in dictm.get("metric_tests"):
-                            ttm = re.search(self.metric_test_regex, str(dictt.get("metric_test_identifier")))
-                            if ttm:
-                                agnostic_test_identifier = ttm[0]
-                                dictt["agnostic_test_identifier"] = agnostic_test_identifier
-                            else:
-                                self.logger.error(
-                                    "Invalid YAML defined Metric Test: " + str(dictt.get("metric_test_identifier"))
-                                )
-                else:
-                    self.logger.error("Invalid YAML defined Metric: " + str(dictm.get("metric_identifier")))
-        else:
-            self.logger.error("No YAML defined Metric seems to exist: ")
-        return new_dict
+        if self.specification:
+            return self.specification.get_custom_metrics(wanted_fields)
+        self.logger.error("No YAML defined Metric seems to exist: ")
+        return {}
 
     def get_metric_version(self):
         return self.metric_version
 
     def get_metric(self, metric_id):
-        metric = {}
-        for listed_metric in self.all_metrics_list:
-            if listed_metric.get("metric_identifier") == metric_id:
-                metric = listed_metric
-            else:
-                for metric_test in listed_metric.get("metric_tests"):
-                    if metric_test.get("metric_test_identifier") == metric_id:
-                        metric = listed_metric
-        return metric
+        if self.specification:
+            return self.specification.get_metric(metric_id)
+        return {}
 
     def get_metrics(self):
         return self.formatted_specification
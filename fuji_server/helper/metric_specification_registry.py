@@ -0,0 +1,160 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import logging
+import os
+import re
+import threading
+
+import yaml
+
+# C accelerated loader of libyaml if available
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class FrozenDict(dict):
+    """Read only dict, the YAML metric specifications are shared by all evaluations of the process"""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("metric specifications are read only")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+
+class FrozenList(list):
+    """Read only list, see FrozenDict"""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("metric specifications are read only")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = clear = extend = insert = pop = remove = reverse = sort = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+
+def freeze(value):
+    """Returns a read only (FrozenDict, FrozenList) deep copy of the given YAML structure"""
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list | tuple):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+class MetricSpecification:
+    """A parsed metrics YAML file, all structures are read only views which are shared between requests"""
+
+    # match FsF or FAIR4RS metric (test) identifiers
+    metric_regex = re.compile(r"^FsF-[FAIR][0-9]?(\.[0-9])?-[0-9]+[MD]+|FRSM-[0-9]+-[FAIR][0-9]?(\.[0-9])?")
+    metric_test_regex = re.compile(
+        r"FsF-[FAIR][0-9]?(\.[0-9])?-[0-9]+[MD]+(-[0-9]+[a-z]?)|^FRSM-[0-9]+-[FAIR][0-9]?(\.[0-9])?(?:-[a-zA-Z]+)?(-[0-9]+)?"
+    )
+
+    def __init__(self, specification, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.metric_specification = specification.get("metric_specification")
+        self.config = freeze(specification.get("config") or {})
+        self.all_metrics_list = freeze(specification.get("metrics") or [])
+        self.total_metrics = len(self.all_metrics_list)
+        # expected output format of http://localhost:1071/uji/api/v1/metrics
+        self.formatted_specification = FrozenDict(total=self.total_metrics, metrics=self.all_metrics_list)
+        # metric or metric test identifier : metric, the last metric listed wins
+        self.metric_index = {}
+        for metric in self.all_metrics_list:
+            self.metric_index[metric.get("metric_identifier")] = metric
+            for metric_test in metric.get("metric_tests") or []:
+                self.metric_index[metric_test.get("metric_test_identifier")] = metric
+        self.custom_metrics = {}
+        self._lock = threading.Lock()
+
+    def get_metric(self, metric_id):
+        return self.metric_index.get(metric_id, {})
+
+    def get_custom_metrics(self, wanted_fields):
+        """Returns the metrics by their agnostic identifiers limited to wanted_fields, metric tests are
+        extended by their agnostic test identifier. The result is computed once per list of fields"""
+        key = tuple(wanted_fields)
+        with self._lock:
+            if key not in self.custom_metrics:
+                self.custom_metrics[key] = self.compile_custom_metrics(key)
+            return self.custom_metrics[key]
+
+    def compile_custom_metrics(self, wanted_fields):
+        new_dict = {}
+        if self.all_metrics_list:
+            for dictm in self.all_metrics_list:
+                tm = self.metric_regex.search(str(dictm.get("metric_identifier")))
+                if tm:
+                    agnostic_identifier = tm[0]
+                    new_dict[agnostic_identifier] = {k: v for k, v in dictm.items() if k in wanted_fields}
+                    new_dict[agnostic_identifier]["agnostic_identifier"] = agnostic_identifier
+                    new_dict[agnostic_identifier]["metric_identifier"] = dictm.get("metric_identifier")
+                    if isinstance(dictm.get("metric_tests"), list) and "metric_tests" in wanted_fields:
+                        metric_tests = []
+                        for dictt in dictm.get("metric_tests"):
+                            dictt = dict(dictt)
+                            ttm = self.metric_test_regex.search(str(dictt.get("metric_test_identifier")))
+                            if ttm:
+                                dictt["agnostic_test_identifier"] = ttm[0]
+                            else:
+                                self.logger.error(
+                                    "Invalid YAML defined Metric Test: " + str(dictt.get("metric_test_identifier"))
+                                )
+                            metric_tests.append(dictt)
+                        new_dict[agnostic_identifier]["metric_tests"] = metric_tests
+                else:
+                    self.logger.error("Invalid YAML defined Metric: " + str(dictm.get("metric_identifier")))
+        else:
+            self.logger.error("No YAML defined Metric seems to exist: ")
+        return freeze(new_dict)
+
+
+class MetricSpecificationRegistry:
+    """Process wide registry of parsed metric specifications keyed by the path of their YAML file.
+
+    Each file is parsed once, get() only checks whether its modification time (or size) has changed since and
+    reloads it in this case.
+    """
+
+    logger = logging.getLogger(__name__)
+    # path : (mtime_ns, size, MetricSpecification)
+    specifications = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, path):
+        """Returns the MetricSpecification of the YAML file at path, raises OSError or yaml.YAMLError"""
+        stat = os.stat(path)
+        with cls._lock:
+            cached = cls.specifications.get(path)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return cached[2]
+            cls.logger.info(f"Loading metric specification -: {path}")
+            with open(path, encoding="utf8") as stream:
+                specification = MetricSpecification(yaml.load(stream, Loader=YamlLoader) or {}, cls.logger)
+            cls.specifications[path] = (stat.st_mtime_ns, stat.st_size, specification)
+            return specification
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls.specifications = {}
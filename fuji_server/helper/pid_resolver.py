@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import threading
+
+from fuji_server.helper.concurrent_helper import ConcurrentHelper, ConcurrentJob
+from fuji_server.helper.http_transport import HTTPTransport
+from fuji_server.helper.identifier_helper import IdentifierHelper
+
+
+class PIDResolver:
+    """Resolves batches of PIDs (e.g. all object identifiers found in metadata) concurrently.
+
+    At most max_requests_per_resolver PIDs are resolved by the same resolver (host of the PID URL, e.g. doi.org)
+    at the same time. Resolutions are shared with other evaluations by the ResolverCache.
+    """
+
+    max_workers = 8
+    max_requests_per_resolver = 4
+
+    _lock = threading.Lock()
+    _resolver_semaphores = {}
+
+    @classmethod
+    def set_options(cls, max_workers=None, max_requests_per_resolver=None):
+        with cls._lock:
+            if max_workers:
+                cls.max_workers = int(max_workers)
+            if max_requests_per_resolver:
+                cls.max_requests_per_resolver = int(max_requests_per_resolver)
+                cls._resolver_semaphores = {}
+
+    @classmethod
+    def get_resolver_semaphore(cls, pid_url):
+        resolver = HTTPTransport.get_host_key(pid_url)
+        with cls._lock:
+            if resolver not in cls._resolver_semaphores:
+                cls._resolver_semaphores[resolver] = threading.BoundedSemaphore(cls.max_requests_per_resolver)
+            return cls._resolver_semaphores[resolver]
+
+    @classmethod
+    def resolve(cls, identifier, logger):
+        """Returns the identifier info (IdentifierHelper.get_identifier_info) of a PID including its resolved URL"""
+        pid_helper = IdentifierHelper(identifier, logger)
+        with cls.get_resolver_semaphore(pid_helper.identifier_url):
+            return pid_helper.get_identifier_info()
+
+    @classmethod
+    def get_jobs(cls, identifiers, logger, merge):
+        """Returns a ConcurrentJob per identifier which resolves it and calls merge(identifier, record)"""
+        return [
+            ConcurrentJob(
+                logger,
+                fetch=lambda job_logger, identifier=identifier: cls.resolve(identifier, job_logger),
+                merge=lambda record, identifier=identifier: merge(identifier, record),
+            )
+            for identifier in identifiers
+        ]
+
+    @classmethod
+    def resolve_all(cls, identifiers, logger, merge):
+        """Resolves all identifiers concurrently, merge(identifier, record) is called in the order of identifiers"""
+        ConcurrentHelper.run_jobs(cls.get_jobs(identifiers, logger, merge), cls.max_workers)
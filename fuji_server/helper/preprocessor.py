@@ -6,13 +6,14 @@ import json
 import logging
 import mimetypes
 import os
-import time
 from urllib.parse import urlparse
 
 import requests
 
 import yaml
+from fuji_server.helper.http_transport import HTTPTransport
 from fuji_server.helper.linked_vocab_helper import linked_vocab_helper
+from fuji_server.helper.metadata_standard_uri_index import MetadataStandardURIIndex
 
 
 class Preprocessor:
@@ -38,6 +39,7 @@ class Preprocessor:
     license_names = []
     metadata_standards = {}  # key=subject,value =[standards name]
     metadata_standards_uris = {}  # some additional namespace uris and all uris from above as key
+    metadata_standards_uri_index = None  # MetadataStandardURIIndex of the urls of metadata_standards
     all_file_formats = {}
     science_file_formats = {}
     long_term_file_formats = {}
@@ -213,41 +215,10 @@ class Preprocessor:
 
     @classmethod
     def retrieve_datacite_re3repos(cls):
-        # retrieve all client id and re3data doi from datacite
-        isDebugMode = True
+        # client id and re3data doi of all DataCite repositories, updated by DataCiteRepositoryRefresher
         re3dict_path = os.path.join(cls.fuji_server_dir, "data", "repodois.yaml")
-        repolistdate = os.path.getmtime(re3dict_path)
-        try:
-            # update once a day
-            if time.time() - repolistdate >= 86400:
-                isDebugMode = False
-        except:
-            pass
-        if isDebugMode:
-            with open(re3dict_path) as f:
-                cls.re3repositories = yaml.safe_load(f)
-        else:
-            print("updating re3data dois")
-            p = {"query": "re3data_id:*"}
-            try:
-                req = requests.get(cls.DATACITE_API_REPO, params=p, headers=cls.header, timeout=5)
-                raw = req.json()
-                for r in raw["data"]:
-                    cls.re3repositories[r["id"]] = r["attributes"]["re3data"]
-                while "next" in raw["links"]:
-                    response = requests.get(raw["links"]["next"]).json()
-                    for r in response["data"]:
-                        cls.re3repositories[r["id"]] = r["attributes"]["re3data"]
-                    raw["links"] = response["links"]
-                # fix wrong entry
-                cls.re3repositories["bl.imperial"] = "http://doi.org/10.17616/R3K64N"
-                with open(re3dict_path, "w") as f2:
-                    yaml.dump(cls.re3repositories, f2)
-
-            except requests.exceptions.RequestException as e:
-                os.utime(re3dict_path)
-                print("Preprocessor Error: " + str(e))
-                cls.logger.error(e)
+        with open(re3dict_path) as f:
+            cls.re3repositories = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
     @classmethod
     def get_access_rights(cls):
@@ -355,6 +326,10 @@ class Preprocessor:
         if data:
             cls.metadata_standards = data
 
+    @classmethod
+    def retrieve_metadata_standards_uri_index(cls):
+        cls.metadata_standards_uri_index = MetadataStandardURIIndex(cls.get_metadata_standards())
+
     @classmethod
     def retrieve_all_file_formats(cls):
         data = {}
@@ -445,7 +420,7 @@ class Preprocessor:
 
     @classmethod
     def retrieve_linked_vocab_index(cls):
-        lov_helper = linked_vocab_helper()
+        lov_helper = linked_vocab_helper({})
         lov_helper.set_linked_vocab_index()
         cls.linked_vocab_index = lov_helper.linked_vocab_index
 
@@ -560,7 +535,7 @@ class Preprocessor:
         isActive = False
         if cls.uri_validator(url):
             try:
-                r = requests.head(url)
+                r = HTTPTransport.head(url, allow_redirects=False, timeout=10)
                 if not (400 <= r.status_code < 600):
                     isActive = True
             except requests.exceptions.RequestException as e:
@@ -627,6 +602,12 @@ class Preprocessor:
             cls.retrieve_metadata_standards()
         return cls.metadata_standards
 
+    @classmethod
+    def get_metadata_standards_uri_index(cls) -> MetadataStandardURIIndex:
+        if not cls.metadata_standards_uri_index:
+            cls.retrieve_metadata_standards_uri_index()
+        return cls.metadata_standards_uri_index
+
     @classmethod
     def get_science_file_formats(cls) -> object:
         if not cls.science_file_formats:
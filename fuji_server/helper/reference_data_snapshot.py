@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import sys
+
+from fuji_server.helper import linked_vocab_helper as linked_vocab_helper_module
+from fuji_server.helper import metadata_standard_uri_index as metadata_standard_uri_index_module
+from fuji_server.helper.preprocessor import Preprocessor
+
+
+class ReferenceDataSnapshot:
+    """A single binary file which contains all reference data of the Preprocessor (licenses, metadata standards,
+    file formats, linked vocabularies etc.) incl. derived indexes like the linked vocab index.
+
+    The snapshot is compiled by build() from the files in the data directory, load() memory-maps it and restores
+    all Preprocessor attributes at once, so workers do not need to parse and index the JSON files again.
+    Snapshots are pickled, so only files written by build() must be used.
+    A snapshot is only used if its format version and the fingerprint (size and modification time of all source
+    files and of the code which derives the indexes) match, otherwise it is considered stale.
+    """
+
+    MAGIC = b"FUJIREF\x00"
+    # increase if the content or structure of the snapshot changes
+    FORMAT_VERSION = 2
+    HEADER = struct.Struct(">8sI32s")
+    logger = logging.getLogger(__name__)
+    # Preprocessor class attributes which are stored in the snapshot
+    attributes = (
+        "all_licenses",
+        "license_names",
+        "total_licenses",
+        "metadata_standards",
+        "metadata_standards_uris",
+        "metadata_standards_uri_index",
+        "all_file_formats",
+        "science_file_formats",
+        "long_term_file_formats",
+        "open_file_formats",
+        "standard_protocols",
+        "default_namespaces",
+        "linked_vocabs",
+        "linked_vocab_index",
+        "identifiers_org_data",
+        "schema_org_context",
+        "schema_org_creativeworks",
+        "resource_types",
+    )
+    # files in the data directory the snapshot is compiled from
+    source_files = (
+        "licenses.json",
+        "metadata_standards.json",
+        "metadata_standards_uris.json",
+        "file_formats.json",
+        "standard_uri_protocols.json",
+        "default_namespaces.txt",
+        "linked_vocab.json",
+        "identifiers_org_resolver_data.json",
+        "jsonldcontext.json",
+        "creativeworktypes.txt",
+        "bioschemastypes.txt",
+        "ResourceTypes.txt",
+    )
+
+    @classmethod
+    def get_source_paths(cls):
+        data_dir = os.path.join(Preprocessor.fuji_server_dir, "data")
+        paths = [os.path.join(data_dir, source_file) for source_file in cls.source_files]
+        vocab_dir = os.path.join(data_dir, "linked_vocabs")
+        paths.extend(
+            os.path.join(vocab_dir, vocab_file)
+            for vocab_file in sorted(os.listdir(vocab_dir))
+            if vocab_file.endswith(".json")
+        )
+        paths.append(os.path.abspath(sys.modules[Preprocessor.__module__].__file__))
+        paths.append(os.path.abspath(linked_vocab_helper_module.__file__))
+        paths.append(os.path.abspath(metadata_standard_uri_index_module.__file__))
+        return paths
+
+    @classmethod
+    def get_fingerprint(cls):
+        fingerprint = hashlib.sha256(str(cls.FORMAT_VERSION).encode("utf-8"))
+        for path in cls.get_source_paths():
+            stat = os.stat(path)
+            fingerprint.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        return fingerprint.digest()
+
+    @classmethod
+    def build(cls, path):
+        """Loads all reference data from the data directory and writes it to the snapshot file at path"""
+        # the fingerprint is taken first, so changes of the sources during the build make the snapshot stale
+        fingerprint = cls.get_fingerprint()
+        Preprocessor.retrieve_licenses(True)
+        Preprocessor.retrieve_metadata_standards()
+        Preprocessor.retrieve_metadata_standards_uris()
+        Preprocessor.retrieve_metadata_standards_uri_index()
+        Preprocessor.retrieve_all_file_formats()
+        Preprocessor.retrieve_science_file_formats(True)
+        Preprocessor.retrieve_long_term_file_formats(True)
+        Preprocessor.retrieve_open_file_formats(True)
+        Preprocessor.retrieve_standard_protocols(True)
+        Preprocessor.retrieve_default_namespaces()
+        Preprocessor.retrieve_linkedvocabs(Preprocessor.LOV_API, Preprocessor.LOD_CLOUDNET, True)
+        Preprocessor.retrieve_linked_vocab_index()
+        Preprocessor.retrieve_identifiers_org_data()
+        Preprocessor.schema_org_context = []
+        Preprocessor.retrieve_schema_org_context()
+        Preprocessor.retrieve_resource_types()
+        payload = pickle.dumps(
+            {attribute: getattr(Preprocessor, attribute) for attribute in cls.attributes},
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # written to a temporary file first, so other workers never see an incomplete snapshot
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.FORMAT_VERSION, fingerprint))
+            f.write(payload)
+        os.replace(tmp_path, path)
+        cls.logger.info(f"Reference data snapshot written -: {path} ({cls.HEADER.size + len(payload)} bytes)")
+
+    @classmethod
+    def load(cls, path):
+        """Restores the Preprocessor reference data from the snapshot file, returns False if it is missing or stale"""
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as snapshot:
+                magic, version, fingerprint = cls.HEADER.unpack_from(snapshot)
+                if magic != cls.MAGIC or version != cls.FORMAT_VERSION or fingerprint != cls.get_fingerprint():
+                    cls.logger.info(f"Reference data snapshot is stale -: {path}")
+                    return False
+                with memoryview(snapshot) as view, view[cls.HEADER.size :] as payload:
+                    data = pickle.loads(payload)
+        except (OSError, ValueError, struct.error, pickle.UnpicklingError, EOFError) as e:
+            cls.logger.info(f"Reference data snapshot not usable -: {path} {e}")
+            return False
+        for attribute in cls.attributes:
+            setattr(Preprocessor, attribute, data.get(attribute))
+        cls.logger.info(f"Reference data loaded from snapshot -: {path}")
+        return True
+
+    @classmethod
+    def load_or_build(cls, path):
+        """Loads the snapshot, (re)builds it if it is missing or stale. Returns True if the reference data is set"""
+        if cls.load(path):
+            return True
+        try:
+            cls.build(path)
+            return True
+        except OSError as e:
+            # e.g. a read only installation, the reference data is then loaded from the JSON files as usual
+            cls.logger.warning(f"Could not write reference data snapshot -: {path} {e}")
+            return False
+
+
+if __name__ == "__main__":
+    # build step: python -m fuji_server.helper.reference_data_snapshot [snapshot path]
+    logging.basicConfig(level=logging.INFO)
+    ReferenceDataSnapshot.build(
+        sys.argv[1]
+        if len(sys.argv) > 1
+        else os.path.join(Preprocessor.fuji_server_dir, "data", "reference_data.snapshot")
+    )
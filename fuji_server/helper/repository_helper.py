@@ -11,7 +11,6 @@ from fuji_server.helper.request_helper import AcceptTypes, RequestHelper
 
 
 class RepositoryHelper:
-    DATACITE_REPOSITORIES = Preprocessor.getRE3repositories()
     ns = {"r3d": "http://www.re3data.org/schema/2-2"}
     RE3DATA_APITYPES = ["OAI-PMH", "SOAP", "SPARQL", "SWORD", "OpenDAP"]
 
@@ -30,7 +29,7 @@ class RepositoryHelper:
 
     def lookup_re3data(self):
         if self.client_id:  # and self.pid_scheme:
-            re3doi = RepositoryHelper.DATACITE_REPOSITORIES.get(self.client_id)  # {client_id,re3doi}
+            re3doi = Preprocessor.getRE3repositories().get(self.client_id)  # {client_id,re3doi}
             if re3doi:
                 if idutils.is_doi(re3doi):
                     short_re3doi = idutils.normalize_pid(re3doi, scheme="doi")  # https://doi.org/10.17616/R3XS37
@@ -2,36 +2,28 @@
 #
 # SPDX-License-Identifier: MIT
 
-import gzip
-import http.cookiejar
+import hashlib
 import json
+import logging
 import mimetypes
 import re
-import ssl
 import sys
-import urllib
+from email.message import Message
 from enum import Enum
 
 import lxml
 import rdflib
-from tika import parser
+import requests
 
+from fuji_server.helper.content_inspector import ContentInspector
+from fuji_server.helper.deadline import Deadline, TimeBudgetExceededError
+from fuji_server.helper.host_circuit_breaker import HostCircuitBreaker, HostUnavailableError
+from fuji_server.helper.http_disk_cache import HTTPDiskCache
+from fuji_server.helper.http_transport import HTTPTransport
 from fuji_server.helper.metadata_collector import MetadataFormats
 from fuji_server.helper.preprocessor import Preprocessor
-
-
-class FUJIHTTPRedirectHandler(urllib.request.HTTPRedirectHandler):
-    def __init__(self):
-        super().__init__()
-        self.redirect_list = []
-        self.redirect_url = None
-        self.redirect_status_list = []
-
-    def redirect_request(self, req, fp, code, msg, hdrs, newurl):
-        self.redirect_url = newurl
-        self.redirect_list.append(newurl)
-        self.redirect_status_list.append((newurl, code))
-        return super().redirect_request(req, fp, code, msg, hdrs, newurl)
+from fuji_server.helper.resolver_cache import ResolverCache
+from fuji_server.helper.response_cache import ResponseCache
 
 
 class AcceptTypes(Enum):
@@ -61,6 +53,23 @@ class AcceptTypes(Enum):
 
 
 class RequestHelper:
+    # process wide cache of content negotiation results, shared by all RequestHelper instances
+    response_cache = ResponseCache()
+    # optional persistent cache, responses are revalidated with conditional requests
+    disk_cache = None
+    cached_attributes = (
+        "parse_response",
+        "response_content",
+        "response_status",
+        "response_header",
+        "response_charset",
+        "content_type",
+        "content_size",
+        "redirect_url",
+        "redirect_list",
+        "redirect_status_list",
+    )
+
     def __init__(self, url, logInst: object = None):
         self.checked_content = {}
         if logInst:
@@ -86,6 +95,80 @@ class RequestHelper:
         self.checked_content_hash = None
         self.authtoken = None
         self.tokentype = None
+        # if True, responses stored in the disk cache are revalidated even if they are fresh
+        self.revalidate = False
+
+    @classmethod
+    def set_response_cache_options(cls, max_size=None, ttl=None):
+        if max_size is not None:
+            cls.response_cache.max_size = int(max_size)
+        if ttl is not None:
+            cls.response_cache.ttl = float(ttl)
+        cls.response_cache.clear()
+
+    def get_response_cache_key(self, url, ignore_html):
+        auth_identity = None
+        if self.authtoken:
+            # do not keep the token itself in the cache key
+            auth_identity = hashlib.sha256((str(self.tokentype) + " " + self.authtoken).encode("utf-8")).hexdigest()
+        return (url, self.accept_type, auth_identity, ignore_html)
+
+    @classmethod
+    def set_disk_cache_options(cls, path=None, max_size=None, max_age=None, stale_while_revalidate=None):
+        # the persistent cache is optional and disabled if no path is given
+        if path:
+            cls.disk_cache = HTTPDiskCache(
+                path,
+                max_size=max_size or 1000000000,
+                max_age=max_age or 0,
+                stale_while_revalidate=stale_while_revalidate or 0,
+            )
+        else:
+            cls.disk_cache = None
+
+    def set_cached_attributes(self, cached_response):
+        for attribute in self.cached_attributes:
+            setattr(self, attribute, cached_response.get(attribute))
+
+    def get_cached_response(self, ignore_html):
+        cached_response = self.response_cache.get(self.get_response_cache_key(self.request_url, ignore_html))
+        if cached_response:
+            self.set_cached_attributes(cached_response)
+        return cached_response
+
+    def get_validator(self, header_name):
+        for name, value in self.response_header or []:
+            if name.lower() == header_name.lower():
+                return value
+        return None
+
+    def add_cached_response(self, format, ignore_html, persist=True):
+        cached_response = {attribute: getattr(self, attribute) for attribute in self.cached_attributes}
+        cached_response["format"] = format
+        cache_size = 1024
+        if self.response_content:
+            cache_size += len(self.response_content)
+            # rough estimate of the memory needed by parsed (JSON) responses
+            if isinstance(self.parse_response, dict | list):
+                cache_size += len(self.response_content)
+        aliases = []
+        if self.redirect_url:
+            aliases.append(self.get_response_cache_key(self.redirect_url, ignore_html))
+        cache_key = self.get_response_cache_key(self.request_url, ignore_html)
+        self.response_cache.set(cache_key, cached_response, cache_size, aliases)
+        if persist and self.disk_cache:
+            self.disk_cache.set(
+                cache_key, cached_response, self.get_validator("ETag"), self.get_validator("Last-Modified")
+            )
+
+    def revalidate_disk_cache(self, metric_id, ignore_html):
+        # background revalidation of a stale response, always sends a conditional request
+        revalidation_helper = RequestHelper(self.request_url, logging.getLogger(__name__))
+        revalidation_helper.accept_type = self.accept_type
+        revalidation_helper.authtoken = self.authtoken
+        revalidation_helper.tokentype = self.tokentype
+        revalidation_helper.revalidate = True
+        revalidation_helper.content_negotiate(metric_id, ignore_html)
 
     def setAuthToken(self, authtoken, tokentype):
         if isinstance(authtoken, str):
@@ -119,6 +202,76 @@ class RequestHelper:
     def getResponseHeader(self):
         return dict(self.response_header)
 
+    def set_redirects(self, response):
+        # collect all redirects (url, status) which have been followed to receive the response
+        self.redirect_list = []
+        self.redirect_status_list = []
+        for hi, history_response in enumerate(response.history):
+            if hi + 1 < len(response.history):
+                newurl = response.history[hi + 1].url
+            else:
+                newurl = response.url
+            self.redirect_list.append(newurl)
+            self.redirect_status_list.append((newurl, history_response.status_code))
+        if self.redirect_list:
+            self.redirect_url = self.redirect_list[-1]
+
+    def get_resolved_response(self, session, request_headers, metric_id):
+        """GET request of request_url, a PID URL with a cached resolution is requested at its final URL directly,
+        a cached failed resolution returns a response with its status code without any request"""
+        # resolutions with credentials are not shared
+        use_cache = not self.authtoken and ResolverCache.is_cacheable(self.request_url)
+        resolution = ResolverCache.get(self.request_url, self.accept_type) if use_cache else None
+        if resolution:
+            if resolution["status"] >= 400:
+                self.logger.info(
+                    f"{metric_id} : Using cached failed resolution of -: {self.request_url}, status {resolution['status']}"
+                )
+                self.redirect_list = resolution["redirect_list"]
+                self.redirect_status_list = [tuple(status) for status in resolution["redirect_status_list"]]
+                response = requests.Response()
+                response.status_code = resolution["status"]
+                response.url = resolution["url"]
+                response.reason = "Cached"
+                response._content = b""
+                response._content_consumed = True
+                return response
+            try:
+                response = HTTPTransport.get(
+                    resolution["url"], session=session, headers=request_headers, timeout=10, stream=True
+                )
+                if response.status_code == resolution["status"]:
+                    self.logger.info(f"{metric_id} : Using cached resolution of -: {self.request_url}")
+                    self.set_redirects(response)
+                    self.redirect_list = resolution["redirect_list"] + self.redirect_list
+                    self.redirect_status_list = [
+                        tuple(status) for status in resolution["redirect_status_list"]
+                    ] + self.redirect_status_list
+                    if self.redirect_list:
+                        self.redirect_url = self.redirect_list[-1]
+                    return response
+                response.close()
+            except TimeBudgetExceededError:
+                raise
+            except requests.exceptions.RequestException:
+                pass
+            # the resolution has changed
+            ResolverCache.delete(self.request_url, self.accept_type)
+        response = HTTPTransport.get(
+            self.request_url, session=session, headers=request_headers, timeout=10, stream=True
+        )
+        self.set_redirects(response)
+        if use_cache:
+            ResolverCache.set(
+                self.request_url,
+                self.accept_type,
+                response.url,
+                self.redirect_list,
+                self.redirect_status_list,
+                response.status_code,
+            )
+        return response
+
     def content_decode(self, content):
         if isinstance(content, "str"):
             pass
@@ -132,79 +285,118 @@ class RequestHelper:
         if self.request_url is not None:
             try:
                 self.logger.info(f"{metric_id} : Retrieving page -: {self.request_url} as {self.accept_type}")
-                urllib.request.HTTPRedirectHandler.http_error_308 = urllib.request.HTTPRedirectHandler.http_error_301
-
-                cookiejar = http.cookiejar.MozillaCookieJar()
-                context = ssl._create_unverified_context()
-                context.set_ciphers("DEFAULT@SECLEVEL=1")
-                redirect_handler = FUJIHTTPRedirectHandler()
-                opener = urllib.request.build_opener(
-                    urllib.request.HTTPCookieProcessor(cookiejar),
-                    urllib.request.HTTPSHandler(context=context),
-                    urllib.request.HTTPHandler(),
-                    redirect_handler,
-                )
-                urllib.request.install_opener(opener)
+                cached_response = None
+                if not self.revalidate:
+                    cached_response = self.get_cached_response(ignore_html)
+                if cached_response:
+                    self.logger.info(
+                        f"{metric_id} : Using Cached response content of -: {self.request_url}, {self.accept_type}"
+                    )
+                    return cached_response.get("format"), self.parse_response
+                session = HTTPTransport.get_session()
                 request_headers = {"Accept": self.accept_type, "User-Agent": "F-UJI"}
                 if self.authtoken:
                     request_headers["Authorization"] = self.tokentype + " " + self.authtoken
-                tp_request = urllib.request.Request(self.request_url, headers=request_headers)
+                cache_key = self.get_response_cache_key(self.request_url, ignore_html)
+                stored_response = None
+                if self.disk_cache:
+                    stored_response = self.disk_cache.get(cache_key)
+                if stored_response and not self.revalidate:
+                    if self.disk_cache.is_fresh(stored_response) or self.disk_cache.is_stale_usable(stored_response):
+                        if not self.disk_cache.is_fresh(stored_response):
+                            self.disk_cache.start_revalidation(
+                                cache_key, lambda: self.revalidate_disk_cache(metric_id, ignore_html)
+                            )
+                        self.set_cached_attributes(stored_response)
+                        self.add_cached_response(stored_response.get("format"), ignore_html, persist=False)
+                        self.logger.info(
+                            f"{metric_id} : Using Stored response content of -: {self.request_url}, {self.accept_type}"
+                        )
+                        return stored_response.get("format"), self.parse_response
+                if stored_response:
+                    request_headers.update(self.disk_cache.get_conditional_headers(stored_response))
                 try:
-                    tp_response = opener.open(tp_request, timeout=10)
-                    self.redirect_list = redirect_handler.redirect_list
-                    self.redirect_status_list = redirect_handler.redirect_status_list
-                    self.redirect_url = redirect_handler.redirect_url
-                except urllib.error.HTTPError as e:
-                    self.response_status = int(e.code)
-                    try:
-                        self.redirect_url = redirect_handler.redirect_url
-                        self.redirect_list = redirect_handler.redirect_list
-                        self.redirect_status_list = redirect_handler.redirect_status_list
-                    except:
-                        pass
-                    if e.code == 308:
-                        self.logger.error(
-                            "%s : F-UJI 308 redirect failed, most likely this patch: https://github.com/python/cpython/pull/19588/commits is not installed"
-                            % metric_id
+                    if stored_response:
+                        # conditional request of the stored response
+                        tp_response = HTTPTransport.get(
+                            self.request_url, session=session, headers=request_headers, timeout=10, stream=True
                         )
-                    elif e.code >= 500:
+                        self.set_redirects(tp_response)
+                    else:
+                        tp_response = self.get_resolved_response(session, request_headers, metric_id)
+                    tp_response.raise_for_status()
+                    if tp_response.status_code == 304 and stored_response:
+                        self.disk_cache.refresh(
+                            cache_key, tp_response.headers.get("ETag"), tp_response.headers.get("Last-Modified")
+                        )
+                        self.set_cached_attributes(stored_response)
+                        self.add_cached_response(stored_response.get("format"), ignore_html, persist=False)
+                        self.logger.info(
+                            f"{metric_id} : Stored response content is still valid (304) -: {self.request_url}, {self.accept_type}"
+                        )
+                        return stored_response.get("format"), self.parse_response
+                except requests.exceptions.HTTPError as e:
+                    self.response_status = int(e.response.status_code)
+                    e.response.close()
+                    tp_response = None
+                    if self.response_status >= 500:
                         if "doi.org" in self.request_url:
                             self.logger.error(
                                 "{} : DataCite/DOI content negotiation failed, status code -: {}, {} - {}".format(
-                                    metric_id, self.request_url, self.accept_type, str(e.code)
+                                    metric_id, self.request_url, self.accept_type, str(self.response_status)
                                 )
                             )
                         else:
                             self.logger.error(
                                 "{} : Request failed, status code -: {}, {} - {}".format(
-                                    metric_id, self.request_url, self.accept_type, str(e.code)
+                                    metric_id, self.request_url, self.accept_type, str(self.response_status)
                                 )
                             )
-                    elif e.code == 400:
+                    elif self.response_status == 400:
                         try:
                             # browsers automatically redirect to https in case a 400 occured for a http URL
-                            if redirect_handler.redirect_list:
-                                last_redirect_url = redirect_handler.redirect_list[-1]
+                            if self.redirect_list:
+                                last_redirect_url = self.redirect_list[-1]
                                 if "http://" in last_redirect_url:
                                     self.logger.warning(
                                         "{} : HTTP 400 Error after redirect to http page , trying to redirect to https page for -: {}".format(
-                                            metric_id, redirect_handler.redirect_list[-1]
+                                            metric_id, self.redirect_list[-1]
                                         )
                                     )
                                     # This is what Browsers sometimes do:
                                     last_redirect_url = last_redirect_url.replace("http:", "https:")
-                                    tp_request = urllib.request.Request(last_redirect_url, headers=request_headers)
-                                    tp_response = opener.open(tp_request, timeout=10)
+                                    tp_response = HTTPTransport.get(
+                                        last_redirect_url,
+                                        session=session,
+                                        headers=request_headers,
+                                        timeout=10,
+                                        stream=True,
+                                    )
+                                    tp_response.raise_for_status()
                         except Exception as e:
                             print("Redirect fix error:" + str(e))
-                            pass
+                            tp_response = None
                     else:
                         self.logger.warning(
                             "{} : Request failed, status code -: {}, {} - {}".format(
-                                metric_id, self.request_url, self.accept_type, str(e.code)
+                                metric_id, self.request_url, self.accept_type, str(self.response_status)
+                            )
+                        )
+                except TimeBudgetExceededError as e:
+                    # reported once per metric, all further requests of the assessment are skipped as well
+                    if Deadline.get_current().is_first_report(metric_id):
+                        self.logger.warning(f"{metric_id} : Time budget exceeded -: {e}")
+                    self.response_status = 603
+                except HostUnavailableError as e:
+                    # reported once per metric, the host failed before
+                    if HostCircuitBreaker.is_first_report(self.logger, metric_id, e.host):
+                        self.logger.warning(
+                            "{} : Request failed, host is unavailable after repeated connection errors -: {}".format(
+                                metric_id, str(e)
                             )
                         )
-                except urllib.error.URLError as e:
+                    self.response_status = 900
+                except requests.exceptions.ConnectionError as e:
                     self.logger.warning(
                         "{} : Request failed, reason -: {}, {} - URLError: {}".format(
                             metric_id, self.request_url, self.accept_type, str(e)
@@ -219,13 +411,6 @@ class RequestHelper:
                             self.response_status = int(urlerrmatch[1])
                     except:
                         pass
-
-                    try:
-                        self.redirect_url = redirect_handler.redirect_url
-                        self.redirect_list = redirect_handler.redirect_list
-                        self.redirect_status_list = redirect_handler.redirect_status_list
-                    except:
-                        pass
                 except Exception as e:
                     print("Request ERROR: ", e)
                     self.logger.warning(
@@ -233,13 +418,6 @@ class RequestHelper:
                             metric_id, self.request_url, self.accept_type, str(e)
                         )
                     )
-                    # some internal status messages for optional analysis
-                    try:
-                        self.redirect_url = redirect_handler.redirect_url
-                        self.redirect_list = redirect_handler.redirect_list
-                        self.redirect_status_list = redirect_handler.redirect_status_list
-                    except:
-                        pass
                     if "NewConnectionError" in str(e):
                         self.response_status = 601
                     elif "RemoteDisconnected" in str(e):
@@ -255,23 +433,23 @@ class RequestHelper:
                     # self.logger.info('FsF-F2-01M : Trying to identify some EMBEDDED metadata in content retrieved during PID verification process (FsF-F1-02D)')
                     metric_id = "FsF-F2-01M"
 
-                if tp_response:
+                if tp_response is not None:
                     # self.http_response = tp_response
-                    if tp_response.info().get("Content-Encoding") == "gzip":
-                        self.logger.info("FsF-F2-01M : Retrieving gzipped content")
-                        self.response_content = gzip.decompress(self.response_content)
-                    if tp_response.info().get("Content-Type") == "application/zip":
+                    # gzip or deflate encoded content is transparently decoded by the transport
+                    if tp_response.headers.get("Content-Type") == "application/zip":
                         self.logger.warning(
                             "FsF-F2-01M : Received zipped content which contains several files, therefore skipping tests"
                         )
                         self.response_content = None
                         format = None
                         # source = 'zip'
-                    if tp_response.info().get_content_charset():
-                        self.response_charset = tp_response.info().get_content_charset()
-                    self.response_header = tp_response.getheaders()
-                    self.redirect_url = tp_response.geturl()
-                    self.response_status = status_code = tp_response.status
+                    content_type_header = Message()
+                    content_type_header["Content-Type"] = tp_response.headers.get("Content-Type", "")
+                    if content_type_header.get_content_charset():
+                        self.response_charset = content_type_header.get_content_charset()
+                    self.response_header = list(tp_response.raw.headers.items())
+                    self.redirect_url = tp_response.url
+                    self.response_status = status_code = tp_response.status_code
                     self.logger.info(
                         "{} : Content negotiation on {} accept={}, status={} ".format(
                             metric_id, self.request_url, self.accept_type, str(status_code)
@@ -312,7 +490,7 @@ class RequestHelper:
                                         metric_id, str(self.max_content_size)
                                     )
                                 )
-                            self.response_content = tp_response.read(self.max_content_size)
+                            self.response_content = tp_response.raw.read(self.max_content_size, decode_content=True)
                             if self.content_size == 0:
                                 self.content_size = sys.getsizeof(self.response_content)
                             # try to find out if content type is byte then fix
@@ -336,7 +514,7 @@ class RequestHelper:
                             if self.content_type is None:
                                 self.content_type = mimetypes.guess_type(self.request_url, strict=True)[0]
                             if self.content_type is None:
-                                # just in case tika is not running use this as quick check for the most obvious
+                                # quick check for the most obvious
                                 try:
                                     if (
                                         re.search(
@@ -348,9 +526,10 @@ class RequestHelper:
                                 except Exception as e:
                                     print(e, "Request helper")
                             if self.content_type is None:
-                                parsedFile = parser.from_buffer(self.response_content)
-                                self.content_type = parsedFile.get("metadata").get("Content-Type")
-                            if "application/xhtml+xml" in self.content_type:
+                                self.content_type = ContentInspector.get_content_type(
+                                    self.response_content, self.logger, metric_id
+                                )
+                            if self.content_type and "application/xhtml+xml" in self.content_type:
                                 try:
                                     if (
                                         re.search(
@@ -479,26 +658,24 @@ class RequestHelper:
                                     "content_size": self.content_size,
                                     "content_truncated": content_truncated,
                                 }
+                                self.add_cached_response(format, ignore_html)
                             else:
                                 self.logger.warning(f"{metric_id} : Content-type is NOT SPECIFIED")
                         else:
                             self.logger.warning(
                                 f"{metric_id} : NO successful response received, status code -: {status_code!s}"
                             )
-                    tp_response.close()
                 else:
                     self.logger.warning(
                         f"{metric_id} : No response received from -: {self.request_url}, {self.accept_type}"
                     )
-            # except requests.exceptions.SSLError as e:
-            except urllib.error.HTTPError as e:
-                self.logger.warning(
-                    f"{metric_id} : Content negotiation failed -: accept={self.accept_type}, status={e.code!s} "
-                )
-                self.response_status = int(e.code)
-            except urllib.error.URLError as e:
-                self.logger.warning(f"{metric_id} : RequestException -: {e.reason} : {self.request_url}")
+            except requests.exceptions.RequestException as e:
+                self.logger.warning(f"{metric_id} : RequestException -: {e!s} : {self.request_url}")
             except Exception as e:
                 print(e, "Request helper")
                 self.logger.warning(f"{metric_id} : Request Failed -: {e!s} : {self.request_url}")
+            finally:
+                # release the connection back to the shared pool
+                if tp_response is not None:
+                    tp_response.close()
         return format, self.parse_response
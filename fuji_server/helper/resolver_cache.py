@@ -0,0 +1,236 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryResolverCacheBackend:
+    """Resolutions kept in the memory of this process, at most max_entries (least recently used are removed)"""
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = int(max_entries)
+        self._entries = OrderedDict()  # key: (expires, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            if cached[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return json.loads(cached[1])
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + ttl, json.dumps(value))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteResolverCacheBackend:
+    """Resolutions kept in a SQLite file, shared by all worker processes of a host and kept across restarts"""
+
+    def __init__(self, path, max_entries=100000):
+        self.path = path
+        self.max_entries = int(max_entries)
+        self._local = threading.local()
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = self._get_connection()
+        connection.execute("CREATE TABLE IF NOT EXISTS resolutions (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS resolutions_expires ON resolutions (expires)")
+        connection.commit()
+
+    def _get_connection(self):
+        # sqlite connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        row = (
+            self._get_connection()
+            .execute("SELECT value FROM resolutions WHERE key = ? AND expires >= ?", (key, time.time()))
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        connection = self._get_connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO resolutions (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl),
+            )
+            connection.execute("DELETE FROM resolutions WHERE expires < ?", (time.time(),))
+            # remove the entries which expire first if there are too many
+            connection.execute(
+                "DELETE FROM resolutions WHERE key IN (SELECT key FROM resolutions ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def delete(self, key):
+        connection = self._get_connection()
+        with connection:
+            connection.execute("DELETE FROM resolutions WHERE key = ?", (key,))
+
+    def clear(self):
+        connection = self._get_connection()
+        with connection:
+            connection.execute("DELETE FROM resolutions")
+
+
+class RedisResolverCacheBackend:
+    """Resolutions kept in a Redis (compatible) server shared by all workers, needs the redis package"""
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="fuji:resolution:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+class ResolverCache:
+    """Shared cache of PID resolutions (e.g. https://doi.org/10.xxx -> landing page).
+
+    A resolution contains the final URL, the redirect chain, the redirect status codes, the final status code
+    and the time it has been resolved. Successful resolutions are kept for ttl, failed ones (final status >= 400)
+    for negative_ttl seconds. Only URLs of PID resolvers are cached, the redirects of other URLs may depend on
+    sessions etc. Resolutions depend on the Accept header, e.g. DOI content negotiation.
+    """
+
+    backends = {
+        "memory": MemoryResolverCacheBackend,
+        "sqlite": SQLiteResolverCacheBackend,
+        "redis": RedisResolverCacheBackend,
+    }
+    resolver_hosts = [
+        "doi.org",
+        "dx.doi.org",
+        "hdl.handle.net",
+        "n2t.net",
+        "identifiers.org",
+        "purl.org",
+        "purl.archive.org",
+        "w3id.org",
+        "www.w3id.org",
+        "nbn-resolving.org",
+        "nbn-resolving.de",
+        "urn.fi",
+        "urn.nb.no",
+        "urn.kb.se",
+    ]
+    ttl = 86400
+    negative_ttl = 600
+
+    backend = MemoryResolverCacheBackend()
+
+    @classmethod
+    def set_options(cls, backend=None, path=None, url=None, ttl=None, negative_ttl=None, max_entries=None):
+        if backend:
+            if backend not in cls.backends:
+                raise ValueError(f"Unknown resolver cache backend: {backend}")
+            if backend == "sqlite":
+                cls.backend = SQLiteResolverCacheBackend(path, **({"max_entries": max_entries} if max_entries else {}))
+            elif backend == "redis":
+                cls.backend = RedisResolverCacheBackend(**({"url": url} if url else {}))
+            else:
+                cls.backend = MemoryResolverCacheBackend(**({"max_entries": max_entries} if max_entries else {}))
+        if ttl is not None:
+            cls.ttl = float(ttl)
+        if negative_ttl is not None:
+            cls.negative_ttl = float(negative_ttl)
+
+    @classmethod
+    def is_cacheable(cls, url):
+        try:
+            return urlparse(url).netloc.lower() in cls.resolver_hosts
+        except Exception:
+            return False
+
+    @staticmethod
+    def get_key(url, accept_type):
+        return hashlib.sha256(json.dumps([url, accept_type]).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get(cls, url, accept_type):
+        if not cls.is_cacheable(url):
+            return None
+        try:
+            return cls.backend.get(cls.get_key(url, accept_type))
+        except Exception as e:
+            # a cache which is not available must not break the evaluation
+            logger.warning(f"Resolver cache error -: {e}")
+            return None
+
+    @classmethod
+    def set(cls, url, accept_type, final_url, redirect_list, redirect_status_list, status):
+        if not cls.is_cacheable(url):
+            return False
+        resolution = {
+            "url": final_url,
+            "redirect_list": list(redirect_list),
+            "redirect_status_list": [list(status) for status in redirect_status_list],
+            "status": status,
+            "resolved_at": time.time(),
+        }
+        ttl = cls.ttl if status < 400 else cls.negative_ttl
+        if ttl <= 0:
+            return False
+        try:
+            cls.backend.set(cls.get_key(url, accept_type), resolution, ttl)
+            return True
+        except Exception as e:
+            logger.warning(f"Resolver cache error -: {e}")
+            return False
+
+    @classmethod
+    def delete(cls, url, accept_type):
+        try:
+            cls.backend.delete(cls.get_key(url, accept_type))
+        except Exception as e:
+            logger.warning(f"Resolver cache error -: {e}")
+
+    @classmethod
+    def clear(cls):
+        cls.backend.clear()
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """A bounded, thread safe LRU cache for content negotiation responses.
+
+    Entries are evicted in least recently used order as soon as the total (approximate) size of all entries
+    exceeds max_size bytes, entries older than ttl seconds are treated as missing.
+    Entries can be reachable by additional alias keys (e.g. the final URL after redirects).
+    """
+
+    def __init__(self, max_size=50000000, ttl=600):
+        self.max_size = int(max_size)
+        self.ttl = float(ttl)
+        self.total_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key: (timestamp, size, entry, alias keys)
+        self._aliases = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            primary_key = self._aliases.get(key, key)
+            cached = self._entries.get(primary_key)
+            if cached is not None and time.monotonic() - cached[0] > self.ttl:
+                self._remove(primary_key)
+                cached = None
+            if cached is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(primary_key)
+            self.hits += 1
+            entry = cached[2]
+        # parsed responses (e.g. JSON dicts) are mutable, so every caller gets its own copy
+        return {k: copy.deepcopy(v) if isinstance(v, dict | list) else v for k, v in entry.items()}
+
+    def set(self, key, entry, size, aliases=None):
+        if not self.enabled or size > self.max_size:
+            return False
+        entry = {k: copy.deepcopy(v) if isinstance(v, dict | list) else v for k, v in entry.items()}
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            aliases = [alias for alias in aliases or [] if alias != key]
+            self._entries[key] = (time.monotonic(), size, entry, aliases)
+            self.total_size += size
+            for alias in aliases:
+                self._aliases[alias] = key
+            while self.total_size > self.max_size and self._entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def _remove(self, key):
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self.total_size -= cached[1]
+            for alias in cached[3]:
+                if self._aliases.get(alias) == key:
+                    del self._aliases[alias]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+            self.total_size = 0
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size": self.total_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
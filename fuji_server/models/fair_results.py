@@ -9,6 +9,7 @@ from datetime import date, datetime  # noqa: F401
 from fuji_server import util
 from fuji_server.models.any_of_fair_results_results_items import AnyOfFAIRResultsResultsItems
 from fuji_server.models.base_model_ import Model
+from fuji_server.models.debug import Debug
 
 
 class FAIRResults(Model):
@@ -31,6 +32,7 @@ class FAIRResults(Model):
         total_metrics: int | None = None,
         summary: dict | None = None,
         results: list[AnyOfFAIRResultsResultsItems] | None = None,
+        test_debug: Debug = None,
     ):
         """FAIRResults - a model defined in Swagger
 
@@ -58,6 +60,8 @@ class FAIRResults(Model):
         :type summary: Dict
         :param results: The results of this FAIRResults.  # noqa: E501
         :type results: List[AnyOfFAIRResultsResultsItems]
+        :param test_debug: The test_debug of this FAIRResults.  # noqa: E501
+        :type test_debug: Debug
         """
         self.swagger_types = {
             "test_id": str,
@@ -72,6 +76,7 @@ class FAIRResults(Model):
             "total_metrics": int,
             "summary": dict,
             "results": list[AnyOfFAIRResultsResultsItems],
+            "test_debug": Debug,
         }
 
         self.attribute_map = {
@@ -87,6 +92,7 @@ class FAIRResults(Model):
             "total_metrics": "total_metrics",
             "summary": "summary",
             "results": "results",
+            "test_debug": "test_debug",
         }
         self._test_id = test_id
         self._request = request
@@ -100,6 +106,7 @@ class FAIRResults(Model):
         self._total_metrics = total_metrics
         self._summary = summary
         self._results = results
+        self._test_debug = test_debug
 
     @classmethod
     def from_dict(cls, dikt) -> "FAIRResults":
@@ -363,3 +370,26 @@ class FAIRResults(Model):
         """
 
         self._results = results
+
+    @property
+    def test_debug(self) -> Debug:
+        """Gets the test_debug of this FAIRResults.
+
+        Debug messages of the assessment which do not belong to a single metric  # noqa: E501
+
+        :return: The test_debug of this FAIRResults.
+        :rtype: Debug
+        """
+        return self._test_debug
+
+    @test_debug.setter
+    def test_debug(self, test_debug: Debug):
+        """Sets the test_debug of this FAIRResults.
+
+        Debug messages of the assessment which do not belong to a single metric  # noqa: E501
+
+        :param test_debug: The test_debug of this FAIRResults.
+        :type test_debug: Debug
+        """
+
+        self._test_debug = test_debug
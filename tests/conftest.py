@@ -6,15 +6,16 @@ from __future__ import annotations
 
 import configparser
 import shutil
-import time
 from mimetypes import types_map
 from pathlib import Path
 from typing import TYPE_CHECKING
-from unittest import mock
 
 import pytest
+from pyld import jsonld
 
 from fuji_server.app import create_app
+from fuji_server.helper.host_circuit_breaker import HostCircuitBreaker
+from fuji_server.helper.jsonld_document_loader import JsonLdDocumentLoader
 from fuji_server.helper.preprocessor import Preprocessor
 
 if TYPE_CHECKING:
@@ -56,6 +57,12 @@ def test_config():
     return config
 
 
+@pytest.fixture(autouse=True)
+def available_hosts(monkeypatch):
+    """Hosts which failed in one test (e.g. without network access) must not fail fast in the following tests"""
+    monkeypatch.setattr(HostCircuitBreaker, "_hosts", {})
+
+
 @pytest.fixture
 def temporary_data_directory(tmp_path):
     """Create a temporary data directory and copy fuji_server/data into it."""
@@ -77,11 +84,7 @@ def preprocessor(test_config) -> Preprocessor:
     isDebug = True
     preprocessor.retrieve_licenses(isDebug)
 
-    # mock getmtime to suppress downloading repo information
-    with mock.patch("os.path.getmtime") as mock_getmtime:
-        seconds_since_epoch = int(time.time())
-        mock_getmtime.return_value = seconds_since_epoch
-        preprocessor.retrieve_datacite_re3repos()
+    preprocessor.retrieve_datacite_re3repos()
 
     preprocessor.retrieve_metadata_standards()
     preprocessor.retrieve_linkedvocabs(lov_api=LOV_API, lodcloud_api=LOD_CLOUDNET, isDebugMode=isDebug)
@@ -108,7 +111,16 @@ def temporary_preprocessor(temporary_data_directory) -> Preprocessor:
 
 
 @pytest.fixture(scope="session")
-def app(test_config) -> Flask:
+def jsonld_document_loader():
+    """Installs the JsonLdDocumentLoader as pyld document loader like the server does and restores the prior one"""
+    prior_loader = jsonld.get_document_loader()
+    JsonLdDocumentLoader.install()
+    yield JsonLdDocumentLoader
+    jsonld.set_document_loader(prior_loader)
+
+
+@pytest.fixture(scope="session")
+def app(test_config, jsonld_document_loader) -> Flask:
     _app = create_app(test_config)
     _app.testing = True
     return _app
@@ -2,6 +2,8 @@
 #
 # SPDX-License-Identifier: MIT
 
+import logging
+
 import pytest
 
 from fuji_server.controllers.fair_check import FAIRCheck
@@ -30,3 +32,29 @@ def test_harvest_all_metadata(fair_check: FAIRCheck) -> None:
     assert fair_check.origin_url == UID
     assert fair_check.pid_url == UID
     assert fair_check.pid_scheme == "doi"
+
+
+def test_assessments_of_the_same_identifier_have_separate_loggers() -> None:
+    first = FAIRCheck(uid=UID, test_debug=DEBUG)
+    second = FAIRCheck(uid=UID, test_debug=DEBUG)
+    assert first.test_id == second.test_id
+    assert first.logger is not second.logger
+    first.logger.info("FsF-F1-01D : first assessment")
+    second.logger.info("FsF-F1-01D : second assessment")
+    assert first.get_log_messages_dict()["FsF-F1-01D"] == ["INFO: first assessment"]
+    assert second.get_log_messages_dict()["FsF-F1-01D"] == ["INFO: second assessment"]
+    first.close_logger()
+    assert first.logger.handlers == []
+    assert second.logger.handlers
+    second.close_logger()
+
+
+def test_closed_loggers_are_released() -> None:
+    fair_check = FAIRCheck(uid=UID, test_debug=DEBUG)
+    logger = fair_check.logger
+    fair_check.close_logger()
+    logger_dict = logging.Logger.manager.loggerDict
+    assert logger.name not in logger_dict
+    assert not any(
+        logger in entry.loggerMap for entry in logger_dict.values() if isinstance(entry, logging.PlaceHolder)
+    )
@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the AssessmentSummary which aggregates metric results by FAIR category and principle
+"""
+from fuji_server.helper.assessment_summary import AssessmentSummary
+
+RESULTS = [
+    {"metric_identifier": "FsF-F1-01D", "maturity": 3, "score": {"earned": 1, "total": 1}, "test_status": "pass"},
+    {"metric_identifier": "FsF-F2-01M", "maturity": 1, "score": {"earned": 0.5, "total": 2}, "test_status": "fail"},
+    {"metric_identifier": "FsF-A1-01M", "maturity": 0, "score": {"earned": 0, "total": 1}, "test_status": "fail"},
+    {"metric_identifier": "FsF-R1.1-01M", "maturity": 2, "score": {"earned": 1, "total": 2}, "test_status": "pass"},
+]
+
+# as computed by the former pandas implementation
+EXPECTED_SUMMARY = {
+    "score_earned": {"A": 0.0, "F": 1.5, "R": 1.0, "A1": 0.0, "F1": 1.0, "F2": 0.5, "R1.1": 1.0, "FAIR": 2.5},
+    "score_total": {"A": 1, "F": 3, "R": 2, "A1": 1, "F1": 1, "F2": 2, "R1.1": 2, "FAIR": 6.0},
+    "score_percent": {"A": 0.0, "F": 50.0, "R": 50.0, "A1": 0.0, "F1": 100.0, "F2": 25.0, "R1.1": 50.0, "FAIR": 41.67},
+    "status_total": {"A1": 1, "F1": 1, "F2": 1, "R1.1": 1, "A": 1, "F": 2, "R": 1, "FAIR": 4},
+    "status_passed": {"A1": 0, "F1": 1, "F2": 0, "R1.1": 1, "A": 0, "F": 1, "R": 1, "FAIR": 2},
+    "maturity": {"A": 0, "F": 2, "R": 2, "A1": 0, "F1": 3, "F2": 1, "R1.1": 2, "FAIR": 1.0},
+}
+
+
+def test_summary():
+    summary = AssessmentSummary.summarise(AssessmentSummary.get_rows(RESULTS))
+    assert summary == EXPECTED_SUMMARY
+    assert list(summary) == list(EXPECTED_SUMMARY)
+    for key, values in EXPECTED_SUMMARY.items():
+        assert list(summary[key]) == list(values)
+        assert [type(v) for v in summary[key].values()] == [type(v) for v in values.values()]
+
+
+def test_batch_summary():
+    summaries = AssessmentSummary.summarise_all([RESULTS, RESULTS[:1]])
+    assert summaries[0] == EXPECTED_SUMMARY
+    assert summaries[1]["score_percent"] == {"F": 100.0, "F1": 100.0, "FAIR": 100.0}
@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the BatchJobQueue which runs batch evaluations in the background
+"""
+import threading
+import time
+
+import pytest
+import requests
+
+from fuji_server.helper.batch_job_queue import BatchJobQueue
+from fuji_server.helper.host_circuit_breaker import HostCircuitBreaker
+from fuji_server.models.fair_results import FAIRResults
+
+
+@pytest.fixture
+def batch_queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(HostCircuitBreaker, "_hosts", {})
+    monkeypatch.setattr(BatchJobQueue, "max_workers", 1)
+    monkeypatch.setattr(BatchJobQueue, "max_per_host", 1)
+    monkeypatch.setattr(BatchJobQueue, "max_attempts", 2)
+    monkeypatch.setattr(BatchJobQueue, "retry_backoff", 0)
+    monkeypatch.setattr(BatchJobQueue, "poll_interval", 0.01)
+    monkeypatch.setattr(BatchJobQueue, "path", str(tmp_path / "batch_queue.sqlite"))
+    monkeypatch.setattr(BatchJobQueue, "_local", threading.local())
+    monkeypatch.setattr(BatchJobQueue, "_served", {})
+    monkeypatch.setattr(BatchJobQueue, "_sequence", 0)
+    yield BatchJobQueue
+    BatchJobQueue.stop(timeout=10)
+
+
+def wait_until_finished(batch_id):
+    for _ in range(500):
+        status = BatchJobQueue.get_status(batch_id)
+        if status["status"] == "finished":
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"batch not finished -: {status}")
+
+
+def test_batch_jobs_are_fair_and_retried(batch_queue):
+    evaluated = []
+    lock = threading.Lock()
+
+    def evaluate(body, allow_remote_logging, deadline):
+        identifier = body["object_identifier"]
+        with lock:
+            evaluated.append(identifier)
+            attempts = evaluated.count(identifier)
+        if identifier.endswith("/flaky") and attempts == 1:
+            raise requests.exceptions.ConnectionError("connection reset")
+        if identifier.endswith("/broken"):
+            raise ValueError("not evaluable")
+        return FAIRResults(request=body, metric_version=body["metric_version"], total_metrics=0, results=[])
+
+    identifiers = [
+        "https://a.example.org/1",
+        "https://a.example.org/2",
+        "https://a.example.org/3",
+        "https://doi.org/10.1234/flaky",
+        "10.5678/broken",
+    ]
+    batch_id = batch_queue.submit(identifiers, {"metric_version": "metrics_v0.5", "auth_token": "secret"})
+    assert batch_queue.get_status(batch_id)["status"] == "queued"
+    batch_queue.start(evaluate)
+    status = wait_until_finished(batch_id)
+    assert (status["total"], status["succeeded"], status["failed"]) == (5, 4, 1)
+
+    # the repositories take turns instead of the first one blocking the single worker
+    assert evaluated[:4] == [
+        "https://a.example.org/1",
+        "https://doi.org/10.1234/flaky",
+        "10.5678/broken",
+        "https://a.example.org/2",
+    ]
+    assert evaluated.count("https://doi.org/10.1234/flaky") == 2
+    assert evaluated.count("10.5678/broken") == 1
+
+    first_page = batch_queue.get_results(batch_id, page=1, page_size=3)
+    assert first_page["total"] == 5
+    assert [job["object_identifier"] for job in first_page["results"]] == identifiers[:3]
+    assert first_page["results"][0]["result"]["metric_version"] == "metrics_v0.5"
+    flaky, broken = batch_queue.get_results(batch_id, page=2, page_size=3)["results"]
+    assert (flaky["status"], flaky["attempts"]) == ("succeeded", 2)
+    assert (broken["status"], broken["error"]) == ("failed", "not evaluable")
+    assert batch_queue.get_results(batch_id, status="failed")["total"] == 1
+    # the authentication token is used but not stored in the queue
+    assert "secret" not in (batch_queue._get_connection().execute("SELECT options FROM batches").fetchone()[0])
+    assert batch_id not in batch_queue._auth_tokens
+
+
+def test_finished_batches_are_deleted_after_retention(batch_queue, monkeypatch):
+    monkeypatch.setattr(BatchJobQueue, "retention", 3600)
+
+    def evaluate(body, allow_remote_logging, deadline):
+        return FAIRResults(request=body, metric_version="metrics_v0.5", total_metrics=0, results=[])
+
+    finished_id = batch_queue.submit(["https://a.example.org/1"], {})
+    batch_queue.start(evaluate)
+    wait_until_finished(finished_id)
+    batch_queue.stop(timeout=10)
+    queued_id = batch_queue.submit(["https://a.example.org/2"], {})
+    assert batch_queue.purge() == 0
+    connection = batch_queue._get_connection()
+    with connection:
+        connection.execute("UPDATE jobs SET finished = finished - 7200 WHERE batch_id = ?", (finished_id,))
+    assert batch_queue.purge() == 1
+    assert batch_queue.get_status(finished_id) is None
+    assert batch_queue.get_results(finished_id)["total"] == 0
+    assert batch_queue.get_status(queued_id)["status"] == "queued"
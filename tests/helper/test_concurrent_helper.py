@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the ConcurrentHelper which runs independent harvesting steps in parallel
+"""
+import logging
+import threading
+import time
+
+from fuji_server.helper.concurrent_helper import ConcurrentHelper, ConcurrentJob
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_jobs_are_merged_in_order():
+    logger = logging.getLogger("test_concurrent_helper")
+    logger.setLevel(logging.INFO)
+    handler = ListHandler()
+    logger.addHandler(handler)
+    merged = []
+
+    def fetch(delay, name):
+        def run(job_logger):
+            time.sleep(delay)
+            job_logger.info("fetched " + name)
+            return name
+
+        return run
+
+    def merge(result):
+        logger.info("merged " + result)
+        merged.append(result)
+
+    jobs = [ConcurrentJob(logger, fetch(0.2, "a"), merge), ConcurrentJob(logger, fetch(0, "b"), merge)]
+    ConcurrentHelper.run_jobs(jobs, max_workers=2)
+    logger.removeHandler(handler)
+    assert merged == ["a", "b"]
+    assert handler.messages == ["fetched a", "merged a", "fetched b", "merged b"]
+
+
+def test_dependent_jobs_wait_for_their_dependencies():
+    logger = logging.getLogger("test_concurrent_helper_dependencies")
+    logger.setLevel(logging.INFO)
+    handler = ListHandler()
+    logger.addHandler(handler)
+    state = []
+    # a and b only pass the barrier if their fetch steps overlap
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fetch(name, wait=False):
+        def run(job_logger):
+            if wait:
+                barrier.wait()
+            job_logger.info("fetched " + name)
+            return len(state)
+
+        return run
+
+    def merge(name):
+        def run(result):
+            state.append(name)
+
+        return run
+
+    jobs = [
+        ConcurrentJob(logger, fetch("a", wait=True), merge("a")),
+        ConcurrentJob(logger, fetch("b", wait=True), merge("b")),
+        ConcurrentJob(logger, fetch("c"), merge("c")),
+    ]
+    # c uses what a and b change, a and b are independent
+    ConcurrentHelper.run_jobs(jobs, max_workers=3, dependencies=[[], [], [0, 1]])
+    logger.removeHandler(handler)
+    assert jobs[0].error is None and jobs[1].error is None
+    assert jobs[2].result == 2
+    assert state == ["a", "b", "c"]
+    assert handler.messages == ["fetched a", "fetched b", "fetched c"]
@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the ContentInspector which detects the content type and text of downloaded files
+"""
+import io
+import zipfile
+
+import pytest
+
+from fuji_server.helper.content_inspector import ContentInspector, SignatureInspector, TikaInspector
+
+NETCDF_HEADER = (
+    b"CDF\x01\x00\x00\x00\x00\x00\x00\x00\x0a\x00\x00\x00\x01\x00\x00\x00\x04time\x00\x00\x00\x0btemperature"
+)
+
+
+def zip_content(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        for name, data in members.items():
+            zip_file.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "content,content_type",
+    [
+        (b"time,temperature\n1,2.5\n2,3.1\n3,2.9", "text/csv"),
+        (b"time\ttemperature\n1\t2.5\n2\t3.1\n3\t2.9\n", "text/tab-separated-values"),
+        (b"Hello, world.\nA second line, with a comma.\nNo comma here.\n", "text/plain"),
+        (b'{"temperature": [2.5, 3.1', "application/json"),
+        (b'<?xml version="1.0"?><dataset><temperature>2.5</temperature></dataset>', "application/xml"),
+        (b"<!DOCTYPE html><html><body>landing page</body></html>", "text/html"),
+        (NETCDF_HEADER, "application/x-netcdf"),
+        (b"\x89HDF\r\n\x1a\n\x00\x00", "application/x-hdf5"),
+        (zip_content({"data/temperature.csv": "time,temperature\n"}), "application/zip"),
+        (
+            zip_content({"mimetype": "application/vnd.oasis.opendocument.spreadsheet"}),
+            "application/vnd.oasis.opendocument.spreadsheet",
+        ),
+    ],
+)
+def test_signature_inspector(content, content_type):
+    assert SignatureInspector.inspect(content)["content_types"][0] == content_type
+
+
+def test_extracted_text():
+    assert "temperature" in SignatureInspector.inspect(NETCDF_HEADER)["text"]
+    content = zip_content({"data/temperature.csv": "time,temperature\n"})
+    assert SignatureInspector.inspect(content[:60])["text"] == "data/temperature.csv"
+
+
+def test_unknown_content_is_passed_to_next_backend(monkeypatch):
+    content = bytes(range(256))
+    assert SignatureInspector.inspect(content) is None
+    monkeypatch.setattr(TikaInspector, "inspect", lambda content: {"content_types": ["application/octet-stream"]})
+    assert ContentInspector.inspect(content)["backend"] == "tika"
+    monkeypatch.setattr(ContentInspector, "backends", ["signature"])
+    assert ContentInspector.inspect(content) is None
+
+
+@pytest.mark.parametrize(
+    "content,content_type",
+    [
+        (b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n", "application/pdf"),
+        (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1\x00\x00", "application/x-tika-msoffice"),
+        (
+            zip_content({"[Content_Types].xml": "<Types/>", "word/document.xml": "<document/>"}),
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        ),
+        (
+            zip_content({"mimetype": "application/vnd.oasis.opendocument.text"}),
+            "application/vnd.oasis.opendocument.text",
+        ),
+        (b"\x1f\x8b\x08\x00\x00\x00\x00\x00", "application/gzip"),
+        (b"\x00" * 257 + b"ustar\x0000", "application/x-tar"),
+    ],
+)
+def test_documents_are_passed_to_next_backend_for_their_text(content, content_type, monkeypatch):
+    assert SignatureInspector.inspect(content)["incomplete"]
+    monkeypatch.setattr(ContentInspector, "backends", ["signature", "tika"])
+    monkeypatch.setattr(
+        TikaInspector,
+        "inspect",
+        lambda content: {"content_types": ["application/octet-stream"], "text": "parsed by tika", "status": 200},
+    )
+    result = ContentInspector.inspect(content)
+    assert (result["backend"], result["text"]) == ("tika", "parsed by tika")
+    assert result["content_types"] == ["application/octet-stream", content_type]
+    # the content type alone does not need tika
+    monkeypatch.setattr(TikaInspector, "inspect", lambda content: pytest.fail("tika asked for the content type"))
+    assert ContentInspector.get_content_type(content) == content_type
+
+
+def test_detected_document_type_is_kept_without_next_backend(monkeypatch):
+    def unavailable(content):
+        raise ConnectionError("no tika server")
+
+    monkeypatch.setattr(ContentInspector, "backends", ["signature", "tika"])
+    monkeypatch.setattr(TikaInspector, "inspect", unavailable)
+    result = ContentInspector.inspect(b"%PDF-1.7\n")
+    assert (result["backend"], result["content_types"]) == ("signature", ["application/pdf"])
+    assert "incomplete" not in result
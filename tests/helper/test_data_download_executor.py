@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the DataDownloadExecutor which runs the data file downloads of all evaluations in a shared pool
+"""
+import logging
+import threading
+import time
+
+from fuji_server.harvester.data_harvester import DataHarvester
+from fuji_server.helper.data_download_executor import DataDownloadExecutor, DownloadBudget
+from fuji_server.helper.http_transport import HTTPTransport
+
+
+class SlowRaw:
+    def stream(self, amt, decode_content=True):
+        for _i in range(100):
+            time.sleep(0.05)
+            yield b"x" * 10
+
+
+class BytesRaw:
+    def __init__(self, content):
+        self.content = content
+
+    def stream(self, amt, decode_content=True):
+        yield self.content
+
+
+class FakeResponse:
+    def __init__(self, url, raw, status_code=200, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers or {"content-type": "text/plain"}
+        self.raw = raw
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_downloads_per_host_are_limited(monkeypatch):
+    monkeypatch.setattr(DataDownloadExecutor, "max_downloads_per_host", 2)
+    monkeypatch.setattr(DataDownloadExecutor, "_hosts", {})
+    running = []
+    max_running = []
+    lock = threading.Lock()
+
+    def download():
+        with lock:
+            running.append(1)
+            max_running.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+
+    budget = DownloadBudget(10)
+    futures = [DataDownloadExecutor.submit("https://example.org/data", budget, download) for _i in range(6)]
+    for future in futures:
+        future.result()
+    assert max(max_running) == 2
+    # hosts without downloads are not kept
+    assert DataDownloadExecutor._hosts == {}
+
+
+def test_queued_downloads_of_a_busy_host_do_not_block_other_hosts(monkeypatch):
+    monkeypatch.setattr(DataDownloadExecutor, "max_downloads_per_host", 2)
+    monkeypatch.setattr(DataDownloadExecutor, "_hosts", {})
+    release = threading.Event()
+    budget = DownloadBudget(10)
+    busy = [DataDownloadExecutor.submit("https://a.example.org/data", budget, release.wait) for _i in range(20)]
+    try:
+        other = DataDownloadExecutor.submit("https://b.example.org/data", budget, lambda: "b")
+        assert other.result(timeout=1) == "b"
+        # a queued download can be cancelled before it runs
+        assert busy[-1].cancel()
+    finally:
+        release.set()
+    for future in busy[:-1]:
+        assert future.result(timeout=5)
+    assert DataDownloadExecutor._hosts == {}
+
+
+def test_downloads_are_cancelled_after_budget(monkeypatch):
+    monkeypatch.setattr(DataDownloadExecutor, "time_budget", 0.5)
+    responses = []
+
+    def get(url, **kwargs):
+        responses.append(FakeResponse(url, SlowRaw()))
+        return responses[-1]
+
+    monkeypatch.setattr(HTTPTransport, "get", get)
+    monkeypatch.setattr(DataHarvester, "inspect_content", lambda self, *args: {})
+    data_links = [{"url": "https://example.org/data.txt", "type": "text/plain"}]
+    harvester = DataHarvester(data_links, logging.getLogger(__name__))
+    started = time.monotonic()
+    harvester.retrieve_all_data()
+    assert time.monotonic() - started < 2
+    assert harvester.data == {}
+    # the running download stops at the next chunk and closes its response
+    time.sleep(0.2)
+    assert responses[0].closed
+
+
+def test_partial_content_of_range_request(monkeypatch):
+    requests = []
+
+    def get(url, headers=None, **kwargs):
+        requests.append(headers)
+        response_headers = {"content-type": "text/plain", "content-range": "bytes 0-999/5000"}
+        return FakeResponse(url, BytesRaw(b"x" * 1000), 206, response_headers)
+
+    monkeypatch.setattr(HTTPTransport, "get", get)
+    monkeypatch.setattr(DataHarvester, "inspect_content", lambda self, *args: {})
+    harvester = DataHarvester([{"url": "https://example.org/data.txt"}], logging.getLogger(__name__))
+    harvester.max_download_size = 1000
+    harvester.retrieve_all_data()
+    assert requests[0]["Range"] == "bytes=0-999"
+    fileinfo = harvester.data["https://example.org/data.txt"]
+    assert fileinfo["verified"]
+    assert fileinfo["header_content_size"] == 5000
+    assert fileinfo["content_size"] == 1000
+    assert fileinfo["truncated"]
+
+
+def test_head_request_if_content_is_not_needed(monkeypatch):
+    class FakeRequest:
+        method = "HEAD"
+
+    def head(url, **kwargs):
+        response = FakeResponse(url, None, 200, {"content-type": "text/csv", "content-length": "5000"})
+        response.request = FakeRequest()
+        return response
+
+    monkeypatch.setattr(HTTPTransport, "head", head)
+    harvester = DataHarvester(
+        [{"url": "https://example.org/data.csv"}], logging.getLogger(__name__), metrics=["FsF-R1.3-01M"]
+    )
+    harvester.retrieve_all_data()
+    fileinfo = harvester.data["https://example.org/data.csv"]
+    assert fileinfo["header_content_type"] == "text/csv"
+    assert fileinfo["header_content_size"] == 5000
+    assert "content_size" not in fileinfo
@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the DataInfoCache which keeps the info about downloaded data files across evaluations
+"""
+import logging
+
+import pytest
+
+from fuji_server.harvester.data_harvester import DataHarvester
+from fuji_server.helper.data_info_cache import DataInfoCache
+from fuji_server.helper.http_transport import HTTPTransport
+
+CONTENT = b"time,temperature\n1,2.5\n2,3.1\n3,2.9\n"
+
+
+class BytesRaw:
+    def stream(self, amt, decode_content=True):
+        yield CONTENT
+
+
+class FakeResponse:
+    def __init__(self, url, etag):
+        self.url = url
+        self.status_code = 200
+        self.headers = {"content-type": "text/csv", "content-length": str(len(CONTENT)), "etag": etag}
+        self.raw = BytesRaw()
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    DataInfoCache.clear()
+    requests = []
+    etags = {}
+
+    def get(url, **kwargs):
+        requests.append(("GET", url))
+        return FakeResponse(url, etags.get(url, '"1"'))
+
+    def head(url, **kwargs):
+        requests.append(("HEAD", url))
+        return FakeResponse(url, etags.get(url, '"1"'))
+
+    monkeypatch.setattr(HTTPTransport, "get", get)
+    monkeypatch.setattr(HTTPTransport, "head", head)
+    yield requests, etags
+    DataInfoCache.clear()
+
+
+def harvest(url):
+    harvester = DataHarvester([{"url": url}], logging.getLogger(__name__))
+    harvester.retrieve_all_data()
+    return harvester.data[url]
+
+
+def test_unchanged_file_is_revalidated(server):
+    requests, etags = server
+    fileinfo = harvest("https://example.org/data.csv")
+    assert fileinfo["tika_content_type"] == ["text/csv"]
+    assert harvest("https://example.org/data.csv") == fileinfo
+    assert requests == [("GET", "https://example.org/data.csv"), ("HEAD", "https://example.org/data.csv")]
+    etags["https://example.org/data.csv"] = '"2"'
+    harvest("https://example.org/data.csv")
+    assert requests[-2:] == [("HEAD", "https://example.org/data.csv"), ("GET", "https://example.org/data.csv")]
+
+
+def test_identical_content_is_inspected_once(server, monkeypatch):
+    inspected = []
+    inspect_content = DataHarvester.inspect_content
+
+    def count_inspections(self, *args):
+        inspected.append(args[1])
+        return inspect_content(self, *args)
+
+    monkeypatch.setattr(DataHarvester, "inspect_content", count_inspections)
+    first = harvest("https://example.org/data.csv")
+    second = harvest("https://mirror.example.org/data.csv")
+    assert inspected == ["https://example.org/data.csv"]
+    assert second["tika_content_type"] == first["tika_content_type"]
+    assert second["test_data_content_text"] == first["test_data_content_text"]
+
+
+def test_download_and_cache_use_are_reported(server, caplog):
+    caplog.set_level(logging.INFO, logger=__name__)
+    harvest("https://example.org/data.csv")
+    harvest("https://example.org/data.csv")
+    harvest("https://mirror.example.org/data.csv")
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(
+        message.startswith("FsF-R1-01MD : Data file retrieved -: https://example.org/data.csv (200, 35 bytes, ")
+        for message in messages
+    )
+    assert "FsF-R1-01MD : Using cached data file info, file unchanged -: https://example.org/data.csv" in messages
+    assert (
+        "FsF-R1-01MD : Using cached inspection of identical content -: https://mirror.example.org/data.csv" in messages
+    )
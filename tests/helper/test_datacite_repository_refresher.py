@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the DataCiteRepositoryRefresher which updates the re3data DOIs of DataCite repositories
+"""
+import os
+import threading
+
+import yaml
+from fuji_server.helper.datacite_repository_refresher import DataCiteRepositoryRefresher
+from fuji_server.helper.http_transport import HTTPTransport
+
+PAGES = {
+    "https://api.datacite.org/repositories": {
+        "data": [{"id": "pangaea.repository", "attributes": {"re3data": "https://doi.org/10.17616/R3X899"}}],
+        "links": {"next": "https://api.datacite.org/repositories?page[number]=2"},
+    },
+    "https://api.datacite.org/repositories?page[number]=2": {
+        "data": [{"id": "cern.zenodo", "attributes": {"re3data": "https://doi.org/10.17616/R3QP53"}}],
+        "links": {},
+    },
+}
+
+
+class FakeResponse:
+    def __init__(self, url):
+        self.url = url
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return PAGES[self.url]
+
+
+def test_refresh_replaces_and_persists_mapping(temporary_preprocessor, monkeypatch):
+    monkeypatch.setattr(HTTPTransport, "get", lambda url, **kwargs: FakeResponse(url))
+    DataCiteRepositoryRefresher.load()
+    old_repositories = temporary_preprocessor.re3repositories
+    assert DataCiteRepositoryRefresher.refresh()
+    assert temporary_preprocessor.re3repositories is not old_repositories
+    assert temporary_preprocessor.re3repositories["cern.zenodo"] == "https://doi.org/10.17616/R3QP53"
+    with open(DataCiteRepositoryRefresher.get_path()) as f:
+        assert yaml.safe_load(f) == temporary_preprocessor.re3repositories
+    assert not DataCiteRepositoryRefresher.is_stale()
+
+
+def test_only_one_refresh_at_a_time(temporary_preprocessor, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def get(url, **kwargs):
+        started.set()
+        release.wait(5)
+        return FakeResponse(url)
+
+    monkeypatch.setattr(HTTPTransport, "get", get)
+    DataCiteRepositoryRefresher.load()
+    first = threading.Thread(target=DataCiteRepositoryRefresher.refresh)
+    first.start()
+    started.wait(5)
+    assert not DataCiteRepositoryRefresher.refresh()
+    release.set()
+    first.join()
+
+
+def test_failed_refresh_keeps_mapping(temporary_preprocessor, monkeypatch):
+    def get(url, **kwargs):
+        raise OSError("no network")
+
+    monkeypatch.setattr(HTTPTransport, "get", get)
+    os.utime(DataCiteRepositoryRefresher.get_path(), (0, 0))
+    DataCiteRepositoryRefresher.load()
+    repositories = temporary_preprocessor.re3repositories
+    assert DataCiteRepositoryRefresher.is_stale()
+    assert not DataCiteRepositoryRefresher.refresh()
+    assert temporary_preprocessor.re3repositories is repositories
+    # the next attempt is postponed
+    assert not DataCiteRepositoryRefresher.is_stale()
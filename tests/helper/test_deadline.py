@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the Deadline which limits the time an assessment may take
+"""
+import logging
+import time
+
+import pytest
+import requests
+
+from fuji_server.harvester.data_harvester import DataHarvester
+from fuji_server.helper.concurrent_helper import ConcurrentHelper
+from fuji_server.helper.deadline import Deadline, TimeBudgetExceededError
+from fuji_server.helper.http_transport import HTTPTransport
+from fuji_server.helper.request_helper import AcceptTypes, RequestHelper
+
+URL = "https://example.org/metadata"
+
+
+@pytest.fixture
+def sent_requests(monkeypatch):
+    sent = []
+
+    def request(self, method, url, **kwargs):
+        sent.append((url, kwargs.get("timeout")))
+        raise requests.exceptions.ConnectionError("not sent")
+
+    monkeypatch.setattr(requests.Session, "request", request)
+    return sent
+
+
+def test_request_timeout_is_capped_to_remaining_budget(sent_requests):
+    with Deadline(5).activate():
+        futures = ConcurrentHelper.run_all(
+            [lambda: HTTPTransport.get(URL, timeout=10), lambda: HTTPTransport.get(URL, timeout=1)], 2
+        )
+    assert all(isinstance(future.exception(), requests.exceptions.ConnectionError) for future in futures)
+    assert [url for url, _ in sent_requests] == [URL, URL]
+    assert 4 < max(timeout for _, timeout in sent_requests) <= 5
+    assert min(timeout for _, timeout in sent_requests) == 1
+    # without a deadline nothing changes
+    with pytest.raises(requests.exceptions.ConnectionError):
+        HTTPTransport.get(URL, timeout=10)
+    assert sent_requests[-1] == (URL, 10)
+
+
+def test_no_requests_after_deadline(sent_requests, caplog):
+    deadline = Deadline(0.001)
+    time.sleep(0.01)
+    logger = logging.getLogger("test_deadline")
+    with deadline.activate(), caplog.at_level(logging.WARNING, logger="test_deadline"):
+        with pytest.raises(TimeBudgetExceededError):
+            HTTPTransport.get(URL, timeout=10)
+        for _i in range(3):
+            request_helper = RequestHelper(URL, logger)
+            request_helper.setAcceptType(AcceptTypes.xml)
+            request_helper.content_negotiate("FsF-F2-01M")
+        data_harvester = DataHarvester([{"url": URL + "/data.csv"}], logger, deadline=deadline)
+        data_harvester.retrieve_all_data()
+    assert sent_requests == []
+    assert data_harvester.data == {}
+    # each affected metric is marked once
+    assert len([m for m in caplog.messages if m.startswith("FsF-F2-01M : Time budget exceeded")]) == 1
+    assert len([m for m in caplog.messages if m.startswith("FsF-F3-01M : Time budget exceeded")]) == 1
+
+
+def test_skipped_steps_are_reported_once_per_metric(caplog):
+    deadline = Deadline(0.001)
+    time.sleep(0.01)
+    logger = logging.getLogger("test_deadline_skip")
+    with caplog.at_level(logging.WARNING, logger="test_deadline_skip"):
+        assert deadline.skip(logger, "FsF-F3-01M", "content analysis")
+        assert deadline.skip(logger, "FsF-F3-01M", "content analysis")
+        assert deadline.skip(logger, "FsF-R1.3-01M", "re3data repository lookup")
+    assert caplog.messages == [
+        "FsF-F3-01M : Time budget exceeded, skipped content analysis",
+        "FsF-R1.3-01M : Time budget exceeded, skipped re3data repository lookup",
+    ]
@@ -0,0 +1,33 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the EvaluationExecutor which runs the evaluations off the event loop
+"""
+import threading
+
+import pytest
+
+from fuji_server.helper.evaluation_executor import EvaluationExecutor, EvaluationQueueFullError
+
+
+def test_evaluation_executor_queue_limit(monkeypatch):
+    monkeypatch.setattr(EvaluationExecutor, "max_queue_size", 1)
+    EvaluationExecutor.set_options(max_workers=1)
+    release = threading.Event()
+    running = EvaluationExecutor.submit(release.wait, 10)
+    queued = EvaluationExecutor.submit(lambda: "done")
+    assert EvaluationExecutor.get_pending() == 2
+    assert EvaluationExecutor.get_queue_depth() == 1
+    with pytest.raises(EvaluationQueueFullError):
+        EvaluationExecutor.submit(lambda: "rejected")
+    release.set()
+    assert running.result(timeout=10)
+    assert queued.result(timeout=10) == "done"
+    # slots are released by a done callback which may run after result() returned
+    for _ in range(100):
+        if EvaluationExecutor.get_pending() == 0:
+            break
+        threading.Event().wait(0.01)
+    assert EvaluationExecutor.get_pending() == 0
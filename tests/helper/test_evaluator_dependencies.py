@@ -0,0 +1,33 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the declared inputs and side effects which decide which evaluators may run concurrently
+"""
+from fuji_server.controllers.fair_check import FAIRCheck
+from fuji_server.evaluators.fair_evaluator import FAIREvaluator
+from fuji_server.evaluators.fair_evaluator_community_metadata import FAIREvaluatorCommunityMetadata
+from fuji_server.evaluators.fair_evaluator_data_access_level import FAIREvaluatorDataAccessLevel
+from fuji_server.evaluators.fair_evaluator_license import FAIREvaluatorLicense
+from fuji_server.evaluators.fair_evaluator_license_file import FAIREvaluatorLicenseFile
+from fuji_server.evaluators.fair_evaluator_semantic_vocabulary import FAIREvaluatorSemanticVocabulary
+
+
+def test_all_evaluators_declare_their_inputs():
+    for evaluator_class in FAIRCheck.CHECK_EVALUATORS.values():
+        assert evaluator_class.inputs is not None, evaluator_class.__name__
+        # changed state is also used
+        assert set(evaluator_class.side_effects) <= set(evaluator_class.inputs), evaluator_class.__name__
+
+
+def test_evaluator_dependencies():
+    # namespaces found by the community metadata check are used by the semantic vocabulary check
+    assert FAIREvaluatorSemanticVocabulary.depends_on(FAIREvaluatorCommunityMetadata)
+    # the license check must not run before the access level check adds licenses and vice versa
+    assert FAIREvaluatorLicense.depends_on(FAIREvaluatorDataAccessLevel)
+    assert FAIREvaluatorDataAccessLevel.depends_on(FAIREvaluatorLicense)
+    assert not FAIREvaluatorLicenseFile.depends_on(FAIREvaluatorDataAccessLevel)
+    # evaluators without declarations depend on everything
+    assert FAIREvaluator.depends_on(FAIREvaluatorLicenseFile)
+    assert FAIREvaluatorLicenseFile.depends_on(FAIREvaluator)
@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the HarvestPlanner which skips the harvesting stages the loaded metrics don't need
+"""
+import os
+
+import pytest
+
+from fuji_server.controllers import fair_check, fair_object_controller
+from fuji_server.controllers.fair_check import FAIRCheck
+from fuji_server.helper.harvest_planner import HarvestPlanner
+from fuji_server.helper.preprocessor import Preprocessor
+
+UID = "https://example.org/software"
+# stages planned for each bundled metric version
+PLANNED_STAGES = {
+    "metrics_v0.2": {"re3data", "github", "data"},
+    "metrics_v0.3": {"re3data", "github", "data"},
+    "metrics_v0.4": {"re3data", "github", "data"},
+    "metrics_v0.5": {"re3data", "github", "data"},
+    "metrics_v0.6a2a": {"re3data", "data"},
+    "metrics_v0.7_software": {"github", "data"},
+    "metrics_v0.7_software_cessda": {"github", "data"},
+}
+
+
+@pytest.fixture
+def harvested(monkeypatch):
+    harvested = []
+
+    class Harvester:
+        def __init__(self, *args, **kwargs):
+            self.data = {}
+
+        def harvest(self):
+            harvested.append("github")
+
+        def retrieve_all_data(self):
+            harvested.append("data")
+
+    monkeypatch.setattr(fair_check, "GithubHarvester", Harvester)
+    monkeypatch.setattr(fair_check, "DataHarvester", Harvester)
+    return harvested
+
+
+@pytest.mark.parametrize(("metric_version", "planned"), sorted(PLANNED_STAGES.items()))
+def test_harvest_plan_of_metric_versions(metric_version, planned):
+    ft = FAIRCheck(uid=UID, metric_version=metric_version)
+    assert {stage for stage in HarvestPlanner.stages if ft.harvest_plan.is_planned(stage)} == planned
+
+
+def test_all_metric_versions_are_planned():
+    metric_versions = {
+        name[: -len(".yaml")] for name in os.listdir(Preprocessor.METRIC_YML_PATH) if name.startswith("metrics_v")
+    }
+    assert metric_versions == set(PLANNED_STAGES)
+
+
+def test_data_file_readers_plan_data_harvesting():
+    ft = FAIRCheck(uid=UID, metric_version="metrics_v0.6a2a")
+    assert {"FsF-F1-01DD", "FsF-F1-02DD"} <= set(ft.harvest_plan.consumers["data"])
+    ft = FAIRCheck(uid=UID, metric_version="metrics_v0.7_software")
+    assert {"FRSM-09-A1", "FRSM-10-I1"} <= set(ft.harvest_plan.consumers["data"])
+
+
+def test_software_metrics_skip_re3data(harvested, monkeypatch):
+    looked_up = []
+    monkeypatch.setattr(fair_check.RepositoryHelper, "lookup_re3data", lambda self: looked_up.append(self))
+    ft = FAIRCheck(uid=UID, test_debug=True, use_github=True, metric_version="metrics_v0.7_software")
+    ft.metadata_merged["object_content_identifier"] = [{"url": UID + "/archive.zip"}]
+    ft.harvest_re3_data()
+    ft.harvest_github()
+    ft.harvest_all_data()
+    assert looked_up == []
+    assert harvested == ["github", "data"]
+    assert ft.harvest_plan.get_report() == [
+        "Harvest plan, skipped re3data repository lookup -: none of the loaded metrics reads repo_helper"
+    ]
+
+
+def test_skipped_stages_are_in_the_debug_output(monkeypatch):
+    # nothing is harvested, the metrics are evaluated without metadata
+    monkeypatch.setattr(FAIRCheck, "harvest_all_metadata", lambda self: None)
+    body = {"object_identifier": UID, "test_debug": True, "metric_version": "metrics_v0.7_software"}
+    response = fair_object_controller.evaluate(body)
+    assert response.test_debug == [
+        "INFO: Harvest plan, skipped re3data repository lookup -: none of the loaded metrics reads repo_helper"
+    ]
+    # not repeated in the debug messages of the metrics
+    assert not any("Harvest plan" in message for result in response.results for message in result["test_debug"])
+
+
+@pytest.mark.parametrize("metric_version", sorted(PLANNED_STAGES))
+def test_planned_metrics_are_those_of_the_evaluators(metric_version):
+    ft = FAIRCheck(uid=UID, metric_version=metric_version)
+    evaluated = [evaluator(ft).metric_identifier for evaluator in ft.CHECK_EVALUATORS.values()]
+    assert ft.harvest_plan.metrics == [metric_id for metric_id in evaluated if metric_id in ft.METRICS]
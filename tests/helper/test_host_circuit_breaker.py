@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the HostCircuitBreaker which lets requests to unreachable hosts fail fast
+"""
+import logging
+import time
+
+import pytest
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from fuji_server.helper.host_circuit_breaker import HostCircuitBreaker, HostUnavailableError
+from fuji_server.helper.http_transport import HTTPTransport
+from fuji_server.helper.request_helper import AcceptTypes, RequestHelper
+
+# nothing listens on the discard port, connections are refused immediately
+UNREACHABLE_URL = "http://127.0.0.1:9/metadata"
+
+
+@pytest.fixture
+def sent_requests(monkeypatch):
+    monkeypatch.setattr(HostCircuitBreaker, "_hosts", {})
+    monkeypatch.setattr(HostCircuitBreaker, "failure_threshold", 2)
+    monkeypatch.setattr(HostCircuitBreaker, "cooldown", 60)
+    sent = []
+    send = HTTPAdapter.send
+
+    def count_send(self, request, **kwargs):
+        sent.append(request.url)
+        return send(self, request, **kwargs)
+
+    monkeypatch.setattr(HTTPAdapter, "send", count_send)
+    return sent
+
+
+def test_host_fails_fast_after_connection_errors(sent_requests, monkeypatch):
+    for _i in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            HTTPTransport.get(UNREACHABLE_URL, timeout=1)
+    with pytest.raises(HostUnavailableError):
+        HTTPTransport.get(UNREACHABLE_URL, timeout=1)
+    assert len(sent_requests) == 2
+    assert not HostCircuitBreaker.is_available(UNREACHABLE_URL)
+
+    # after the cooldown a single request probes the host again
+    monkeypatch.setattr(HostCircuitBreaker, "cooldown", 0.1)
+    time.sleep(0.2)
+    with pytest.raises(requests.exceptions.ConnectionError) as probe_error:
+        HTTPTransport.get(UNREACHABLE_URL, timeout=1)
+    assert not isinstance(probe_error.value, HostUnavailableError)
+    with pytest.raises(HostUnavailableError):
+        HTTPTransport.get(UNREACHABLE_URL, timeout=1)
+    assert len(sent_requests) == 3
+
+    HostCircuitBreaker.record_success(UNREACHABLE_URL)
+    assert HostCircuitBreaker.is_available(UNREACHABLE_URL)
+
+
+def test_unavailable_host_is_reported_once_per_metric(sent_requests, caplog):
+    logger = logging.getLogger("test_unavailable_host")
+    with caplog.at_level(logging.WARNING, logger="test_unavailable_host"):
+        for _i in range(5):
+            request_helper = RequestHelper(UNREACHABLE_URL, logger)
+            request_helper.setAcceptType(AcceptTypes.xml)
+            request_helper.content_negotiate("FsF-F2-01M")
+    assert len(sent_requests) == 2
+    assert len([m for m in caplog.messages if "host is unavailable" in m]) == 1
+
+
+def test_ssl_errors_do_not_open_the_circuit(sent_requests, monkeypatch):
+    url = "https://self-signed.example.org/metadata"
+
+    def ssl_error(self, request, **kwargs):
+        sent_requests.append(request.url)
+        reason = urllib3.exceptions.SSLError("certificate verify failed")
+        raise requests.exceptions.SSLError(urllib3.exceptions.MaxRetryError(None, request.url, reason))
+
+    monkeypatch.setattr(HTTPAdapter, "send", ssl_error)
+    for _i in range(3):
+        with pytest.raises(requests.exceptions.SSLError):
+            HTTPTransport.get(url, timeout=1)
+    assert len(sent_requests) == 3
+    assert HostCircuitBreaker.is_available(url)
+
+
+def test_dns_failures_open_the_circuit(sent_requests, monkeypatch):
+    url = "https://unknown-host.invalid/metadata"
+
+    def dns_error(self, request, **kwargs):
+        sent_requests.append(request.url)
+        reason = urllib3.exceptions.NameResolutionError("unknown-host.invalid", None, OSError("not known"))
+        raise requests.exceptions.ConnectionError(urllib3.exceptions.MaxRetryError(None, request.url, reason))
+
+    monkeypatch.setattr(HTTPAdapter, "send", dns_error)
+    for _i in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            HTTPTransport.get(url, timeout=1)
+    assert not HostCircuitBreaker.is_available(url)
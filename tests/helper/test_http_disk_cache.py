@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the HTTPDiskCache class, the optional persistent cache of the RequestHelper
+"""
+from fuji_server.helper.http_disk_cache import HTTPDiskCache
+from fuji_server.helper.metadata_collector import MetadataFormats
+
+
+def make_entry(body, parse_response):
+    return {
+        "format": MetadataFormats.JSON,
+        "parse_response": parse_response,
+        "response_content": body,
+        "response_header": [("Content-Type", "application/json"), ("ETag", '"v1"')],
+        "redirect_status_list": [("https://example.org/x", 302)],
+    }
+
+
+def test_disk_cache_store_and_load(tmp_path):
+    cache = HTTPDiskCache(str(tmp_path / "http.sqlite"))
+    key = ("https://example.org/x", "application/json", None, True)
+    assert cache.set(key, make_entry(b'{"a": 1}', {"a": 1}), etag='"v1"')
+    # a new instance reads the same database
+    entry = HTTPDiskCache(str(tmp_path / "http.sqlite")).get(key)
+    assert entry["format"] == MetadataFormats.JSON
+    assert entry["parse_response"] == {"a": 1}
+    assert entry["response_content"] == b'{"a": 1}'
+    assert entry["response_header"][1] == ("ETag", '"v1"')
+    assert cache.get_conditional_headers(entry) == {"If-None-Match": '"v1"'}
+    assert not cache.is_fresh(entry)
+    assert cache.get(("https://example.org/x", "text/html", None, True)) is None
+
+
+def test_disk_cache_garbage_collection(tmp_path):
+    cache = HTTPDiskCache(str(tmp_path / "http.sqlite"), max_size=2000)
+    for i in range(5):
+        cache.set(("https://example.org/%s" % i, "text/html", None, True), make_entry(b"x" * 400, b"x" * 400))
+    assert cache.total_size <= 2000
+    assert cache.get(("https://example.org/0", "text/html", None, True)) is None
+    entry = cache.get(("https://example.org/4", "text/html", None, True))
+    assert entry["parse_response"] == entry["response_content"]
+
+
+def test_disk_cache_size_of_shared_database(tmp_path):
+    # two server workers using the same database
+    first = HTTPDiskCache(str(tmp_path / "http.sqlite"), max_size=2000)
+    second = HTTPDiskCache(str(tmp_path / "http.sqlite"), max_size=2000)
+    for i in range(3):
+        first.set(("https://example.org/%s" % i, "text/html", None, True), make_entry(b"x" * 400, b"x" * 400))
+    for i in range(3, 6):
+        second.set(("https://example.org/%s" % i, "text/html", None, True), make_entry(b"x" * 400, b"x" * 400))
+    assert second.total_size <= 2000
+    assert second.get(("https://example.org/0", "text/html", None, True)) is None
+    assert second.get(("https://example.org/5", "text/html", None, True)) is not None
+
+
+def test_disk_cache_running_size_total(tmp_path):
+    cache = HTTPDiskCache(str(tmp_path / "http.sqlite"), max_size=2000)
+    key = ("https://example.org/x", "text/html", None, True)
+    cache.set(key, make_entry(b"x" * 400, b"x" * 400))
+    # replacing a response counts only its new size
+    cache.set(key, make_entry(b"x" * 100, b"x" * 100))
+    for i in range(5):
+        cache.set(("https://example.org/%s" % i, "text/html", None, True), make_entry(b"x" * 400, b"x" * 400))
+    connection = cache._get_connection()
+    stored = connection.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    assert cache.total_size == stored == HTTPDiskCache(cache.path).total_size
+    cache.clear()
+    assert HTTPDiskCache(cache.path).total_size == 0
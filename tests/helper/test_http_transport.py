@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the HTTPTransport which shares pooled keep-alive connections between all harvesting requests
+"""
+import io
+import threading
+import time
+
+import pytest
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from fuji_server.helper.deadline import Deadline, TimeBudgetExceededError
+from fuji_server.helper.http_transport import HTTPTransport
+
+URL = "https://example.org/metadata"
+
+
+def make_response(request, status=200, headers=None, body=b""):
+    headers = headers or {"Content-Type": "text/plain"}
+    response = requests.Response()
+    response.request = request
+    response.url = request.url
+    response.status_code = status
+    response.reason = "Stubbed"
+    response.headers = requests.structures.CaseInsensitiveDict(headers)
+    response.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(body), headers=headers, status=status, preload_content=False, decode_content=False
+    )
+    return response
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    # the pool settings changed by a test are restored afterwards
+    for attribute in ["pool_size", "pool_per_host", "pool_block", "pool_idle_timeout", "max_requests_per_host"]:
+        monkeypatch.setattr(HTTPTransport, attribute, getattr(HTTPTransport, attribute))
+    monkeypatch.setattr(HTTPTransport, "_adapter", None)
+    monkeypatch.setattr(HTTPTransport, "_host_last_used", {})
+    monkeypatch.setattr(HTTPTransport, "_host_semaphores", {})
+    return HTTPTransport
+
+
+def test_pool_options(transport):
+    adapter = transport.get_adapter()
+    transport.set_pool_options(pool_size=3, pool_per_host=5, pool_block=True)
+    new_adapter = transport.get_adapter()
+    assert new_adapter is not adapter
+    assert (new_adapter._pool_connections, new_adapter._pool_maxsize, new_adapter._pool_block) == (3, 5, True)
+    # all sessions share the pools of one adapter
+    assert transport.get_session().get_adapter(URL) is transport.get_session().get_adapter(URL)
+
+
+def test_requests_per_host_are_limited(transport, monkeypatch):
+    transport.set_pool_options(max_requests_per_host=2)
+    lock = threading.Lock()
+    running, max_running = [], []
+
+    def send(self, request, **kwargs):
+        with lock:
+            running.append(request.url)
+            max_running.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+        return make_response(request)
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    threads = [threading.Thread(target=transport.get, args=(URL,)) for _i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(max_running) == 2
+
+
+def test_waiting_for_a_slot_is_limited_by_the_time_budget(transport, monkeypatch):
+    transport.set_pool_options(max_requests_per_host=1)
+    sent = []
+    monkeypatch.setattr(HTTPAdapter, "send", lambda self, request, **kwargs: sent.append(request.url))
+    # another request of the host is running
+    slot = transport.get_host_semaphore(URL)
+    slot.acquire()
+    try:
+        started = time.monotonic()
+        with Deadline(0.2).activate(), pytest.raises(TimeBudgetExceededError):
+            transport.get(URL)
+        assert time.monotonic() - started < 1
+    finally:
+        slot.release()
+    assert sent == []
+
+
+def test_idle_pools_are_closed(transport, monkeypatch):
+    monkeypatch.setattr(HTTPAdapter, "send", lambda self, request, **kwargs: make_response(request))
+    transport.get(URL)
+    host = transport.get_host_key(URL)
+    assert host in transport._host_last_used
+    assert host in transport._host_semaphores
+    transport._host_last_used[host] -= transport.pool_idle_timeout + 1
+    transport.close_idle_pools()
+    assert host not in transport._host_last_used
+    assert host not in transport._host_semaphores
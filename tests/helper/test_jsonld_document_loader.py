@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the JsonLdDocumentLoader which serves bundled contexts from disk and caches remote contexts
+"""
+from pyld import jsonld
+
+from fuji_server.helper.http_transport import HTTPTransport
+from fuji_server.helper.jsonld_document_loader import JsonLdDocumentLoader
+from fuji_server.helper.response_cache import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, url, text):
+        self.url = url
+        self.text = text
+        self.headers = {"content-type": "application/ld+json"}
+        self.links = {}
+
+    def raise_for_status(self):
+        pass
+
+
+def test_bundled_schemaorg_context(monkeypatch):
+    def no_network(*args, **kwargs):
+        raise AssertionError("bundled contexts must not be retrieved")
+
+    monkeypatch.setattr(HTTPTransport, "get", no_network)
+    doc = {"@context": "https://schema.org/docs/jsonldcontext.json", "@type": "Dataset", "name": "Test"}
+    expanded = jsonld.expand(doc, {"documentLoader": JsonLdDocumentLoader.load_document})
+    assert expanded[0]["@type"] == ["http://schema.org/Dataset"]
+    assert expanded[0]["http://schema.org/name"] == [{"@value": "Test"}]
+    assert JsonLdDocumentLoader.load_document("http://schema.org/")["tag"] == "static"
+
+
+def test_remote_context_is_cached(monkeypatch):
+    requested = []
+
+    def get(url, **kwargs):
+        requested.append(url)
+        return FakeResponse(url, '{"@context": {"title": "http://purl.org/dc/terms/title"}}')
+
+    monkeypatch.setattr(HTTPTransport, "get", get)
+    monkeypatch.setattr(JsonLdDocumentLoader, "context_cache", ResponseCache(max_size=10000, ttl=60))
+    for _i in range(3):
+        remote_doc = JsonLdDocumentLoader.load_document("https://example.org/context.jsonld")
+        assert remote_doc["document"]["@context"]["title"] == "http://purl.org/dc/terms/title"
+        # pyld may modify the returned document, this must not change the cached one
+        remote_doc["document"]["@context"]["title"] = "changed"
+    assert requested == ["https://example.org/context.jsonld"]
+
+
+def test_installed_loader_is_used_by_default(jsonld_document_loader, monkeypatch):
+    def no_network(*args, **kwargs):
+        raise AssertionError("bundled contexts must not be retrieved")
+
+    monkeypatch.setattr(HTTPTransport, "get", no_network)
+    doc = {"@context": "https://schema.org/", "@type": "Dataset"}
+    assert jsonld.expand(doc)[0]["@type"] == ["http://schema.org/Dataset"]
@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the indexed lookup of linked vocabs by IRI
+"""
+from fuji_server.helper.linked_vocab_helper import linked_vocab_helper
+
+registry = {
+    "go": {"prefix": "go", "name": "Gene Ontology", "uri_format": "http://purl.obolibrary.org/obo/GO_$1"},
+    "chebi": {
+        "prefix": "chebi",
+        "name": "ChEBI",
+        "uri_format": "http://purl.obolibrary.org/obo/CHEBI_$1",
+        "pattern": "^\\d+$",
+    },
+    "dcterms": {"prefix": "dcterms", "name": "DC Terms", "uri_format": "http://purl.org/dc/terms/$1"},
+}
+
+
+def get_helper():
+    helper = linked_vocab_helper({})
+    helper.linked_vocab_dict = registry
+    helper.set_linked_vocab_index()
+    return helper
+
+
+def test_get_linked_vocab_by_iri():
+    helper = get_helper()
+    assert helper.get_linked_vocab_by_iri("http://purl.obolibrary.org/obo/GO_0008150").get("prefix") == "go"
+    assert helper.get_linked_vocab_by_iri("http://purl.obolibrary.org/obo/CHEBI_").get("prefix") == "chebi"
+    assert helper.get_linked_vocab_by_iri("http://purl.org/dc/terms/", isnamespaceIRI=True).get("prefix") == "dcterms"
+    assert helper.get_linked_vocab_by_iri("http://purl.obolibrary.org/other/x") is None
+    assert helper.get_linked_vocab_by_iri("http://example.org/dc/terms/title") is None
+
+
+def test_get_linked_vocabs_by_iris():
+    helper = get_helper()
+    found = helper.get_linked_vocabs_by_iris(
+        ["http://purl.org/dc/terms/title", "http://purl.obolibrary.org/obo/GO_0008150", "urn:uuid:1234"]
+    )
+    assert [entry.get("prefix") if entry else None for entry in found.values()] == ["dcterms", "go", None]
@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the concurrent retrieval of remote DCAT distributions by the MetaDataCollectorRdf
+"""
+import logging
+import threading
+import time
+
+import rdflib
+
+from fuji_server.helper.metadata_collector import MetadataFormats
+from fuji_server.helper.metadata_collector_rdf import MetaDataCollectorRdf
+from fuji_server.helper.request_helper import RequestHelper
+
+DATASET_TTL = """
+@prefix dcat: <http://www.w3.org/ns/dcat#> .
+@prefix dct: <http://purl.org/dc/terms/> .
+<https://example.org/dataset> a dcat:Dataset ;
+    dct:title "Example" ;
+    dcat:distribution {distributions} .
+<https://example.org/local> dcat:downloadURL <https://example.org/files/local.csv> ;
+    dcat:mediaType "text/csv" .
+"""
+
+DISTRIBUTION_RDF = """<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:dcat="http://www.w3.org/ns/dcat#">
+  <dcat:Distribution rdf:about="{url}">
+    <dcat:downloadURL rdf:resource="https://example.org/files/{name}.nc"/>
+    <dcat:byteSize>{size}</dcat:byteSize>
+  </dcat:Distribution>
+</rdf:RDF>
+"""
+
+
+def get_graph(names):
+    distributions = ", ".join(f"<https://example.org/remote/{name}>" for name in names)
+    distributions += ", <https://example.org/local>"
+    graph = rdflib.Graph()
+    graph.parse(data=DATASET_TTL.format(distributions=distributions), format="turtle")
+    return graph
+
+
+def test_remote_distributions_are_retrieved_concurrently(monkeypatch):
+    running, max_running = [], []
+    lock = threading.Lock()
+
+    def content_negotiate(self, metric_id="", ignore_html=True):
+        with lock:
+            running.append(self.request_url)
+            max_running.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(self.request_url)
+        name = self.request_url.rsplit("/", 1)[-1]
+        if name == "broken":
+            return None, None
+        self.response_content = DISTRIBUTION_RDF.format(url=self.request_url, name=name, size=len(name)).encode()
+        return MetadataFormats.RDF, self.response_content
+
+    monkeypatch.setattr(RequestHelper, "content_negotiate", content_negotiate)
+    monkeypatch.setattr(MetaDataCollectorRdf, "max_remote_distributions", 3)
+    names = ["a", "broken", "ccc", "dddd"]
+    collector = MetaDataCollectorRdf(loggerinst=logging.getLogger(__name__), target_url="https://example.org/dataset")
+    dcat_metadata = collector.get_dcat_metadata(get_graph(names))
+
+    identifiers = {str(c["url"]): c for c in dcat_metadata["object_content_identifier"]}
+    assert identifiers["https://example.org/files/a.nc"]["size"] == "1"
+    assert identifiers["https://example.org/files/ccc.nc"]["size"] == "3"
+    # failed and not retrieved (above the limit) distributions are kept by their URI
+    assert "https://example.org/remote/broken" in identifiers
+    assert "https://example.org/files/local.csv" in identifiers
+    assert len(identifiers) == 5
+    assert max(max_running) > 1
@@ -0,0 +1,33 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the MetadataStandardURIIndex used to identify metadata standards by their URIs
+"""
+from fuji_server.helper.metadata_standard_uri_index import MetadataStandardURIIndex
+
+metadata_standards = {
+    "dc": {"urls": ["http://purl.org/dc/elements/1.1/", "http://purl.org/dc/terms/"]},
+    "dcat": {"urls": ["https://www.w3.org/ns/dcat#"]},
+    "prov": {"urls": ["http://www.w3.org/ns/prov"]},
+    "eml": {"urls": ["https://eml.ecoinformatics.org/eml-2.2.0"]},
+}
+
+
+def test_exact_lookup():
+    index = MetadataStandardURIIndex(metadata_standards)
+    assert index.lookup("http://purl.org/dc/terms/") == "dc"
+    assert index.lookup("https://purl.org/dc/elements/1.1") == "dc"
+    assert index.lookup("http://www.w3.org/ns/dcat#") == "dcat"
+    assert index.lookup(None) is None
+
+
+def test_fuzzy_lookup_within_domain():
+    index = MetadataStandardURIIndex(metadata_standards)
+    assert index.lookup("https://eml.ecoinformatics.org/eml-2.1.0") == "eml"
+    # w3.org/ns namespaces require a higher similarity
+    assert index.lookup("http://www.w3.org/ns/prov-o") == "prov"
+    assert index.lookup("http://www.w3.org/ns/provo#x") is None
+    # no candidates of the same domain
+    assert index.lookup("http://example.org/dc/terms") is None
@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the MetricSpecificationRegistry which parses each metrics YAML file once per process
+"""
+import os
+
+import pytest
+
+from fuji_server.helper.metric_specification_registry import MetricSpecificationRegistry
+
+METRICS_YAML = """
+metric_specification: https://example.org/metrics
+config:
+  allowed_harvesting_methods: [HTML_EMBEDDING]
+metrics:
+  - metric_identifier: FsF-F1-01D
+    metric_name: Data is assigned a globally unique identifier.
+    total_score: 1
+    metric_tests:
+      - metric_test_identifier: FsF-F1-01D-1
+        metric_test_score: 1
+"""
+
+
+def test_specification_is_shared_and_reloaded(tmp_path):
+    path = str(tmp_path / "metrics_v9.9.yaml")
+    with open(path, "w") as f:
+        f.write(METRICS_YAML)
+    first = MetricSpecificationRegistry.get(path)
+    assert MetricSpecificationRegistry.get(path) is first
+    assert first.metric_specification == "https://example.org/metrics"
+    assert first.get_metric("FsF-F1-01D-1")["metric_identifier"] == "FsF-F1-01D"
+    custom_metrics = first.get_custom_metrics(["metric_name", "total_score", "metric_tests"])
+    assert custom_metrics["FsF-F1-01D"]["metric_tests"][0]["agnostic_test_identifier"] == "FsF-F1-01D-1"
+    # the raw metric tests are not changed by get_custom_metrics
+    assert "agnostic_test_identifier" not in first.all_metrics_list[0]["metric_tests"][0]
+    with open(path, "w") as f:
+        f.write(METRICS_YAML.replace("total_score: 1", "total_score: 2"))
+    os.utime(path, ns=(0, 0))
+    second = MetricSpecificationRegistry.get(path)
+    assert second is not first
+    assert second.get_custom_metrics(["total_score"])["FsF-F1-01D"]["total_score"] == 2
+
+
+def test_specification_is_read_only(tmp_path):
+    path = str(tmp_path / "metrics_v9.9.yaml")
+    with open(path, "w") as f:
+        f.write(METRICS_YAML)
+    specification = MetricSpecificationRegistry.get(path)
+    custom_metrics = specification.get_custom_metrics(["metric_tests"])
+    with pytest.raises(TypeError):
+        custom_metrics["FsF-F1-01D"]["metric_tests"][0]["metric_test_score"] = 0
+    with pytest.raises(TypeError):
+        specification.config["allowed_harvesting_methods"].append("TYPED_LINKS")
+    assert isinstance(specification.config["allowed_harvesting_methods"], list)
@@ -0,0 +1,45 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the PIDResolver which resolves the PIDs found in metadata concurrently
+"""
+import logging
+import random
+import threading
+import time
+
+from fuji_server.harvester.metadata_harvester import MetadataHarvester
+from fuji_server.helper.identifier_helper import IdentifierHelper
+from fuji_server.helper.pid_resolver import PIDResolver
+
+DOIS = [f"10.5281/zenodo.{i}" for i in range(8)]
+
+
+def test_batch_is_resolved_concurrently_and_merged_in_order(monkeypatch):
+    monkeypatch.setattr(PIDResolver, "max_requests_per_resolver", 2)
+    monkeypatch.setattr(PIDResolver, "_resolver_semaphores", {})
+    running = []
+    max_running = []
+    lock = threading.Lock()
+
+    def get_resolved_url(self, pid_collector={}):
+        with lock:
+            running.append(1)
+            max_running.append(len(running))
+        time.sleep(random.random() / 20)
+        with lock:
+            running.pop()
+        return "https://zenodo.org/records/" + self.identifier.split(".")[-1]
+
+    monkeypatch.setattr(IdentifierHelper, "get_resolved_url", get_resolved_url)
+    harvester = MetadataHarvester("https://zenodo.org/records/0", logger=logging.getLogger(__name__))
+    harvester.landing_url = "https://zenodo.org/records/0"
+    harvester.landing_domain = "zenodo.org"
+    for doi in DOIS:
+        harvester.add_pid_candidate(doi)
+    harvester.resolve_pid_candidates()
+    assert max(max_running) == 2
+    assert list(harvester.pid_collector) == ["https://doi.org/" + doi for doi in DOIS]
+    assert all(record["verified"] for record in harvester.pid_collector.values())
@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the ReferenceDataSnapshot which stores all reference data of the Preprocessor in one file
+"""
+from fuji_server.helper.preprocessor import Preprocessor
+from fuji_server.helper.reference_data_snapshot import ReferenceDataSnapshot
+
+
+def test_snapshot_build_and_load(tmp_path):
+    snapshot_path = str(tmp_path / "reference_data.snapshot")
+    assert not ReferenceDataSnapshot.load(snapshot_path)
+    ReferenceDataSnapshot.build(snapshot_path)
+    expected = {attribute: getattr(Preprocessor, attribute) for attribute in ReferenceDataSnapshot.attributes}
+    assert expected["linked_vocab_index"]
+    assert expected["identifiers_org_data"]
+    for attribute in ReferenceDataSnapshot.attributes:
+        setattr(Preprocessor, attribute, None)
+    assert ReferenceDataSnapshot.load(snapshot_path)
+    for attribute in ReferenceDataSnapshot.attributes:
+        if hasattr(expected[attribute], "__dict__"):
+            assert vars(getattr(Preprocessor, attribute)) == vars(expected[attribute])
+        else:
+            assert getattr(Preprocessor, attribute) == expected[attribute]
+
+
+def test_stale_snapshot_is_rebuilt(tmp_path, monkeypatch):
+    snapshot_path = str(tmp_path / "reference_data.snapshot")
+    ReferenceDataSnapshot.build(snapshot_path)
+    monkeypatch.setattr(ReferenceDataSnapshot, "FORMAT_VERSION", ReferenceDataSnapshot.FORMAT_VERSION + 1)
+    assert not ReferenceDataSnapshot.load(snapshot_path)
+    assert ReferenceDataSnapshot.load_or_build(snapshot_path)
+    assert ReferenceDataSnapshot.load(snapshot_path)
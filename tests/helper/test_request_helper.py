@@ -0,0 +1,127 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the content negotiation of the RequestHelper with a stubbed HTTP adapter
+"""
+import io
+import logging
+
+import pytest
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from fuji_server.helper.deadline import Deadline
+from fuji_server.helper.host_circuit_breaker import HostCircuitBreaker
+from fuji_server.helper.metadata_collector import MetadataFormats
+from fuji_server.helper.request_helper import AcceptTypes, RequestHelper
+from fuji_server.helper.response_cache import ResponseCache
+
+BODY = b'{"title": "metadata"}'
+
+
+def make_response(request, status=200, headers=None, body=b""):
+    response = requests.Response()
+    response.request = request
+    response.url = request.url
+    response.status_code = status
+    response.reason = "Stubbed"
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(body), headers=headers or {}, status=status, preload_content=False, decode_content=False
+    )
+    return response
+
+
+def json_response(request):
+    headers = {"Content-Type": "application/json", "Content-Length": str(len(BODY))}
+    return make_response(request, 200, headers, BODY)
+
+
+class Routes(dict):
+    """url: function returning the response to a request of url, all other requests fail with 404"""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    monkeypatch.setattr(RequestHelper, "response_cache", ResponseCache())
+    monkeypatch.setattr(RequestHelper, "disk_cache", None)
+    routes = Routes()
+
+    def send(self, request, **kwargs):
+        routes.sent.append(request.url)
+        if request.url in routes:
+            return routes[request.url](request)
+        return make_response(request, 404)
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    return routes
+
+
+def negotiate(url, accept_type=AcceptTypes.json):
+    request_helper = RequestHelper(url, logging.getLogger("test_request_helper"))
+    request_helper.setAcceptType(accept_type)
+    result = request_helper.content_negotiate("FsF-F2-01M")
+    return request_helper, result
+
+
+def test_redirects_are_followed_and_recorded(routes):
+    routes["https://example.org/pid"] = lambda request: make_response(
+        request, 302, {"Location": "https://example.org/landing"}
+    )
+    routes["https://example.org/landing"] = json_response
+    request_helper, (format, parse_response) = negotiate("https://example.org/pid")
+    assert (format, parse_response) == (MetadataFormats.JSON, {"title": "metadata"})
+    assert request_helper.redirect_url == "https://example.org/landing"
+    assert request_helper.redirect_list == ["https://example.org/landing"]
+    assert request_helper.redirect_status_list == [("https://example.org/landing", 302)]
+
+
+def test_https_is_tried_after_400_of_redirected_http_url(routes):
+    routes["https://example.org/pid"] = lambda request: make_response(
+        request, 301, {"Location": "http://example.org/landing"}
+    )
+    routes["http://example.org/landing"] = lambda request: make_response(request, 400)
+    routes["https://example.org/landing"] = json_response
+    request_helper, (format, parse_response) = negotiate("https://example.org/pid")
+    assert routes.sent[-1] == "https://example.org/landing"
+    assert request_helper.response_status == 200
+    assert parse_response == {"title": "metadata"}
+
+
+def test_time_budget_exceeded(routes):
+    routes["https://example.org/pid"] = json_response
+    deadline = Deadline(0.001)
+    deadline.expires -= 1
+    with deadline.activate():
+        request_helper, (format, parse_response) = negotiate("https://example.org/pid")
+    assert request_helper.response_status == 603
+    assert parse_response is None
+    assert routes.sent == []
+
+
+def test_host_unavailable(routes):
+    routes["https://down.example.org/pid"] = json_response
+    for _i in range(HostCircuitBreaker.failure_threshold):
+        HostCircuitBreaker.record_failure("https://down.example.org/pid")
+    request_helper, (format, parse_response) = negotiate("https://down.example.org/pid")
+    assert request_helper.response_status == 900
+    assert routes.sent == []
+
+
+def test_content_is_read_up_to_max_content_size(routes):
+    body = b"x" * 100
+    routes["https://example.org/data.txt"] = lambda request: make_response(
+        request, 200, {"Content-Type": "text/plain", "Content-Length": str(len(body))}, body
+    )
+    request_helper = RequestHelper("https://example.org/data.txt", logging.getLogger("test_request_helper"))
+    request_helper.max_content_size = 10
+    request_helper.content_negotiate("FsF-F2-01M")
+    assert request_helper.response_content == b"x" * 10
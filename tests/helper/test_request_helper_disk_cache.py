@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test that the RequestHelper revalidates responses stored in the HTTPDiskCache with conditional requests
+"""
+import io
+import logging
+
+import pytest
+import requests
+import urllib3
+from requests.structures import CaseInsensitiveDict
+
+from fuji_server.helper.http_disk_cache import HTTPDiskCache
+from fuji_server.helper.http_transport import HTTPTransport
+from fuji_server.helper.metadata_collector import MetadataFormats
+from fuji_server.helper.request_helper import AcceptTypes, RequestHelper
+from fuji_server.helper.response_cache import ResponseCache
+
+URL = "https://example.org/metadata.json"
+BODY = b'{"title": "stored"}'
+
+
+def make_response(url, status, headers, body=b""):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(body), headers=headers, status=status, preload_content=False, decode_content=False
+    )
+    return response
+
+
+@pytest.fixture
+def transport(monkeypatch, tmp_path):
+    monkeypatch.setattr(RequestHelper, "response_cache", ResponseCache())
+    monkeypatch.setattr(RequestHelper, "disk_cache", HTTPDiskCache(str(tmp_path / "http.sqlite")))
+    sent_headers = []
+
+    def get(url, session=None, headers=None, **kwargs):
+        sent_headers.append(dict(headers))
+        if headers.get("If-None-Match") == '"v1"':
+            return make_response(url, 304, {"ETag": '"v1"'})
+        return make_response(
+            url, 200, {"Content-Type": "application/json", "Content-Length": str(len(BODY)), "ETag": '"v1"'}, BODY
+        )
+
+    monkeypatch.setattr(HTTPTransport, "get", get)
+    return sent_headers
+
+
+def negotiate():
+    request_helper = RequestHelper(URL, logging.getLogger("test_request_helper_disk_cache"))
+    request_helper.setAcceptType(AcceptTypes.json)
+    return request_helper.content_negotiate("FsF-F2-01M")
+
+
+def test_stored_response_is_served_after_304(transport):
+    assert negotiate() == (MetadataFormats.JSON, {"title": "stored"})
+    assert "If-None-Match" not in transport[0]
+    # a new process only has the disk cache
+    RequestHelper.response_cache.clear()
+    format, parse_response = negotiate()
+    assert transport[1]["If-None-Match"] == '"v1"'
+    assert format == MetadataFormats.JSON
+    assert parse_response == {"title": "stored"}
+    assert len(transport) == 2
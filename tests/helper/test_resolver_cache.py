@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the ResolverCache which shares PID resolutions between evaluations
+"""
+import logging
+
+import pytest
+import requests
+
+from fuji_server.helper.http_transport import HTTPTransport
+from fuji_server.helper.identifier_helper import IdentifierHelper
+from fuji_server.helper.request_helper import AcceptTypes, RequestHelper
+from fuji_server.helper.resolver_cache import (
+    MemoryResolverCacheBackend,
+    ResolverCache,
+    SQLiteResolverCacheBackend,
+)
+
+PID_URL = "https://doi.org/10.5281/zenodo.8347772"
+LANDING_URL = "https://zenodo.org/records/8347772"
+
+
+class FakeResponse:
+    def __init__(self, url, status_code=200, history=None):
+        self.url = url
+        self.status_code = status_code
+        self.history = history or []
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path, monkeypatch):
+    if request.param == "sqlite":
+        backend = SQLiteResolverCacheBackend(str(tmp_path / "resolutions.sqlite"))
+    else:
+        backend = MemoryResolverCacheBackend()
+    monkeypatch.setattr(ResolverCache, "backend", backend)
+    return backend
+
+
+def get_request_helper():
+    request_helper = RequestHelper(PID_URL, logging.getLogger(__name__))
+    request_helper.setAcceptType(AcceptTypes.default)
+    return request_helper
+
+
+def test_backend_expiry(backend):
+    backend.set("key", {"url": LANDING_URL}, 60)
+    backend.set("expired", {"url": LANDING_URL}, -1)
+    assert backend.get("key") == {"url": LANDING_URL}
+    assert backend.get("expired") is None
+    backend.delete("key")
+    assert backend.get("key") is None
+
+
+def test_cached_resolution_skips_redirects(backend, monkeypatch):
+    requested = []
+
+    def get(url, **kwargs):
+        requested.append(url)
+        if url == PID_URL:
+            return FakeResponse(LANDING_URL, history=[FakeResponse(PID_URL, 302)])
+        return FakeResponse(url)
+
+    monkeypatch.setattr(HTTPTransport, "get", get)
+    get_request_helper().get_resolved_response(None, {}, "FsF-F1-02D")
+    request_helper = get_request_helper()
+    response = request_helper.get_resolved_response(None, {}, "FsF-F1-02D")
+    assert requested == [PID_URL, LANDING_URL]
+    assert response.url == LANDING_URL
+    assert request_helper.redirect_list == [LANDING_URL]
+    assert request_helper.redirect_status_list == [(LANDING_URL, 302)]
+    # PIDs are resolved without any request
+    assert IdentifierHelper(PID_URL).get_resolved_url() == LANDING_URL
+    assert requested == [PID_URL, LANDING_URL]
+
+
+def test_failed_resolution_is_cached(backend, monkeypatch):
+    requested = []
+
+    def get(url, **kwargs):
+        requested.append(url)
+        return FakeResponse(url, 404)
+
+    monkeypatch.setattr(HTTPTransport, "get", get)
+    get_request_helper().get_resolved_response(None, {}, "FsF-F1-02D")
+    response = get_request_helper().get_resolved_response(None, {}, "FsF-F1-02D")
+    assert requested == [PID_URL]
+    with pytest.raises(requests.exceptions.HTTPError):
+        response.raise_for_status()
+    response.close()
+    assert IdentifierHelper(PID_URL).get_resolved_url() is None
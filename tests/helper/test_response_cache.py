@@ -0,0 +1,49 @@
+# SPDX-FileCopyrightText: 2020 PANGAEA (https://www.pangaea.de/)
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Here we test the ResponseCache class which is shared by all RequestHelper instances
+"""
+from fuji_server.helper.response_cache import ResponseCache
+
+
+def test_response_cache_hit_and_alias():
+    cache = ResponseCache(max_size=1000, ttl=60)
+    cache.set(
+        ("https://doi.org/x", "text/html"),
+        {"format": "html", "parse_response": {"a": 1}},
+        10,
+        [("https://x.org", "text/html")],
+    )
+    entry = cache.get(("https://doi.org/x", "text/html"))
+    assert entry["format"] == "html"
+    # parsed responses are copied, changes by callers do not change the cache
+    entry["parse_response"]["a"] = 2
+    assert cache.get(("https://x.org", "text/html"))["parse_response"] == {"a": 1}
+    assert cache.get(("https://doi.org/x", "application/json")) is None
+    assert cache.get_stats()["hits"] == 2
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_response_cache_lru_eviction():
+    cache = ResponseCache(max_size=100, ttl=60)
+    cache.set("a", {"format": "a"}, 40)
+    cache.set("b", {"format": "b"}, 40)
+    cache.get("a")
+    cache.set("c", {"format": "c"}, 40)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.get_stats()["size"] == 80
+    assert cache.get_stats()["evictions"] == 1
+    assert not cache.set("d", {"format": "d"}, 200)
+
+
+def test_response_cache_ttl():
+    cache = ResponseCache(max_size=100, ttl=0.01)
+    cache.set("a", {"format": "a"}, 10, ["b"])
+    cache._entries["a"] = (cache._entries["a"][0] - 1,) + cache._entries["a"][1:]
+    assert cache.get("b") is None
+    assert cache.get_stats()["entries"] == 0
+    assert cache.get_stats()["size"] == 0